@@ -0,0 +1,76 @@
+# ФАЙЛ: adapters/external/listing_feeds.py
+"""
+Источники событий ListingCreated для domain/services/ingest:
+  - NDJSON-файлы (по строке на событие; строки не разбираются здесь —
+    это делает ингестер, так что битая строка не роняет чтение);
+  - локальная очередь — заглушка брокера для dev/тестов.
+Оба источника отдают None, когда ждут данных, — ингестер использует это,
+чтобы дослать неполный батч по max_wait_s.
+"""
+from __future__ import annotations
+
+import queue
+import time
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Union
+
+_STOP = object()
+
+
+def iter_ndjson(
+    paths: Iterable[Union[str, Path]],
+    *,
+    follow: bool = False,
+    poll_s: float = 0.25,
+) -> Iterator[Optional[bytes]]:
+    """
+    Строки NDJSON по файлам подряд. follow=True — как `tail -f` для последнего
+    файла: на конце файла отдаёт None и ждёт новые строки (бесконечно).
+    """
+    paths = list(paths)
+    for n, path in enumerate(paths):
+        with open(path, "rb") as f:
+            while True:
+                line = f.readline()
+                if line.endswith(b"\n"):
+                    if line.strip():
+                        yield line
+                    continue
+                if not follow or n < len(paths) - 1:
+                    if line.strip():  # последняя строка без \n
+                        yield line
+                    break
+                # недописанная строка: вернуться к её началу и подождать
+                f.seek(-len(line), 1)
+                yield None
+                time.sleep(poll_s)
+
+
+class LocalQueueFeed:
+    """In-process очередь вместо брокера: put() из продюсера, итерация — в ингестере."""
+
+    def __init__(self, maxsize: int = 10_000, idle_s: float = 0.1) -> None:
+        self._q: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        self.idle_s = idle_s
+
+    def put(self, event: Any, timeout: Optional[float] = None) -> None:
+        """Блокирует продюсера, если потребитель отстал (ограниченная память)."""
+        self._q.put(event, timeout=timeout)
+
+    def close(self) -> None:
+        self._q.put(_STOP)
+
+    def lag(self) -> int:
+        """Сообщений в очереди, ещё не взятых ингестером."""
+        return self._q.qsize()
+
+    def __iter__(self) -> Iterator[Optional[Any]]:
+        while True:
+            try:
+                item = self._q.get(timeout=self.idle_s)
+            except queue.Empty:
+                yield None
+                continue
+            if item is _STOP:
+                return
+            yield item
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+import orjson
+from pydantic import BaseModel
+
+V = TypeVar("V")
+
+
+def request_digest(model: BaseModel, *, salt: str = "") -> str:
+    """
+    Канонический хэш запроса: JSON с отсортированными ключами → sha256.
+    Одинаковые по смыслу тела (порядок ключей, дефолты) дают один ключ;
+    серверные профили входят в ключ ссылкой id@version, а не значениями.
+    """
+    dump = model.model_dump(mode="json")
+    payload = orjson.dumps(dump, option=orjson.OPT_SORT_KEYS)
+    h = hashlib.sha256(payload)
+    if salt:
+        h.update(salt.encode("utf-8"))
+    return h.hexdigest()
+
+
+class LRUCache(Generic[V]):
+    """Небольшой потокобезопасный LRU (sync-роуты выполняются в threadpool)."""
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, V]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            val = self._data.get(key)
+            if val is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return val
+
+    def put(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, Any]:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+class SingleFlight(Generic[V]):
+    """
+    Схлопывание одинаковых одновременных вычислений (не хранилище результатов):
+    первый вызов с ключом запускает fn, остальные ждут его результат или
+    ошибку. Ключ снимается по завершении — ошибки не кэшируются, следующий
+    запрос считает заново.
+
+    Вычисление идёт отдельной задачей под asyncio.shield: отмена одного
+    ожидающего (клиент отключился) не отменяет результат для остальных.
+    Работает в одном event loop; счётчики — для /health.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, "asyncio.Task[V]"] = {}
+        self.executions = 0   # реальных запусков fn
+        self.coalesced = 0    # вызовов, получивших чужой результат (сэкономлено запусков)
+        self.failures = 0     # запусков, завершившихся ошибкой
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[V]]) -> V:
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.executions += 1
+            task = asyncio.get_running_loop().create_task(fn())
+            self._calls[key] = task
+            task.add_done_callback(partial(self._done, key))
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: "asyncio.Task[V]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # забираем исключение, даже если все ожидающие отменены (иначе warning в лог)
+        if not task.cancelled() and task.exception() is not None:
+            self.failures += 1
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+        }
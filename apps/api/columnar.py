@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from typing import Any, Dict, List, Optional, Sequence
+
+from domain.models.evaluate import EvaluationResponse
+
+# Колоночный формат для bulk-потребителей: msgpack-карта типизированных колонок.
+# Вложенные списки (scenarios/notes/advice/sensitivity) — плоские колонки + offsets
+# (как list-колонки в Arrow). Числа — упакованные little-endian массивы.
+MEDIA_TYPE = "application/x-msgpack"
+MEDIA_TYPES = (MEDIA_TYPE, "application/msgpack", "application/vnd.msgpack")
+JSON_MEDIA_TYPE = "application/json"
+FORMAT_NAME = "subdivision-columnar"
+FORMAT_VERSION = 1
+
+_SCENARIO_FLOATS = (
+    "revenue", "total_cost", "holding_cost", "profit", "margin_on_cost", "roi_simple",
+)
+_BAND_FIELDS = ("base_profit", "best_profit", "worst_profit")
+
+
+class ColumnarUnavailable(RuntimeError):
+    """msgpack не установлен (extra `columnar`)."""
+
+
+def _msgpack():
+    try:
+        import msgpack  # опциональная зависимость
+    except ImportError as e:  # pragma: no cover - зависит от окружения
+        raise ColumnarUnavailable(
+            "msgpack is not installed (pip install 'subdivision-service[columnar]')"
+        ) from e
+    return msgpack
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Выбор формата ответа по заголовку Accept (с учётом q).
+    JSON — по умолчанию и при равном весе.
+    """
+    if not accept:
+        return JSON_MEDIA_TYPE
+    best_json = -1.0
+    best_columnar = -1.0
+    for part in accept.split(","):
+        fields = [f.strip() for f in part.split(";")]
+        media = fields[0].lower()
+        q = 1.0
+        for f in fields[1:]:
+            if f.startswith("q="):
+                try:
+                    q = float(f[2:])
+                except ValueError:
+                    q = 0.0
+        if media in MEDIA_TYPES:
+            best_columnar = max(best_columnar, q)
+        elif media in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            best_json = max(best_json, q)
+    if best_columnar > 0 and best_columnar > best_json:
+        return MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+# ---- колонки ----
+
+def _packed(typecode: str, values: Any) -> Dict[str, Any]:
+    arr = array(typecode, values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return {"type": {"d": "f64", "i": "i32"}[typecode], "data": arr.tobytes()}
+
+
+def _unpacked(col: Dict[str, Any]) -> List[Any]:
+    arr = array({"f64": "d", "i32": "i"}[col["type"]])
+    arr.frombytes(col["data"])
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tolist()
+
+
+class _DictColumn:
+    """Словарное кодирование повторяющихся строк (коды сценариев/советов)."""
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.codes: List[int] = []
+
+    def append(self, v: Optional[str]) -> None:
+        if v is None:
+            self.codes.append(-1)
+            return
+        i = self.index.get(v)
+        if i is None:
+            i = self.index[v] = len(self.values)
+            self.values.append(v)
+        self.codes.append(i)
+
+    def column(self) -> Dict[str, Any]:
+        return {"type": "dict", "values": self.values, "codes": _packed("i", self.codes)["data"]}
+
+
+def _undict(col: Dict[str, Any]) -> List[Optional[str]]:
+    values = col["values"]
+    return [values[c] if c >= 0 else None for c in _unpacked({"type": "i32", "data": col["codes"]})]
+
+
+def encode_evaluations(responses: Sequence[EvaluationResponse]) -> bytes:
+    """
+    Кодирует ответы в колоночный msgpack, читая атрибуты моделей напрямую
+    (без model_dump и построчных dict).
+    """
+    msgpack = _msgpack()
+
+    price_per_sqm: List[float] = []
+    lot_yield: List[int] = []
+    best = _DictColumn()
+
+    scen_offsets = [0]
+    scen_code = _DictColumn()
+    scen_lots: List[int] = []
+    scen_floats: Dict[str, List[float]] = {k: [] for k in _SCENARIO_FLOATS}
+    note_offsets = [0]
+    notes: List[str] = []
+
+    order_offsets = [0]
+    order = _DictColumn()
+
+    adv_offsets = [0]
+    adv_code = _DictColumn()
+    adv_sev = _DictColumn()
+    adv_msg: List[Optional[str]] = []
+
+    resp_note_offsets = [0]
+    resp_notes: List[str] = []
+
+    sens_offsets = [0]
+    sens_present: List[int] = []
+    sens_key = _DictColumn()
+    sens_vals: Dict[str, List[float]] = {k: [] for k in _BAND_FIELDS}
+    degraded: List[int] = []
+
+    for r in responses:
+        price_per_sqm.append(r.price_per_sqm)
+        lot_yield.append(r.lot_yield_estimate)
+        best.append(r.best_scenario_code)
+
+        for s in r.scenarios:
+            scen_code.append(s.scenario)
+            scen_lots.append(s.lots)
+            for k in _SCENARIO_FLOATS:
+                scen_floats[k].append(getattr(s, k))
+            notes.extend(s.notes)
+            note_offsets.append(len(notes))
+        scen_offsets.append(len(scen_lots))
+
+        for code in r.scenario_order:
+            order.append(code)
+        order_offsets.append(len(order.codes))
+
+        for a in r.advice:
+            adv_code.append(a.code)
+            adv_sev.append(a.severity)
+            adv_msg.append(a.message)
+        adv_offsets.append(len(adv_msg))
+
+        resp_notes.extend(r.notes)
+        resp_note_offsets.append(len(resp_notes))
+
+        sens_present.append(0 if r.sensitivity is None else 1)
+        for key, band in (r.sensitivity or {}).items():
+            sens_key.append(key)
+            for k in _BAND_FIELDS:
+                sens_vals[k].append(getattr(band, k))
+        sens_offsets.append(len(sens_key.codes))
+        degraded.append(1 if r.degraded else 0)
+
+    columns: Dict[str, Any] = {
+        "price_per_sqm": _packed("d", price_per_sqm),
+        "lot_yield_estimate": _packed("i", lot_yield),
+        "best_scenario_code": best.column(),
+        "scenarios.offsets": _packed("i", scen_offsets),
+        "scenarios.scenario": scen_code.column(),
+        "scenarios.lots": _packed("i", scen_lots),
+        **{f"scenarios.{k}": _packed("d", v) for k, v in scen_floats.items()},
+        "scenarios.notes.offsets": _packed("i", note_offsets),
+        "scenarios.notes": {"type": "str", "data": notes},
+        "scenario_order.offsets": _packed("i", order_offsets),
+        "scenario_order": order.column(),
+        "advice.offsets": _packed("i", adv_offsets),
+        "advice.code": adv_code.column(),
+        "advice.severity": adv_sev.column(),
+        "advice.message": {"type": "str", "data": adv_msg},
+        "notes.offsets": _packed("i", resp_note_offsets),
+        "notes": {"type": "str", "data": resp_notes},
+        "sensitivity.present": _packed("i", sens_present),
+        "sensitivity.offsets": _packed("i", sens_offsets),
+        "sensitivity.key": sens_key.column(),
+        **{f"sensitivity.{k}": _packed("d", v) for k, v in sens_vals.items()},
+        "degraded": _packed("i", degraded),
+    }
+    doc = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "rows": len(price_per_sqm),
+        "columns": columns,
+    }
+    return msgpack.packb(doc, use_bin_type=True)
+
+
+def decode_evaluations(payload: bytes) -> List[Dict[str, Any]]:
+    """
+    Обратное преобразование в построчные dict (как JSON-ответ) —
+    для тестов и клиентов без колоночного стека.
+    """
+    msgpack = _msgpack()
+    doc = msgpack.unpackb(payload, raw=False)
+    if doc.get("format") != FORMAT_NAME or doc.get("version") != FORMAT_VERSION:
+        raise ValueError("Unsupported columnar payload")
+    c = doc["columns"]
+
+    def col(name: str) -> List[Any]:
+        spec = c[name]
+        if spec["type"] == "dict":
+            return _undict(spec)
+        if spec["type"] == "str":
+            return list(spec["data"])
+        return _unpacked(spec)
+
+    price_per_sqm = col("price_per_sqm")
+    lot_yield = col("lot_yield_estimate")
+    best = col("best_scenario_code")
+    scen_offsets = col("scenarios.offsets")
+    scen_code = col("scenarios.scenario")
+    scen_lots = col("scenarios.lots")
+    scen_floats = {k: col(f"scenarios.{k}") for k in _SCENARIO_FLOATS}
+    note_offsets = col("scenarios.notes.offsets")
+    notes = col("scenarios.notes")
+    order_offsets = col("scenario_order.offsets")
+    order = col("scenario_order")
+    adv_offsets = col("advice.offsets")
+    adv_code, adv_sev, adv_msg = col("advice.code"), col("advice.severity"), col("advice.message")
+    resp_note_offsets = col("notes.offsets")
+    resp_notes = col("notes")
+    sens_present = col("sensitivity.present")
+    sens_offsets = col("sensitivity.offsets")
+    sens_key = col("sensitivity.key")
+    sens_vals = {k: col(f"sensitivity.{k}") for k in _BAND_FIELDS}
+    # колонка добавлена без смены версии формата: в старых payload её нет
+    degraded = col("degraded") if "degraded" in c else [0] * doc["rows"]
+
+    rows: List[Dict[str, Any]] = []
+    for i in range(doc["rows"]):
+        scenarios = []
+        for j in range(scen_offsets[i], scen_offsets[i + 1]):
+            s: Dict[str, Any] = {"scenario": scen_code[j], "lots": scen_lots[j]}
+            for k in _SCENARIO_FLOATS:
+                s[k] = scen_floats[k][j]
+            s["notes"] = notes[note_offsets[j]:note_offsets[j + 1]]
+            scenarios.append(s)
+        sensitivity = None
+        if sens_present[i]:
+            sensitivity = {
+                sens_key[j]: {k: sens_vals[k][j] for k in _BAND_FIELDS}
+                for j in range(sens_offsets[i], sens_offsets[i + 1])
+            }
+        rows.append({
+            "price_per_sqm": price_per_sqm[i],
+            "lot_yield_estimate": lot_yield[i],
+            "scenarios": scenarios,
+            "advice": [
+                {"code": adv_code[j], "severity": adv_sev[j], "message": adv_msg[j]}
+                for j in range(adv_offsets[i], adv_offsets[i + 1])
+            ],
+            "sensitivity": sensitivity,
+            "best_scenario_code": best[i],
+            "scenario_order": order[order_offsets[i]:order_offsets[i + 1]],
+            "notes": resp_notes[resp_note_offsets[i]:resp_note_offsets[i + 1]],
+            "degraded": bool(degraded[i]),
+        })
+    return rows
@@ -4,10 +4,13 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from apps.api.routes.evaluate import router as evaluate_router
 from apps.api.routes.health import router as health_router
+from apps.api.routes.profiles import router as profiles_router
+from apps.api.routes.whatif import router as whatif_router
 
 import logging
 import os
 from apps.api.middleware.logging import EvaluateLoggingMiddleware
+from apps.api.overload import LoadShedMiddleware
 
 
 def get_allowed_origins() -> list[str]:
@@ -39,6 +42,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# упрощённый режим /evaluate под нагрузкой (внешняя — меряет весь путь запроса)
+app.add_middleware(LoadShedMiddleware)
+
 # Роуты
 app.include_router(health_router)     # ОСТАВЛЯЕМ этот health
-app.include_router(evaluate_router)   # /evaluate
\ No newline at end of file
+app.include_router(evaluate_router)   # /evaluate
+app.include_router(whatif_router)     # /evaluate/grid
+app.include_router(profiles_router)   # /profiles
\ No newline at end of file
@@ -56,7 +56,17 @@ class EvaluateLoggingMiddleware(BaseHTTPMiddleware):
                     chunks.append(chunk)
                 body = b"".join(chunks)
 
-            if body:
+            # вернуть тот же контент клиенту (поток уже вычитан — пересобираем ответ до разбора)
+            response = Response(
+                content=body,
+                status_code=response.status_code,
+                headers=dict(response.headers),
+                media_type=response.media_type,
+                background=response.background,
+            )
+
+            # сводку снимаем только с JSON (колоночный msgpack не разбираем)
+            if body and "json" in (response.headers.get("content-type") or ""):
                 data = json.loads(body.decode("utf-8"))
                 if isinstance(data, dict):
                     summary_out["lot_yield_estimate"] = data.get("lot_yield_estimate")
@@ -64,15 +74,6 @@ class EvaluateLoggingMiddleware(BaseHTTPMiddleware):
                     if scenarios and isinstance(scenarios[0], dict):
                         summary_out["profit"] = scenarios[0].get("profit")
                         summary_out["margin_on_cost"] = scenarios[0].get("margin_on_cost")
-
-                # вернуть тот же контент клиенту
-                response = Response(
-                    content=body,
-                    status_code=response.status_code,
-                    headers=dict(response.headers),
-                    media_type=response.media_type,
-                    background=response.background,
-                )
         except Exception:
             # не ломаем ответ из-за проблем логгирования
             pass
@@ -0,0 +1,170 @@
+# ФАЙЛ: apps/api/overload.py
+"""
+Адаптивный упрощённый режим /evaluate под нагрузкой.
+
+LoadMonitor меряет глубину очереди (запросы, принятые, но ещё не отвеченные)
+и EWMA латентности. LoadShedMiddleware на входе запроса спрашивает монитор,
+обслуживать ли запрос упрощённо, и кладёт решение в request.state.degraded;
+роут тогда считает только дешёвую часть (см. evaluate_many(degraded=True)).
+Выход из режима — с гистерезисом: обе метрики должны опуститься ниже
+порог × recover_ratio, иначе режим «дребезжит» на границе.
+
+Настройки (env, читаются при старте):
+  SUBDIV_DEGRADE_MODE        auto | off | force                 (auto)
+  SUBDIV_DEGRADE_INFLIGHT    порог запросов в обработке          (32)
+  SUBDIV_DEGRADE_LATENCY_MS  порог EWMA латентности, мс          (250)
+  SUBDIV_DEGRADE_RECOVER     доля порогов для выхода из режима   (0.5)
+"""
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Dict, Literal, Optional, Sequence
+
+DegradeMode = Literal["auto", "off", "force"]
+DEGRADED_HEADER = "x-degraded"
+
+
+@dataclass(frozen=True)
+class DegradeSettings:
+    mode: DegradeMode = "auto"
+    max_inflight: int = 32
+    max_latency_ms: float = 250.0
+    recover_ratio: float = 0.5
+
+    @classmethod
+    def from_env(cls) -> "DegradeSettings":
+        mode = os.getenv("SUBDIV_DEGRADE_MODE", "auto").strip().lower()
+        if mode not in ("auto", "off", "force"):
+            raise ValueError(f"SUBDIV_DEGRADE_MODE must be auto, off or force, got {mode!r}")
+        settings = cls(
+            mode=mode,  # type: ignore[arg-type]
+            max_inflight=int(os.getenv("SUBDIV_DEGRADE_INFLIGHT", cls.max_inflight)),
+            max_latency_ms=float(os.getenv("SUBDIV_DEGRADE_LATENCY_MS", cls.max_latency_ms)),
+            recover_ratio=float(os.getenv("SUBDIV_DEGRADE_RECOVER", cls.recover_ratio)),
+        )
+        if not 0.0 < settings.recover_ratio <= 1.0:
+            raise ValueError("SUBDIV_DEGRADE_RECOVER must be in (0, 1]")
+        return settings
+
+
+class LoadMonitor:
+    """
+    Счётчики под локом: admit/release вызываются из event loop, а snapshot —
+    и из sync-роутов в threadpool.
+    """
+
+    def __init__(self, settings: Optional[DegradeSettings] = None, *, alpha: float = 0.2) -> None:
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self.configure(settings or DegradeSettings())
+
+    def configure(self, settings: DegradeSettings) -> None:
+        """Новые пороги; метрики и счётчики сбрасываются."""
+        with self._lock:
+            self.settings = settings
+            self.inflight = 0
+            self.latency_ms = 0.0    # EWMA по завершённым запросам
+            self.degraded = False
+            self.admitted = 0
+            self.degraded_admitted = 0
+            self.transitions = 0     # входы в режим и выходы из него
+            self._samples = 0
+
+    def admit(self) -> bool:
+        """Запрос принят; True — обслужить его упрощённо."""
+        with self._lock:
+            self.inflight += 1
+            self.admitted += 1
+            degraded = self._decide()
+            if degraded:
+                self.degraded_admitted += 1
+            return degraded
+
+    def release(self, elapsed_s: float) -> None:
+        """Запрос отвечен за elapsed_s секунд."""
+        ms = elapsed_s * 1000.0
+        with self._lock:
+            self.inflight -= 1
+            if self._samples:
+                self.latency_ms += self.alpha * (ms - self.latency_ms)
+            else:
+                self.latency_ms = ms
+            self._samples += 1
+
+    def _decide(self) -> bool:
+        s = self.settings
+        if s.mode != "auto":
+            return s.mode == "force"
+        if not self.degraded:
+            if self.inflight > s.max_inflight or self.latency_ms > s.max_latency_ms:
+                self.degraded = True
+                self.transitions += 1
+        elif (
+            self.inflight <= s.max_inflight * s.recover_ratio
+            and self.latency_ms <= s.max_latency_ms * s.recover_ratio
+        ):
+            self.degraded = False
+            self.transitions += 1
+        return self.degraded
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            s = self.settings
+            return {
+                "mode": s.mode,
+                "degraded": s.mode == "force" or (s.mode == "auto" and self.degraded),
+                "inflight": self.inflight,
+                "latency_ewma_ms": round(self.latency_ms, 1),
+                "max_inflight": s.max_inflight,
+                "max_latency_ms": s.max_latency_ms,
+                "admitted": self.admitted,
+                "degraded_admitted": self.degraded_admitted,
+                "transitions": self.transitions,
+            }
+
+
+# монитор процесса (его читают middleware и /health)
+monitor = LoadMonitor(DegradeSettings.from_env())
+
+
+class LoadShedMiddleware:
+    """
+    Чистая ASGI-middleware (без буферизации тела): меряет запросы к paths,
+    кладёт решение в scope["state"]["degraded"] и помечает такие ответы
+    заголовком X-Degraded: 1 — по нему нагрузочный прогон считает их долю.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        *,
+        load_monitor: Optional[LoadMonitor] = None,
+        paths: Sequence[str] = ("/evaluate", "/evaluate/batch"),
+    ) -> None:
+        self.app = app
+        self.monitor = load_monitor or monitor
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        degraded = self.monitor.admit()
+        scope.setdefault("state", {})["degraded"] = degraded
+
+        async def send_marked(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((DEGRADED_HEADER.encode("latin-1"), b"1"))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        t0 = perf_counter()
+        try:
+            await self.app(scope, receive, send_marked if degraded else send)
+        finally:
+            self.monitor.release(perf_counter() - t0)
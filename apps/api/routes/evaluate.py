@@ -1,101 +1,95 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from functools import partial
+from typing import List
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
+
+from apps.api.cache import LRUCache, SingleFlight, request_digest
+from apps.api.columnar import (
+    MEDIA_TYPE as COLUMNAR_MEDIA_TYPE,
+    ColumnarUnavailable,
+    encode_evaluations,
+    negotiate,
+)
 from domain.models.evaluate import (
     EvaluateRequest,
+    EvaluateBatchRequest,
+    EvaluateBatchResponse,
     EvaluationResponse,
-    AdviceItem,
-    SensitivityBand,
 )
-from domain.services.enrich.service import enrich_request
-from domain.services.lot_yield.service import estimate_lot_yield
-from domain.services.scenarios.service import build_scenarios
+from domain.services.catalogs.service import get_catalogs
+from domain.services.evaluation.service import evaluate, evaluate_many
 
 router = APIRouter(prefix="", tags=["evaluate"])
 
+# упрощённые ответы (режим под нагрузкой): одинаковые запросы на пике
+# повторяются часто, а без текстов ответ не зависит от locale/verbosity
+_degraded_cache: LRUCache[EvaluationResponse] = LRUCache(maxsize=4096)
+
+# одинаковые одновременные /evaluate (двойной сабмит, несколько дашбордов
+# на одном объекте) ждут одно вычисление в threadpool вместо N
+inflight: SingleFlight[EvaluationResponse] = SingleFlight()
+
+
+def _is_degraded(request: Request) -> bool:
+    """Решение LoadShedMiddleware (в тестах роут может работать и без неё)."""
+    return bool(getattr(request.state, "degraded", False))
+
+
+def _request_key(req: EvaluateRequest, degraded: bool) -> str:
+    if degraded:
+        # без текстов упрощённый ответ не зависит от locale/verbosity
+        normalized = req.model_copy(update={"verbosity": "none", "locale": "en"})
+        # ответы кэшируются — версия справочников в ключе, чтобы смена снапшота их сбросила
+        return request_digest(normalized, salt=f"degraded:{get_catalogs().version}")
+    return request_digest(req)
+
 
-@router.post("/evaluate", response_model=EvaluationResponse)
-def evaluate(req: EvaluateRequest) -> EvaluationResponse:
-    # 1) Enrich (поднять пороги по R-коду, собрать контекст)
-    enriched, ctx = enrich_request(req)
-
-    # 2) Lot yield
-    rmap: Optional[Dict[str, Dict[str, float]]] = None
-    if ctx.r_code_info and enriched.prop.r_code:
-        rmap = {enriched.prop.r_code: ctx.r_code_info}
-
-    lots, ly_notes = estimate_lot_yield(
-        prop=enriched.prop,
-        scen=enriched.scen,
-        r_code_info=rmap,
-    )
-
-    # Прокинем заметки из lot_yield в общий контекст,
-    # чтобы билдер сценариев включил их в notes
-    ctx.notes = [*(ctx.notes or []), *ly_notes]
-
-    # 3) Базовая метрика
-    price_per_sqm = enriched.prop.purchase_price / enriched.prop.land_area_sqm
-
-    # 4) Построить набор сценариев (A/B/C) по обогащённым данным
-    scenarios = build_scenarios(enriched, ctx, lots)
-    scenarios_sorted = sorted(
-        scenarios,
-        key=lambda s: (float(s.profit), float(s.margin_on_cost)),
-        reverse=True,
-    )
-    best_code = scenarios_sorted[0].scenario if scenarios_sorted else None
-
-    # 5) Советы
-    advice: List[AdviceItem] = []
-    if lots == 0:
-        advice.append(
-            AdviceItem(
-                code="NO_YIELD",
-                severity="high",
-                message="Невозможно получить соответствующие лоты при текущих параметрах (проверьте фронтаж и R-код).",
-            )
-        )
-    if enriched.prop.frontage_m is None:
-        advice.append(
-            AdviceItem(
-                code="MISSING_FRONTAGE",
-                severity="medium",
-                message="Не указан фронтаж; расчёт носит ориентировочный характер без фронтажных проверок.",
-            )
-        )
-
-    # 6) Простая чувствительность к цене земли (±10%)
-    def _profit_for(psqm: float) -> float:
-        target_lot = (
-            enriched.scen.target_lot_size_sqm
-            if enriched.scen
-            else enriched.market.land_target_lot_size_sqm
-        )
-        rev = float(lots * target_lot * psqm)
-        if scenarios:
-            base_total = scenarios[0].total_cost
-            base_hold = scenarios[0].holding_cost
-            return rev - (base_total + base_hold)
-        return rev  # fallback если сценариев нет
-
-    base_p = float(enriched.market.land_price_per_sqm_small_lot)
-    sensitivity = {
-        "land_psqm": SensitivityBand(
-            base_profit=_profit_for(base_p),
-            best_profit=_profit_for(base_p * 1.10),
-            worst_profit=_profit_for(base_p * 0.90),
-        )
-    }
-
-    return EvaluationResponse(
-        price_per_sqm=price_per_sqm,
-        lot_yield_estimate=lots,
-        scenarios=scenarios_sorted,             # ← сортированные
-        advice=advice,
-        sensitivity=sensitivity,
-        best_scenario_code=best_code,           # ← NEW
-        scenario_order=[s.scenario for s in scenarios_sorted],
-    )
\ No newline at end of file
+def _evaluate_degraded(req: EvaluateRequest, key: str) -> EvaluationResponse:
+    result = _degraded_cache.get(key)
+    if result is None:
+        result = evaluate(req, degraded=True)
+        _degraded_cache.put(key, result)
+    return result
+
+
+def _columnar_response(results: List[EvaluationResponse]) -> Response:
+    try:
+        body = encode_evaluations(results)
+    except ColumnarUnavailable as e:
+        raise HTTPException(status_code=406, detail=str(e)) from e
+    return Response(content=body, media_type=COLUMNAR_MEDIA_TYPE)
+
+
+@router.post(
+    "/evaluate",
+    response_model=EvaluationResponse,
+    responses={200: {"content": {COLUMNAR_MEDIA_TYPE: {}}}},
+)
+async def evaluate_endpoint(req: EvaluateRequest, request: Request):
+    degraded = _is_degraded(request)
+    key = _request_key(req, degraded)
+    if degraded:
+        compute = partial(run_in_threadpool, _evaluate_degraded, req, key)
+    else:
+        compute = partial(run_in_threadpool, evaluate, req)
+    result = await inflight.do(key, compute)
+    if negotiate(request.headers.get("accept")) == COLUMNAR_MEDIA_TYPE:
+        return _columnar_response([result])
+    return result
+
+
+@router.post(
+    "/evaluate/batch",
+    response_model=EvaluateBatchResponse,
+    responses={200: {"content": {COLUMNAR_MEDIA_TYPE: {}}}},
+)
+def evaluate_batch(req: EvaluateBatchRequest, request: Request):
+    """Пакетная оценка; колоночный ответ — по Accept: application/x-msgpack."""
+    results = evaluate_many(req.items, degraded=_is_degraded(request))
+    if negotiate(request.headers.get("accept")) == COLUMNAR_MEDIA_TYPE:
+        return _columnar_response(results)
+    return EvaluateBatchResponse(results=results)
@@ -1,34 +1,38 @@
 from __future__ import annotations
 
-from pathlib import Path
 from typing import Dict
 
 from fastapi import APIRouter
 
-router = APIRouter(prefix="", tags=["health"])
+from apps.api.overload import monitor
+from apps.api.routes.evaluate import inflight
+from domain.services.catalogs.service import (
+    COST_CATALOG_FILE,
+    DUTY_BRACKETS_FILE,
+    R_CODES_FILE,
+    catalogs_dir,
+    get_catalogs,
+)
 
-def _repo_root() -> Path:
-    here = Path(__file__).resolve()
-    for p in [here] + list(here.parents):
-        if (p / "data" / "catalogs").exists():
-            return p
-    return Path.cwd()
+router = APIRouter(prefix="", tags=["health"])
 
 @router.get("/health")
 def health() -> Dict[str, object]:
-    root = _repo_root()
-    catalogs = root / "data" / "catalogs"
-    r_codes = catalogs / "r_codes_wa.csv"
-    costs = catalogs / "cost_catalog_wa.csv"
-    duty = catalogs / "wa_stamp_duty_brackets.csv"
+    catalogs = catalogs_dir()
+    r_codes = catalogs / R_CODES_FILE
+    costs = catalogs / COST_CATALOG_FILE
+    duty = catalogs / DUTY_BRACKETS_FILE
 
     return {
         "status": "ok",
         "version": "0.0.1",
         "catalogs_dir": str(catalogs),
+        "catalogs_version": get_catalogs().version,
         "files_present": {
             "r_codes_wa.csv": r_codes.exists(),
             "cost_catalog_wa.csv": costs.exists(),
             "wa_stamp_duty_brackets.csv": duty.exists(),
         },
+        "load": monitor.snapshot(),
+        "coalescing": inflight.stats(),
     }
\ No newline at end of file
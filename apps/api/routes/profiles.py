@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+from fastapi import APIRouter
+
+router = APIRouter(prefix="", tags=["profiles"])
+
+
+@router.get("/profiles")
+def list_profiles() -> Dict[str, List[Dict[str, object]]]:
+    """Серверные профили допущений/рынка: на них ссылаются asm_profile/market_profile."""
+    from domain.services.profiles.service import get_profiles
+
+    reg = get_profiles()
+    return {
+        kind: [
+            {
+                "id": p.id,
+                "version": p.version,
+                "ref": p.ref,
+                "description": p.description,
+                "values": p.values.model_dump(mode="json"),
+            }
+            for p in reg.list(kind)
+        ]
+        for kind in ("asm", "market")
+    }
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import base64
+from typing import Dict, Optional
+
+from fastapi import APIRouter, HTTPException
+
+from apps.api.cache import LRUCache, request_digest
+from domain.models.evaluate import GridAxisValues, WhatIfGridRequest, WhatIfGridResponse
+from domain.services.arv.service import estimate_missing_arv, with_arv
+from domain.services.catalogs.service import get_catalogs
+from domain.services.enrich.service import enrich_request
+from domain.services.lot_yield.service import estimate_lot_yield
+
+router = APIRouter(prefix="", tags=["evaluate"])
+
+# Версия формата сетки — входит в ключ кэша, чтобы смена арифметики его инвалидировала
+GRID_VERSION = "2"
+
+_grid_cache: LRUCache[WhatIfGridResponse] = LRUCache(maxsize=512)
+
+
+@router.post("/evaluate/grid", response_model=WhatIfGridResponse)
+def evaluate_grid(req: WhatIfGridRequest) -> WhatIfGridResponse:
+    """
+    Предрасчитанная сетка profit/margin по интерактивным параметрам
+    (цена земли, цена покупки, ставка, срок) — UI интерполирует локально.
+    """
+    # сетка нужна только интерактивному UI — модуль грузим при первом запросе
+    from domain.services.scenarios.grid import GRID_FIELDS, build_scenario_grid
+
+    # версия справочников в ключе: после смены снапшота старые сетки не отдаются
+    digest = request_digest(req, salt=f"{GRID_VERSION}:{get_catalogs().version}")
+    cached = _grid_cache.get(digest)
+    if cached is not None:
+        return cached
+
+    # заметки сетке не нужны
+    enriched, ctx = enrich_request(req.base.model_copy(update={"verbosity": "none"}))
+    # как и /evaluate: без house_arv сценарий C считается по оценке модели ARV
+    (arv,) = estimate_missing_arv([enriched])
+    enriched = with_arv(enriched, arv)
+    rmap: Optional[Dict[str, Dict[str, float]]] = None
+    if ctx.r_code_info and enriched.prop.r_code:
+        rmap = {enriched.prop.r_code: ctx.r_code_info}
+    lots, _ = estimate_lot_yield(
+        prop=enriched.prop, scen=enriched.scen, r_code_info=rmap, verbosity="none"
+    )
+
+    try:
+        grid = build_scenario_grid(
+            enriched,
+            lots,
+            [req.land_psqm, req.purchase_price, req.annual_interest_rate, req.subdiv_months],
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+    resp = WhatIfGridResponse(
+        lots=grid.lots,
+        scenarios=grid.scenarios,
+        fields=list(GRID_FIELDS),
+        axes=[GridAxisValues(name=name, values=vals) for name, vals in grid.axes],
+        shape=grid.shape,
+        digest=digest,
+        data=base64.b64encode(grid.to_bytes()).decode("ascii"),
+    )
+    _grid_cache.put(digest, resp)
+    return resp
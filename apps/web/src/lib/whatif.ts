@@ -0,0 +1,95 @@
+// What-if сетка с /evaluate/grid: декодирование и локальная интерполяция
+// (без запроса к API на каждое движение слайдера)
+
+export type GridAxisValues = { name: string; values: number[] }
+
+export type WhatIfGridResponse = {
+  lots: number
+  scenarios: string[]
+  fields: string[]
+  axes: GridAxisValues[]
+  shape: number[] // [scenario, field, ...axes], row-major
+  dtype: 'float32'
+  byte_order: 'little'
+  interpolation: 'multilinear'
+  digest: string
+  data: string // base64
+}
+
+export type WhatIfGrid = WhatIfGridResponse & { values: Float32Array; strides: number[] }
+
+const BASE = process.env.NEXT_PUBLIC_API_BASE
+
+export function decodeGrid(res: WhatIfGridResponse): WhatIfGrid {
+  const bin = atob(res.data)
+  const buf = new ArrayBuffer(bin.length)
+  const bytes = new Uint8Array(buf)
+  for (let i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i)
+  // сервер всегда отдаёт little-endian; DataView — на случай big-endian клиента
+  const view = new DataView(buf)
+  const values = new Float32Array(bin.length / 4)
+  for (let i = 0; i < values.length; i++) values[i] = view.getFloat32(i * 4, true)
+
+  const strides = new Array(res.shape.length).fill(1)
+  for (let d = res.shape.length - 2; d >= 0; d--) strides[d] = strides[d + 1] * res.shape[d + 1]
+  return { ...res, values, strides }
+}
+
+export async function fetchGrid(body: unknown): Promise<WhatIfGrid> {
+  const res = await fetch(`${BASE}/evaluate/grid`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(body),
+  })
+  if (!res.ok) {
+    const text = await res.text()
+    throw new Error(`API /evaluate/grid ${res.status}: ${text}`)
+  }
+  return decodeGrid(await res.json())
+}
+
+// Индекс нижнего узла и вес внутри ячейки (значения вне диапазона — прижимаем к краю)
+function locate(values: number[], x: number): [number, number] {
+  const n = values.length
+  if (n < 2 || x <= values[0]) return [0, 0]
+  if (x >= values[n - 1]) return [n - 2, 1]
+  let lo = 0
+  let hi = n - 1
+  while (hi - lo > 1) {
+    const mid = (lo + hi) >> 1
+    if (values[mid] <= x) lo = mid
+    else hi = mid
+  }
+  const span = values[lo + 1] - values[lo]
+  return [lo, span ? (x - values[lo]) / span : 0]
+}
+
+// Мультилинейная интерполяция: point — значения осей в порядке grid.axes
+export function interpolate(grid: WhatIfGrid, scenario: string, field: string, point: number[]): number {
+  const s = grid.scenarios.indexOf(scenario)
+  const f = grid.fields.indexOf(field)
+  if (s < 0 || f < 0) return NaN
+
+  const base = s * grid.strides[0] + f * grid.strides[1]
+  const cells = grid.axes.map((a, i) => locate(a.values, point[i]))
+  const dims = cells.length
+  let acc = 0
+  for (let corner = 0; corner < 1 << dims; corner++) {
+    let w = 1
+    let idx = base
+    for (let d = 0; d < dims; d++) {
+      const [lo, t] = cells[d]
+      const up = (corner >> d) & 1
+      const stride = grid.strides[d + 2]
+      if (grid.axes[d].values.length < 2) {
+        if (up) w = 0
+        idx += lo * stride
+        continue
+      }
+      w *= up ? t : 1 - t
+      idx += (lo + up) * stride
+    }
+    if (w) acc += w * grid.values[idx]
+  }
+  return acc
+}
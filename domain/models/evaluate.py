@@ -1,8 +1,19 @@
-from typing import Literal, Optional, Dict, List
-from pydantic import BaseModel, Field, ConfigDict
+from typing import Any, Literal, Optional, Dict, List
+from pydantic import (
+    BaseModel,
+    Field,
+    ConfigDict,
+    SerializerFunctionWrapHandler,
+    model_serializer,
+    model_validator,
+)
 
 
 Severity = Literal["low", "medium", "high"]
+# none — без заметок; summary — общие заметки один раз + теги сценариев;
+# full — всё, вкл. разбивку затрат
+Verbosity = Literal["none", "summary", "full"]
+Locale = Literal["en", "ru"]
 
 
 class PropertyInput(BaseModel):
@@ -69,7 +80,7 @@ class AdviceItem(BaseModel):
 
     code: str
     severity: Severity
-    message: str
+    message: Optional[str] = None  # None при verbosity="none"
 
 
 class SensitivityBand(BaseModel):
@@ -87,6 +98,38 @@ class EvaluateRequest(BaseModel):
     asm: Assumptions
     market: MarketBenchmarks
     scen: Optional[ScenarioSettings] = None
+    verbosity: Verbosity = "full"
+    locale: Locale = "en"
+    # Вместо asm/market — профиль на сервере (data/catalogs/profiles.yaml):
+    # "id" или "id@version" + точечные переопределения полей
+    asm_profile: Optional[str] = None
+    asm_overrides: Optional[Dict[str, Any]] = None
+    market_profile: Optional[str] = None
+    market_overrides: Optional[Dict[str, Any]] = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def _resolve_profiles(cls, data: Any) -> Any:
+        if isinstance(data, dict) and any(
+            data.get(k) is not None
+            for k in ("asm_profile", "asm_overrides", "market_profile", "market_overrides")
+        ):
+            # сервис профилей грузим только для запросов, которые на них ссылаются
+            from domain.services.profiles.service import resolve_request_profiles
+
+            data = resolve_request_profiles(data)
+        return data
+
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler: SerializerFunctionWrapHandler):
+        data = handler(self)
+        # раздел из профиля определяется ссылкой id@version + overrides: без него
+        # дамп валидируется обратно, а ключи кэша не зависят от значений профиля
+        if self.asm_profile:
+            data.pop("asm", None)
+        if self.market_profile:
+            data.pop("market", None)
+        return data
 
 
 class EvaluationResponse(BaseModel):
@@ -98,4 +141,68 @@ class EvaluationResponse(BaseModel):
     advice: List[AdviceItem] = Field(default_factory=list)
     sensitivity: Optional[Dict[str, SensitivityBand]] = None
     best_scenario_code: Optional[str] = None
-    scenario_order: List[str] = Field(default_factory=list)
\ No newline at end of file
+    scenario_order: List[str] = Field(default_factory=list)
+    notes: List[str] = Field(default_factory=list, description="Общие заметки (verbosity=summary)")
+    degraded: bool = Field(
+        False, description="Упрощённый ответ под нагрузкой (без C, текстов и чувствительности)"
+    )
+
+class EvaluateBatchRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    items: List[EvaluateRequest] = Field(..., min_length=1, max_length=10_000)
+
+
+class EvaluateBatchResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    results: List[EvaluationResponse]
+
+
+# ---- what-if сетка (предрасчёт для интерактивного UI) ----
+
+class GridAxis(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    min: float = Field(..., ge=0)
+    max: float = Field(..., ge=0)
+    steps: int = Field(9, ge=2, le=33, description="Число узлов (включая края)")
+
+    @model_validator(mode="after")
+    def _check_range(self) -> "GridAxis":
+        if self.max < self.min:
+            raise ValueError("max must be >= min")
+        return self
+
+
+class WhatIfGridRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    base: EvaluateRequest
+    # None → диапазон по умолчанию вокруг значения из base
+    land_psqm: Optional[GridAxis] = None
+    purchase_price: Optional[GridAxis] = None
+    annual_interest_rate: Optional[GridAxis] = None
+    subdiv_months: Optional[GridAxis] = None
+
+
+class GridAxisValues(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    name: str
+    values: List[float]
+
+
+class WhatIfGridResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    lots: int
+    scenarios: List[str]
+    fields: List[str]
+    axes: List[GridAxisValues]
+    shape: List[int] = Field(..., description="[scenario, field, *axes], row-major (C order)")
+    dtype: Literal["float32"] = "float32"
+    byte_order: Literal["little"] = "little"
+    interpolation: Literal["multilinear"] = "multilinear"
+    digest: str = Field(..., description="Хэш свойства/допущений; ключ кэша")
+    data: str = Field(..., description="base64 упакованного массива float32")
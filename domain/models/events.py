@@ -0,0 +1,51 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# Модели входящих событий; схемы-источники — contracts/events/*.json.
+# Схемы не запрещают дополнительные поля (additionalProperties), поэтому
+# модели их игнорируют: продюсер может добавить поле без поломки потребителей.
+
+
+class CompsUpdatedPayload(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    suburb_code: str
+    land_smalllot_psqm_median: float = Field(..., gt=0)
+    house_arv_median: Optional[float] = None
+    lookback_months: int = 6
+    source: Optional[str] = None
+
+
+class CompsUpdated(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    event_id: str
+    event_type: Literal["CompsUpdated"] = "CompsUpdated"
+    version: Literal[1] = 1
+    occurred_at: str
+    payload: CompsUpdatedPayload
+
+
+class ListingCreatedPayload(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    listing_id: str
+    property_id: str
+    address: str
+    suburb_code: Optional[str] = None
+    land_area_sqm: float
+    frontage_m: Optional[float] = None
+    asking_price: float
+    source: str
+
+
+class ListingCreated(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    event_id: str
+    event_type: Literal["ListingCreated"] = "ListingCreated"
+    version: Literal[1] = 1
+    occurred_at: str
+    payload: ListingCreatedPayload
@@ -0,0 +1,196 @@
+# ФАЙЛ: domain/services/arv/service.py
+"""
+Оценка ARV нового дома по артефакту модели (см. training.py).
+
+Инференс пакетный: ArvModel.predict_batch считает батч по колонкам array('d')
+(проход на величину) — без pydantic-объектов на строку. evaluate_many
+собирает объекты без house_arv со всего батча и оценивает их разом.
+"""
+from __future__ import annotations
+
+import json
+import math
+import operator
+import os
+import threading
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Sequence
+
+from domain.models.evaluate import EvaluateRequest
+
+Confidence = Literal["high", "medium", "low"]
+
+# двусторонний 90% интервал
+_Z90 = 1.645
+
+
+@dataclass(frozen=True)
+class ArvEstimate:
+    value: float
+    low: float
+    high: float
+    confidence: Confidence
+    n_comps: int               # продаж в пригороде (0 — пригород неизвестен модели)
+    suburb: Optional[str]
+    model_version: str
+
+    @property
+    def spread_pct(self) -> float:
+        """Полуширина 90% интервала в % от оценки."""
+        return 100.0 * (self.high - self.low) / (2.0 * self.value)
+
+
+def _confidence(n: int, rel_half: float) -> Confidence:
+    if n >= 20 and rel_half <= 0.12:
+        return "high"
+    if n >= 8 and rel_half <= 0.20:
+        return "medium"
+    return "low"
+
+
+class ArvModel:
+    def __init__(self, artifact: Dict[str, Any]) -> None:
+        self.version: str = artifact["version"]
+        self._b0 = float(artifact["coef"]["intercept"])
+        self._b_lot = float(artifact["coef"]["log_lot"])
+        self._b_build = float(artifact["coef"]["log_build"])
+        self._mu_lot = float(artifact["center"]["log_lot"])
+        self._mu_build = float(artifact["center"]["log_build"])
+        self._sigma = float(artifact["residual_std"])
+        self._tau = float(artifact["suburb_std"])
+        self.default_build_sqm = float(artifact["default_build_sqm"])
+        self._suburbs: Dict[str, tuple] = {
+            k: (float(v["effect"]), int(v["n"])) for k, v in artifact["suburbs"].items()
+        }
+
+    @classmethod
+    def from_file(cls, path: Path) -> "ArvModel":
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    def predict_batch(
+        self,
+        suburbs: Sequence[Optional[str]],
+        lot_sqm: Sequence[float],
+        build_sqm: Optional[Sequence[float]] = None,
+    ) -> List[ArvEstimate]:
+        """
+        Оценки по колонкам: log площадей, μ, ±z·se и exp — каждый отдельным
+        проходом map встроенных функций по array('d') (numpy в зависимостях нет),
+        затем один проход сборки ArvEstimate. log площади дома по умолчанию
+        считается один раз на батч, se — один раз на число продаж пригорода.
+        """
+        n = len(suburbs)
+        lots = array("d", lot_sqm)
+        if len(lots) != n or (build_sqm is not None and len(build_sqm) != n):
+            raise ValueError("suburbs, lot_sqm and build_sqm must have the same length")
+
+        # неизвестный пригород: эффект 0 (общий уровень) и разброс между пригородами
+        keys = [(s or "").strip().upper() for s in suburbs]
+        stats = [self._suburbs.get(k, (0.0, 0)) for k in keys]
+        counts = [cnt for _, cnt in stats]
+        unknown_se = math.sqrt(self._sigma ** 2 + self._tau ** 2)
+        half_by_count = {
+            cnt: _Z90 * (self._sigma * math.sqrt(1.0 + 1.0 / cnt) if cnt else unknown_se)
+            for cnt in set(counts)
+        }
+
+        base = self._b0 - self._b_lot * self._mu_lot - self._b_build * self._mu_build
+        b_lot, b_build = self._b_lot, self._b_build
+        if build_sqm is None:
+            build_term = array("d", [b_build * math.log(self.default_build_sqm)]) * n
+        else:
+            build_term = array("d", map(b_build.__mul__, map(math.log, build_sqm)))
+        lot_term = array("d", map(b_lot.__mul__, map(math.log, lots)))
+        effects = map(base.__add__, map(operator.itemgetter(0), stats))
+        mu = array("d", map(operator.add, map(operator.add, effects, lot_term), build_term))
+        half = array("d", map(half_by_count.__getitem__, counts))
+        values = array("d", map(math.exp, mu))
+        lows = array("d", map(math.exp, map(operator.sub, mu, half)))
+        highs = array("d", map(math.exp, map(operator.add, mu, half)))
+
+        version = self.version
+        return [
+            ArvEstimate(
+                value=round(value, -3),
+                low=round(low, -3),
+                high=round(high, -3),
+                confidence=_confidence(cnt, (high - low) / (2.0 * value)),
+                n_comps=cnt,
+                suburb=key if cnt else None,
+                model_version=version,
+            )
+            for key, cnt, value, low, high in zip(keys, counts, values, lows, highs)
+        ]
+
+
+# ---- артефакт на процесс ----
+
+@lru_cache(maxsize=1)
+def arv_model_path() -> Path:
+    """$SUBDIV_ARV_MODEL или <repo>/data/models/arv_v1.json."""
+    env = os.getenv("SUBDIV_ARV_MODEL")
+    if env:
+        return Path(env)
+    return Path(__file__).resolve().parents[3] / "data" / "models" / "arv_v1.json"
+
+
+_lock = threading.Lock()
+_model: Optional[ArvModel] = None
+_loaded = False
+
+
+def get_arv_model() -> Optional[ArvModel]:
+    """Модель процесса; None, если артефакта нет (сценарий C тогда требует house_arv)."""
+    global _model, _loaded
+    if not _loaded:
+        with _lock:
+            if not _loaded:
+                path = arv_model_path()
+                _model = ArvModel.from_file(path) if path.exists() else None
+                _loaded = True
+    return _model
+
+
+def reload_arv_model() -> Optional[ArvModel]:
+    global _loaded
+    arv_model_path.cache_clear()
+    with _lock:
+        _loaded = False
+    return get_arv_model()
+
+
+# ---- применение к запросам ----
+
+def _target_lot(req: EvaluateRequest) -> float:
+    return float(
+        req.scen.target_lot_size_sqm if req.scen else req.market.land_target_lot_size_sqm
+    )
+
+
+def estimate_missing_arv(reqs: Sequence[EvaluateRequest]) -> List[Optional[ArvEstimate]]:
+    """
+    ARV для запросов без market.house_arv (одним батчем; обычно — после enrich,
+    чтобы размер лота уже учитывал минимум R-кода). Для остальных — None.
+    """
+    out: List[Optional[ArvEstimate]] = [None] * len(reqs)
+    missing = [i for i, r in enumerate(reqs) if r.market.house_arv is None]
+    model = get_arv_model() if missing else None
+    if model is None:
+        return out
+    estimates = model.predict_batch(
+        [reqs[i].prop.suburb for i in missing],
+        [_target_lot(reqs[i]) for i in missing],
+    )
+    for i, est in zip(missing, estimates):
+        out[i] = est
+    return out
+
+
+def with_arv(req: EvaluateRequest, estimate: Optional[ArvEstimate]) -> EvaluateRequest:
+    if estimate is None:
+        return req
+    market = req.market.model_copy(update={"house_arv": estimate.value})
+    return req.model_copy(update={"market": market})
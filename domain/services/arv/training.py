@@ -0,0 +1,128 @@
+# ФАЙЛ: domain/services/arv/training.py
+"""
+Офлайн-обучение модели ARV (after-repair value) нового дома по продажам-компам.
+
+Модель — ridge-регрессия в логарифмах:
+    log(price) = b0 + s[suburb] + b1·(log(lot) − μ_lot) + b2·(log(build) − μ_build)
+Эффекты пригородов стягиваются к нулю (штраф ridge), поэтому пригород
+с парой продаж не уводит оценку далеко от общего уровня. Результат —
+небольшой JSON-артефакт с коэффициентами (см. service.ArvModel).
+"""
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import math
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from statistics import median
+from typing import Any, Dict, List, Sequence
+
+ARTIFACT_FORMAT = 1
+
+
+@dataclass(frozen=True)
+class CompSale:
+    suburb: str
+    lot_sqm: float
+    build_sqm: float
+    sale_price: float
+
+
+def load_comps(path: Path) -> List[CompSale]:
+    """CSV: sale_date,suburb_code,lot_sqm,build_sqm,sale_price (строки с ошибками пропускаются)."""
+    out: List[CompSale] = []
+    with path.open("r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                sale = CompSale(
+                    suburb=(row.get("suburb_code") or "").strip().upper(),
+                    lot_sqm=float(row["lot_sqm"]),
+                    build_sqm=float(row["build_sqm"]),
+                    sale_price=float(row["sale_price"]),
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+            if sale.suburb and min(sale.lot_sqm, sale.build_sqm, sale.sale_price) > 0:
+                out.append(sale)
+    return out
+
+
+def _solve(a: List[List[float]], b: List[float]) -> List[float]:
+    """Гаусс с выбором главного элемента; матрица маленькая (3 + число пригородов)."""
+    n = len(b)
+    m = [row[:] + [b[i]] for i, row in enumerate(a)]
+    for col in range(n):
+        piv = max(range(col, n), key=lambda r: abs(m[r][col]))
+        if abs(m[piv][col]) < 1e-12:
+            raise ValueError("Singular system: not enough distinct comps to fit the model")
+        m[col], m[piv] = m[piv], m[col]
+        for r in range(col + 1, n):
+            f = m[r][col] / m[col][col]
+            if f:
+                for c in range(col, n + 1):
+                    m[r][c] -= f * m[col][c]
+    x = [0.0] * n
+    for r in range(n - 1, -1, -1):
+        x[r] = (m[r][n] - sum(m[r][c] * x[c] for c in range(r + 1, n))) / m[r][r]
+    return x
+
+
+def fit_arv(sales: Sequence[CompSale], *, ridge: float = 2.0, source: str = "") -> Dict[str, Any]:
+    if len(sales) < 5:
+        raise ValueError(f"Need at least 5 comparable sales, got {len(sales)}")
+    suburbs = sorted({s.suburb for s in sales})
+    log_lot = [math.log(s.lot_sqm) for s in sales]
+    log_build = [math.log(s.build_sqm) for s in sales]
+    mu_lot, mu_build = sum(log_lot) / len(sales), sum(log_build) / len(sales)
+    col = {sub: 3 + i for i, sub in enumerate(suburbs)}
+    p = 3 + len(suburbs)
+
+    # нормальные уравнения (XᵀX + λD)·β = Xᵀy, штраф только на эффекты пригородов
+    xtx = [[0.0] * p for _ in range(p)]
+    xty = [0.0] * p
+    ys = []
+    for s, ll, lb in zip(sales, log_lot, log_build):
+        x = {0: 1.0, 1: ll - mu_lot, 2: lb - mu_build, col[s.suburb]: 1.0}
+        y = math.log(s.sale_price)
+        ys.append((x, y))
+        for i, xi in x.items():
+            xty[i] += xi * y
+            for j, xj in x.items():
+                xtx[i][j] += xi * xj
+    for i in range(3, p):
+        xtx[i][i] += ridge
+    beta = _solve(xtx, xty)
+
+    ssr = sum((y - sum(beta[i] * xi for i, xi in x.items())) ** 2 for x, y in ys)
+    dof = max(len(sales) - p, 1)
+    effects = beta[3:]
+    counts = {sub: 0 for sub in suburbs}
+    for s in sales:
+        counts[s.suburb] += 1
+
+    digest = hashlib.sha256(
+        "\n".join(f"{s.suburb},{s.lot_sqm},{s.build_sqm},{s.sale_price}" for s in sales).encode()
+    ).hexdigest()
+    return {
+        "format": ARTIFACT_FORMAT,
+        "version": f"arv-{ARTIFACT_FORMAT}-{digest[:8]}",
+        "trained_on": {"rows": len(sales), "source": source, "sha256": digest, "ridge": ridge},
+        "center": {"log_lot": mu_lot, "log_build": mu_build},
+        "coef": {"intercept": beta[0], "log_lot": beta[1], "log_build": beta[2]},
+        "suburbs": {
+            sub: {"effect": round(effects[i], 6), "n": counts[sub]} for i, sub in enumerate(suburbs)
+        },
+        "residual_std": math.sqrt(ssr / dof),
+        "suburb_std": math.sqrt(sum(e * e for e in effects) / max(len(effects), 1)),
+        "default_build_sqm": median(s.build_sqm for s in sales),
+    }
+
+
+def write_artifact(artifact: Dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(artifact, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
@@ -0,0 +1,231 @@
+# ФАЙЛ: domain/services/catalogs/service.py
+from __future__ import annotations
+
+import csv
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Protocol, Sequence, Tuple
+
+Bracket = Tuple[float, float, float]  # (lower_bound, rate, fixed_amount)
+
+R_CODES_FILE = "r_codes_wa.csv"
+COST_CATALOG_FILE = "cost_catalog_wa.csv"
+DUTY_BRACKETS_FILE = "wa_stamp_duty_brackets.csv"
+SOURCE_FILES = (R_CODES_FILE, COST_CATALOG_FILE, DUTY_BRACKETS_FILE)
+
+
+class CostItem(NamedTuple):
+    unit: str     # "AUD" / "percent"
+    value: float  # default_value; 0.0 если пусто/не число
+
+
+class CatalogView(Protocol):
+    """Чтение справочников: CSV в памяти или mmap-снапшот (см. snapshot.py)."""
+    version: str
+
+    def r_code(self, code: str) -> Optional[Dict[str, float]]: ...
+
+    def cost_item(self, code: str) -> Optional[CostItem]: ...
+
+    @property
+    def duty_brackets(self) -> Sequence[Bracket]: ...
+
+
+@dataclass
+class Catalogs:
+    """Справочники data/catalogs, разобранные из CSV в память процесса."""
+    r_codes: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    costs: Dict[str, CostItem] = field(default_factory=dict)
+    duty_brackets: List[Bracket] = field(default_factory=list)
+    version: str = "csv"
+
+    def r_code(self, code: str) -> Optional[Dict[str, float]]:
+        return self.r_codes.get(code)
+
+    def cost_item(self, code: str) -> Optional[CostItem]:
+        return self.costs.get(code)
+
+
+# ---- поиск каталогов ----
+
+@lru_cache(maxsize=1)
+def catalogs_dir() -> Path:
+    """
+    Каталог справочников: $SUBDIV_CATALOGS_DIR или <repo>/data/catalogs
+    (фиксированный путь от этого файла — без обхода родителей на каждый вызов).
+    """
+    env = os.getenv("SUBDIV_CATALOGS_DIR")
+    if env:
+        return Path(env)
+    repo = Path(__file__).resolve().parents[3]
+    candidate = repo / "data" / "catalogs"
+    if candidate.exists():
+        return candidate
+    return Path.cwd() / "data" / "catalogs"
+
+
+def snapshots_dir() -> Path:
+    """Бинарные снапшоты: $SUBDIV_CATALOG_SNAPSHOT_DIR или data/catalogs/snapshots."""
+    env = os.getenv("SUBDIV_CATALOG_SNAPSHOT_DIR")
+    return Path(env) if env else catalogs_dir() / "snapshots"
+
+
+# ---- парсеры CSV ----
+
+def _num(row: Dict[str, str], key: str) -> Optional[float]:
+    val = (row.get(key) or "").strip()
+    if val == "":
+        return None
+    try:
+        return float(val)
+    except ValueError:
+        return None
+
+
+def load_r_codes(path: Path) -> Dict[str, Dict[str, float]]:
+    """
+    r_codes_wa.csv →
+      { "R20": {"min_lot_sqm": 350, "avg_lot_sqm": 450, "min_frontage_m": 10}, ... }
+    """
+    table: Dict[str, Dict[str, float]] = {}
+    if not path.exists():
+        return table
+    with path.open("r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            code = (row.get("r_code") or "").strip()
+            if not code:
+                continue
+            table[code] = {
+                "min_lot_sqm": _num(row, "min_lot_sqm") or 0.0,
+                "avg_lot_sqm": _num(row, "avg_lot_sqm") or 0.0,
+                "min_frontage_m": _num(row, "min_frontage_m") or 0.0,
+            }
+    return table
+
+
+def load_costs(path: Path) -> Dict[str, CostItem]:
+    """cost_catalog_wa.csv → { "ITEM_CODE": CostItem(unit, value) }"""
+    table: Dict[str, CostItem] = {}
+    if not path.exists():
+        return table
+    with path.open("r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            code = (row.get("item_code") or "").strip()
+            if not code:
+                continue
+            table[code] = CostItem(
+                unit=(row.get("unit") or "").strip(),
+                value=_num(row, "default_value") or 0.0,
+            )
+    return table
+
+
+def load_duty_brackets(path: Path) -> List[Bracket]:
+    """
+    wa_stamp_duty_brackets.csv: lower_bound,rate,fixed
+    Строки с ошибками пропускаются; результат отсортирован по lower_bound.
+    """
+    if not path.exists():
+        return []
+    out: List[Bracket] = []
+    with path.open("r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                lb = float((row.get("lower_bound") or "").strip())
+                rate = float((row.get("rate") or "").strip())
+                fixed = float((row.get("fixed") or "").strip())
+            except ValueError:
+                continue
+            out.append((lb, rate, fixed))
+    out.sort(key=lambda x: x[0])
+    return out
+
+
+def load_from_csv(root: Optional[Path] = None) -> Catalogs:
+    root = root or catalogs_dir()
+    return Catalogs(
+        r_codes=load_r_codes(root / R_CODES_FILE),
+        costs=load_costs(root / COST_CATALOG_FILE),
+        duty_brackets=load_duty_brackets(root / DUTY_BRACKETS_FILE),
+    )
+
+
+# ---- кэш на процесс ----
+
+_lock = threading.Lock()
+_csv_catalogs: Optional[Catalogs] = None
+_csv_digest: Optional[str] = None  # digest CSV, из-за которых снапшот признан устаревшим
+_watcher = None  # snapshot.SnapshotWatcher
+# явно заданные справочники (use_catalogs) — приоритетнее снапшота и CSV процесса
+_override: ContextVar[Optional[CatalogView]] = ContextVar("catalogs_override", default=None)
+
+
+def _snapshot_watcher():
+    global _watcher
+    if _watcher is None:
+        with _lock:
+            if _watcher is None:
+                # импорт здесь: snapshot.py сам зависит от этого модуля
+                from domain.services.catalogs.snapshot import SnapshotWatcher
+
+                _watcher = SnapshotWatcher(snapshots_dir(), sources=catalogs_dir())
+    return _watcher
+
+
+def get_catalogs() -> CatalogView:
+    """
+    Текущие справочники процесса: mmap-снапшот (если собран, с подхватом
+    новой версии), иначе CSV, разобранные один раз. Снапшот, собранный
+    из других CSV (их правили после сборки), игнорируется — тогда CSV
+    перечитываются при каждой новой правке.
+    """
+    pinned = _override.get()
+    if pinned is not None:
+        return pinned
+    watcher = _snapshot_watcher()
+    mapped = watcher.current()
+    if mapped is not None:
+        return mapped
+
+    global _csv_catalogs, _csv_digest
+    stale = watcher.stale_sources
+    cats = _csv_catalogs
+    if cats is None or (stale is not None and stale != _csv_digest):
+        with _lock:
+            if _csv_catalogs is None or (stale is not None and stale != _csv_digest):
+                _csv_catalogs = load_from_csv()
+                if stale is not None:
+                    # своя версия на каждую правку — по ней инвалидируются кэши ответов
+                    _csv_catalogs.version = f"csv-{stale[:12]}"
+                _csv_digest = stale
+            cats = _csv_catalogs
+    return cats
+
+
+def reload_catalogs() -> CatalogView:
+    """Сбросить кэш (после правки CSV / смены $SUBDIV_CATALOGS_DIR и т.п.)."""
+    global _csv_catalogs, _csv_digest, _watcher
+    catalogs_dir.cache_clear()
+    with _lock:
+        _csv_catalogs = None
+        _csv_digest = None
+        _watcher = None
+    return get_catalogs()
+
+
+@contextmanager
+def use_catalogs(view: CatalogView) -> Iterator[CatalogView]:
+    """
+    Оценивать с конкретной версией справочников (replay старой/новой версии
+    бок о бок). Действует в текущем контексте (поток/задача), не глобально.
+    """
+    token = _override.set(view)
+    try:
+        yield view
+    finally:
+        _override.reset(token)
@@ -0,0 +1,321 @@
+# ФАЙЛ: domain/services/catalogs/snapshot.py
+"""
+Версионированный бинарный снапшот справочников для mmap.
+
+Файл: <snapshots_dir>/catalogs-v000001.bin, указатель на текущую версию — файл
+CURRENT (имя .bin), заменяется атомарно через os.replace. Воркеры открывают
+снапшот только на чтение (mmap ACCESS_READ) — страницы page cache общие
+для всех процессов, в памяти воркера нет копии справочников.
+
+Раскладка (little-endian):
+  header   HEADER
+  r_codes  R_CODE_REC × n, отсортированы по коду (бинарный поиск)
+  costs    COST_REC × n, отсортированы по коду
+  duty     DUTY_REC × n, отсортированы по lower_bound
+  strings  u32 offsets × (n + 1) + utf-8 blob
+"""
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from domain.services.catalogs.service import (
+    SOURCE_FILES,
+    Bracket,
+    Catalogs,
+    CostItem,
+    catalogs_dir,
+    load_from_csv,
+    snapshots_dir,
+)
+
+MAGIC = b"SDCS"
+FORMAT_VERSION = 1
+POINTER_FILE = "CURRENT"
+_NAME_RE = re.compile(r"^catalogs-v(\d+)\.bin$")
+
+# magic, format, reserved, version, sha256(исходников), (offset, count) × 4 секции
+HEADER = struct.Struct("<4sHHI32s8I")
+R_CODE_REC = struct.Struct("<Iddd")   # code, min_lot_sqm, avg_lot_sqm, min_frontage_m
+COST_REC = struct.Struct("<IId")      # code, unit, value
+DUTY_REC = struct.Struct("<ddd")      # lower_bound, rate, fixed
+_U32 = struct.Struct("<I")
+_U32_PAIR = struct.Struct("<II")
+
+
+# ---- сборка ----
+
+def _sources_digest(root: Path) -> bytes:
+    h = hashlib.sha256()
+    for name in SOURCE_FILES:
+        p = root / name
+        h.update(name.encode("utf-8"))
+        if p.exists():
+            h.update(p.read_bytes())
+    return h.digest()
+
+
+def encode_snapshot(cats: Catalogs, *, version: int, digest: bytes = b"\0" * 32) -> bytes:
+    strings: List[bytes] = []
+    index: Dict[str, int] = {}
+
+    def sid(s: str) -> int:
+        i = index.get(s)
+        if i is None:
+            i = index[s] = len(strings)
+            strings.append(s.encode("utf-8"))
+        return i
+
+    r_blob = b"".join(
+        R_CODE_REC.pack(sid(code), info["min_lot_sqm"], info["avg_lot_sqm"], info["min_frontage_m"])
+        for code, info in sorted(cats.r_codes.items(), key=lambda kv: kv[0].encode("utf-8"))
+    )
+    c_blob = b"".join(
+        COST_REC.pack(sid(code), sid(item.unit), item.value)
+        for code, item in sorted(cats.costs.items(), key=lambda kv: kv[0].encode("utf-8"))
+    )
+    d_blob = b"".join(DUTY_REC.pack(*b) for b in sorted(cats.duty_brackets, key=lambda x: x[0]))
+
+    offsets = [0]
+    for s in strings:
+        offsets.append(offsets[-1] + len(s))
+    s_blob = struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(strings)
+
+    r_off = HEADER.size
+    c_off = r_off + len(r_blob)
+    d_off = c_off + len(c_blob)
+    s_off = d_off + len(d_blob)
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0, version, digest,
+        r_off, len(cats.r_codes),
+        c_off, len(cats.costs),
+        d_off, len(cats.duty_brackets),
+        s_off, len(strings),
+    )
+    return header + r_blob + c_blob + d_blob + s_blob
+
+
+def _versions(directory: Path) -> List[int]:
+    out = []
+    if directory.exists():
+        for p in directory.iterdir():
+            m = _NAME_RE.match(p.name)
+            if m:
+                out.append(int(m.group(1)))
+    return sorted(out)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def build_snapshot(root: Optional[Path] = None, out_dir: Optional[Path] = None) -> Path:
+    """
+    Компилирует CSV из root в новую версию снапшота и переключает CURRENT.
+    Старые версии не удаляются — воркеры, которые их ещё держат, дочитают.
+    """
+    root = root or catalogs_dir()
+    out_dir = out_dir or snapshots_dir()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    version = (_versions(out_dir) or [0])[-1] + 1
+    data = encode_snapshot(load_from_csv(root), version=version, digest=_sources_digest(root))
+    path = out_dir / f"catalogs-v{version:06d}.bin"
+    _write_atomic(path, data)
+    _write_atomic(out_dir / POINTER_FILE, path.name.encode("utf-8"))
+    return path
+
+
+# ---- чтение ----
+
+class _DutyView(Sequence[Bracket]):
+    """Скобки duty прямо из mmap (без копии списка)."""
+
+    def __init__(self, snap: "MappedCatalogs", offset: int, count: int) -> None:
+        self._snap = snap
+        self._offset = offset
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i):  # type: ignore[override]
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return DUTY_REC.unpack_from(self._snap._mm, self._offset + i * DUTY_REC.size)
+
+    def __iter__(self) -> Iterator[Bracket]:
+        mm, size = self._snap._mm, DUTY_REC.size
+        for j in range(self._count):
+            yield DUTY_REC.unpack_from(mm, self._offset + j * size)
+
+
+class MappedCatalogs:
+    """CatalogView поверх read-only mmap снапшота."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, fmt, _, version, digest,
+         self._r_off, self._r_n, self._c_off, self._c_n,
+         d_off, d_n, self._s_off, self._s_n) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"Not a catalog snapshot (format {FORMAT_VERSION}): {path}")
+        self.version = f"v{version}"
+        self.digest = digest.hex()
+        self._blob = self._s_off + 4 * (self._s_n + 1)
+        self.duty_brackets = _DutyView(self, d_off, d_n)
+
+    def _str_bytes(self, i: int) -> bytes:
+        start, end = _U32_PAIR.unpack_from(self._mm, self._s_off + 4 * i)
+        return self._mm[self._blob + start:self._blob + end]
+
+    def _find(self, offset: int, count: int, rec: struct.Struct, key: bytes) -> int:
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            (sid,) = _U32.unpack_from(self._mm, offset + mid * rec.size)
+            name = self._str_bytes(sid)
+            if name < key:
+                lo = mid + 1
+            elif name > key:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def r_code(self, code: str) -> Optional[Dict[str, float]]:
+        i = self._find(self._r_off, self._r_n, R_CODE_REC, code.encode("utf-8"))
+        if i < 0:
+            return None
+        rec = R_CODE_REC.unpack_from(self._mm, self._r_off + i * R_CODE_REC.size)
+        _, min_lot, avg_lot, min_front = rec
+        return {"min_lot_sqm": min_lot, "avg_lot_sqm": avg_lot, "min_frontage_m": min_front}
+
+    def cost_item(self, code: str) -> Optional[CostItem]:
+        i = self._find(self._c_off, self._c_n, COST_REC, code.encode("utf-8"))
+        if i < 0:
+            return None
+        _, unit, value = COST_REC.unpack_from(self._mm, self._c_off + i * COST_REC.size)
+        return CostItem(unit=self._str_bytes(unit).decode("utf-8"), value=value)
+
+    def to_catalogs(self) -> Catalogs:
+        """Полная копия в память (для сравнения/отладки)."""
+        cats = Catalogs(version=self.version, duty_brackets=list(self.duty_brackets))
+        for i in range(self._r_n):
+            sid = _U32.unpack_from(self._mm, self._r_off + i * R_CODE_REC.size)[0]
+            code = self._str_bytes(sid).decode("utf-8")
+            cats.r_codes[code] = self.r_code(code)  # type: ignore[assignment]
+        for i in range(self._c_n):
+            sid = _U32.unpack_from(self._mm, self._c_off + i * COST_REC.size)[0]
+            code = self._str_bytes(sid).decode("utf-8")
+            cats.costs[code] = self.cost_item(code)  # type: ignore[assignment]
+        return cats
+
+
+class SnapshotWatcher:
+    """
+    Следит за CURRENT и атомарно переключает процесс на новую версию.
+    Проверка — не чаще раза в check_interval_s (несколько stat), так что
+    горячий путь get_catalogs() почти бесплатен.
+
+    sources — каталог CSV, из которых собирается снапшот: если их digest
+    не совпадает с записанным в заголовке (CSV правили после сборки),
+    снапшот устаревший и current() отдаёт None — чтение идёт из CSV.
+    Digest пересчитывается только при смене mtime/size исходников.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        check_interval_s: Optional[float] = None,
+        *,
+        sources: Optional[Path] = None,
+    ) -> None:
+        self.directory = directory
+        self.sources = sources
+        if check_interval_s is None:
+            check_interval_s = float(os.getenv("SUBDIV_CATALOG_SNAPSHOT_CHECK_S", "2.0"))
+        self.check_interval_s = check_interval_s
+        self._lock = threading.Lock()
+        self._mapped: Optional[MappedCatalogs] = None
+        self._pointer_stat: Optional[tuple] = None
+        self._sources_stat: Optional[tuple] = None
+        self._sources_digest: Optional[str] = None
+        self._stale = False
+        self._next_check = 0.0
+
+    def current(self) -> Optional[MappedCatalogs]:
+        now = time.monotonic()
+        if now >= self._next_check:
+            with self._lock:
+                if now >= self._next_check:
+                    self._refresh()
+                    self._next_check = now + self.check_interval_s
+        return None if self._stale else self._mapped
+
+    @property
+    def stale_sources(self) -> Optional[str]:
+        """Digest текущих CSV, если снапшот из-за них устарел (иначе None)."""
+        return self._sources_digest if self._stale else None
+
+    def _refresh(self) -> None:
+        self._refresh_pointer()
+        self._stale = (
+            self._mapped is not None
+            and self.sources is not None
+            and self._mapped.digest != self._current_sources_digest()
+        )
+
+    def _current_sources_digest(self) -> str:
+        assert self.sources is not None
+        sig = []
+        for name in SOURCE_FILES:
+            try:
+                st = (self.sources / name).stat()
+                sig.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except OSError:
+                sig.append(None)
+        if tuple(sig) != self._sources_stat or self._sources_digest is None:
+            self._sources_digest = _sources_digest(self.sources).hex()
+            self._sources_stat = tuple(sig)
+        return self._sources_digest
+
+    def _refresh_pointer(self) -> None:
+        pointer = self.directory / POINTER_FILE
+        try:
+            st = pointer.stat()
+        except OSError:
+            self._mapped = None
+            self._pointer_stat = None
+            return
+        sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if sig == self._pointer_stat and self._mapped is not None:
+            return
+        name = pointer.read_text(encoding="utf-8").strip()
+        try:
+            mapped = MappedCatalogs(self.directory / name)
+        except (OSError, ValueError, struct.error):
+            return  # битый/недописанный снапшот — остаёмся на текущем
+        # Старый mmap не закрываем явно: его могут читать другие потоки,
+        # он освободится сборщиком мусора после последней ссылки.
+        self._mapped = mapped
+        self._pointer_stat = sig
@@ -1,12 +1,11 @@
 # ФАЙЛ: domain/services/costs/service.py
 from __future__ import annotations
 
-import csv
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict
 
 from domain.models.evaluate import EvaluateRequest
+from domain.services.catalogs.service import CatalogView, get_catalogs
 
 
 @dataclass
@@ -15,44 +14,9 @@ class CostBreakdown:
     total_ex_purchase: float  # сумма БЕЗ цены покупки
 
 
-def _repo_root() -> Path:
-    here = Path(__file__).resolve()
-    for p in [here] + list(here.parents):
-        candidate = p / "data" / "catalogs" / "cost_catalog_wa.csv"
-        if candidate.exists():
-            return p
-    return Path.cwd()
-
-
-def _load_cost_catalog(root: Optional[Path] = None) -> Dict[str, Dict[str, str]]:
-    """
-    Загружает cost_catalog_wa.csv в вид:
-      { "ITEM_CODE": {"unit":"AUD"/"percent", "default_value":"..."} }
-    """
-    root = root or _repo_root()
-    path = root / "data" / "catalogs" / "cost_catalog_wa.csv"
-    table: Dict[str, Dict[str, str]] = {}
-    if not path.exists():
-        return table
-
-    with path.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            code = (row.get("item_code") or "").strip()
-            if not code:
-                continue
-            table[code] = {
-                "unit": (row.get("unit") or "").strip(),
-                "default_value": (row.get("default_value") or "").strip(),
-            }
-    return table
-
-
-def _get_num(v: Optional[str]) -> float:
-    try:
-        return float(v) if v not in (None, "") else 0.0
-    except ValueError:
-        return 0.0
+def _value(catalog: CatalogView, code: str) -> float:
+    item = catalog.cost_item(code)
+    return item.value if item else 0.0
 
 
 def compute_project_costs(req: EvaluateRequest, *, lots: int, revenue: float) -> CostBreakdown:
@@ -62,16 +26,17 @@ def compute_project_costs(req: EvaluateRequest, *, lots: int, revenue: float) ->
     :param lots: рассчитанное число лотов
     :param revenue: оценённая выручка (для маркетингового %)
     """
-    catalog = _load_cost_catalog()
+    catalog = get_catalogs()
 
     # --- базовые позиции из каталога ---
-    demo = _get_num(catalog.get("DEMO_BASE", {}).get("default_value"))
-    subdiv = _get_num(catalog.get("SUBDIV_BASE", {}).get("default_value"))
-    utilities = _get_num(catalog.get("UTILITIES_BASE", {}).get("default_value"))
+    demo = _value(catalog, "DEMO_BASE")
+    subdiv = _value(catalog, "SUBDIV_BASE")
+    utilities = _value(catalog, "UTILITIES_BASE")
 
     # Маркетинг: проценты от выручки
-    mkt_unit = (catalog.get("MARKETING", {}).get("unit") or "").lower()
-    mkt_val = _get_num(catalog.get("MARKETING", {}).get("default_value"))
+    mkt = catalog.cost_item("MARKETING")
+    mkt_unit = (mkt.unit if mkt else "").lower()
+    mkt_val = mkt.value if mkt else 0.0
     marketing = revenue * mkt_val if mkt_unit == "percent" else mkt_val
 
     # Settlement берём из asm (если в каталоге есть дефолт — игнорируем его, приоритет за asm)
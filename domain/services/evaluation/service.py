@@ -0,0 +1,149 @@
+# ФАЙЛ: domain/services/evaluation/service.py
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence
+
+from domain.models.evaluate import (
+    AdviceItem,
+    EvaluateRequest,
+    EvaluationResponse,
+    SensitivityBand,
+)
+from domain.services.arv.service import ArvEstimate, estimate_missing_arv, with_arv
+from domain.services.enrich.service import EnrichmentContext, enrich_request
+from domain.services.lot_yield.service import estimate_lot_yield
+from domain.services.notes.service import Note, render_note, render_notes
+from domain.services.scenarios.service import build_scenarios
+
+
+# уверенность оценки ARV → severity совета
+_ARV_SEVERITY = {"high": "low", "medium": "medium", "low": "high"}
+
+
+def evaluate(req: EvaluateRequest, *, degraded: bool = False) -> EvaluationResponse:
+    """Полный пайплайн оценки: enrich → ARV → lot yield → сценарии → советы → чувствительность."""
+    return evaluate_many([req], degraded=degraded)[0]
+
+
+def evaluate_many(
+    reqs: Sequence[EvaluateRequest], *, degraded: bool = False
+) -> List[EvaluationResponse]:
+    """
+    Пакетная оценка: enrich для всех, затем недостающий house_arv — одним
+    батчем модели ARV, дальше пайплайн по каждому объекту.
+
+    degraded=True — упрощённый режим под нагрузкой: только сценарии A/B
+    (без ARV и C), verbosity="none" (без заметок и текстов советов),
+    без блока чувствительности; ответ помечается degraded.
+    """
+    if degraded:
+        reqs = [r.model_copy(update={"verbosity": "none"}) for r in reqs]
+    # 1) Enrich (поднять пороги по R-коду, собрать контекст)
+    prepared = [enrich_request(r) for r in reqs]
+    # 1a) ARV для сценария C, если его не передали
+    if degraded:
+        estimates: List[Optional[ArvEstimate]] = [None] * len(prepared)
+    else:
+        estimates = estimate_missing_arv([enriched for enriched, _ in prepared])
+    return [
+        _evaluate_enriched(with_arv(enriched, arv), ctx, arv, degraded=degraded)
+        for (enriched, ctx), arv in zip(prepared, estimates)
+    ]
+
+
+def _evaluate_enriched(
+    enriched: EvaluateRequest,
+    ctx: EnrichmentContext,
+    arv: Optional[ArvEstimate],
+    *,
+    degraded: bool = False,
+) -> EvaluationResponse:
+    # 2) Lot yield
+    rmap: Optional[Dict[str, Dict[str, float]]] = None
+    if ctx.r_code_info and enriched.prop.r_code:
+        rmap = {enriched.prop.r_code: ctx.r_code_info}
+
+    lots, ly_notes = estimate_lot_yield(
+        prop=enriched.prop,
+        scen=enriched.scen,
+        r_code_info=rmap,
+        verbosity=enriched.verbosity,
+    )
+
+    # Прокинем заметки из lot_yield в общий контекст,
+    # чтобы билдер сценариев включил их в notes
+    ctx.notes = [*(ctx.notes or []), *ly_notes]
+
+    # 3) Базовая метрика
+    price_per_sqm = enriched.prop.purchase_price / enriched.prop.land_area_sqm
+
+    # 4) Построить набор сценариев (A/B/C) по обогащённым данным
+    scenarios = build_scenarios(enriched, ctx, lots, with_rebuild=not degraded)
+    scenarios_sorted = sorted(
+        scenarios,
+        key=lambda s: (float(s.profit), float(s.margin_on_cost)),
+        reverse=True,
+    )
+    best_code = scenarios_sorted[0].scenario if scenarios_sorted else None
+
+    # 5) Советы (текст — из каталога сообщений, при verbosity="none" без текста)
+    def _advice(code: str, severity: str, params: Optional[Dict[str, object]] = None) -> AdviceItem:
+        message = None
+        if enriched.verbosity != "none":
+            message = render_note(Note(code, params or {}), enriched.locale)
+        return AdviceItem(code=code, severity=severity, message=message)
+
+    advice: List[AdviceItem] = []
+    if lots == 0:
+        advice.append(_advice("NO_YIELD", "high"))
+    if enriched.prop.frontage_m is None:
+        advice.append(_advice("MISSING_FRONTAGE", "medium"))
+    # совет об оценке ARV — только если по ней действительно посчитан сценарий C
+    if arv is not None and any(s.scenario == "demo_rebuild_and_sell" for s in scenarios):
+        params = {
+            "value": arv.value,
+            "pct": arv.spread_pct,
+            "confidence": arv.confidence,
+            "n": arv.n_comps,
+            "suburb": arv.suburb,
+        }
+        code = "ARV_ESTIMATED" if arv.suburb else "ARV_ESTIMATED_NO_SUBURB"
+        advice.append(_advice(code, _ARV_SEVERITY[arv.confidence], params))
+
+    # 6) Простая чувствительность к цене земли (±10%)
+    def _profit_for(psqm: float) -> float:
+        target_lot = (
+            enriched.scen.target_lot_size_sqm
+            if enriched.scen
+            else enriched.market.land_target_lot_size_sqm
+        )
+        rev = float(lots * target_lot * psqm)
+        if scenarios:
+            base_total = scenarios[0].total_cost
+            base_hold = scenarios[0].holding_cost
+            return rev - (base_total + base_hold)
+        return rev  # fallback если сценариев нет
+
+    sensitivity: Optional[Dict[str, SensitivityBand]] = None
+    if not degraded:
+        base_p = float(enriched.market.land_price_per_sqm_small_lot)
+        sensitivity = {
+            "land_psqm": SensitivityBand(
+                base_profit=_profit_for(base_p),
+                best_profit=_profit_for(base_p * 1.10),
+                worst_profit=_profit_for(base_p * 0.90),
+            )
+        }
+
+    return EvaluationResponse(
+        price_per_sqm=price_per_sqm,
+        lot_yield_estimate=lots,
+        scenarios=scenarios_sorted,             # ← сортированные
+        advice=advice,
+        sensitivity=sensitivity,
+        best_scenario_code=best_code,           # ← NEW
+        scenario_order=[s.scenario for s in scenarios_sorted],
+        # summary: общие заметки один раз на ответ, а не в каждом сценарии
+        notes=render_notes(ctx.notes, enriched.locale) if enriched.verbosity == "summary" else [],
+        degraded=degraded,
+    )
@@ -1,50 +1,20 @@
 from __future__ import annotations
 
-import csv
-from dataclasses import dataclass
-from pathlib import Path
-from typing import Iterable, List, Optional, Tuple
+from typing import Iterable, Optional, Sequence
 
+from domain.services.catalogs.service import Bracket, get_catalogs
 
-Bracket = Tuple[float, float, float]  # (lower_bound, rate, fixed_amount)
 
-
-def _repo_root() -> Path:
-    here = Path(__file__).resolve()
-    for p in [here] + list(here.parents):
-        if (p / "data" / "catalogs").exists():
-            return p
-    return Path.cwd()
-
-
-def _load_default_brackets() -> List[Bracket]:
+def _load_default_brackets() -> Sequence[Bracket]:
     """
-    Загружает CSV-таблицу скобок из data/catalogs/wa_stamp_duty_brackets.csv
+    Скобки из data/catalogs/wa_stamp_duty_brackets.csv (снапшот или кэш процесса).
     Формат строк: lower_bound,rate,fixed
       - lower_bound: нижняя граница скобки (включительно), AUD
       - rate: ставка (доля от 0 до 1) на сумму сверх lower_bound
       - fixed: фиксированная часть на нижней границе (кумулятивная)
-    Если файл не найден или содержит ошибки — возвращает пустой список.
+    Если файл не найден или содержит ошибки — пустой список.
     """
-    root = _repo_root()
-    path = root / "data" / "catalogs" / "wa_stamp_duty_brackets.csv"
-    if not path.exists():
-        return []
-
-    out: List[Bracket] = []
-    with path.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                lb = float((row.get("lower_bound") or "").strip())
-                rate = float((row.get("rate") or "").strip())
-                fixed = float((row.get("fixed") or "").strip())
-            except ValueError:
-                continue
-            out.append((lb, rate, fixed))
-    # гарантируем сортировку по lower_bound
-    out.sort(key=lambda x: x[0])
-    return out
+    return get_catalogs().duty_brackets
 
 
 def calc_wa_stamp_duty(purchase_price: float, brackets: Optional[Iterable[Bracket]] = None) -> float:
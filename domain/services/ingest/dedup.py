@@ -0,0 +1,133 @@
+# ФАЙЛ: domain/services/ingest/dedup.py
+"""
+Компактный индекс дедупликации: 64-битный хэш ключа → 64-битное значение
+(отпечаток содержимого объявления).
+
+Открытая адресация с линейным пробингом поверх двух array('Q'): 16 байт
+на слот, при заполнении ≤ 0.7 — около 23 байт на ключ, то есть миллионы
+адресов занимают десятки МБ без объектов Python на каждый ключ.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from array import array
+from typing import Optional
+
+_EMPTY = 0
+_MASK64 = (1 << 64) - 1
+
+_ABBREV = {
+    "street": "st", "road": "rd", "avenue": "ave", "drive": "dr", "place": "pl",
+    "court": "ct", "crescent": "cres", "terrace": "tce", "parade": "pde",
+    "highway": "hwy", "lane": "ln", "close": "cl", "way": "way",
+}
+_TAIL = {"wa", "western", "australia"}  # штат в хвосте адреса
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _is_postcode(word: str) -> bool:
+    return len(word) == 4 and word.isdigit()
+
+
+def normalize_address(address: str, suburb: Optional[str] = None) -> str:
+    """
+    '45 Example Road, Balga WA 6061' и '45 example rd' + suburb 'BALGA' → один ключ:
+    нижний регистр, сокращения типов улиц, без штата/индекса в хвосте.
+    """
+    words = [_ABBREV.get(w, w) for w in _WORD_RE.findall(address.lower())]
+    while len(words) > 2 and (words[-1] in _TAIL or _is_postcode(words[-1])):
+        words.pop()
+    if suburb:
+        sub = _WORD_RE.findall(suburb.lower())
+        # пригород из отдельного поля — в конец, если его ещё нет в адресе
+        if sub and words[-len(sub):] != sub:
+            words.extend(sub)
+    return " ".join(words)
+
+
+def hash64(text: str) -> int:
+    """Стабильный между процессами 64-битный хэш (0 зарезервирован под пустой слот)."""
+    h = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+    return h or 1
+
+
+class HashIndex:
+    """
+    Множество 64-битных ключей со значениями. Ключи — уже хэши (hash64),
+    поэтому слот выбирается младшими битами без повторного хэширования.
+    """
+
+    def __init__(self, capacity: int = 1024, max_load: float = 0.7) -> None:
+        size = 8
+        while size < capacity:
+            size <<= 1
+        self._max_load = max_load
+        self._keys = array("Q", bytes(8 * size))
+        self._values = array("Q", bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: int) -> bool:
+        return self._slot(key) >= 0
+
+    @property
+    def capacity(self) -> int:
+        return self._mask + 1
+
+    @property
+    def nbytes(self) -> int:
+        return (self._keys.itemsize + self._values.itemsize) * len(self._keys)
+
+    def _slot(self, key: int) -> int:
+        keys, mask = self._keys, self._mask
+        i = key & mask
+        while True:
+            k = keys[i]
+            if k == key:
+                return i
+            if k == _EMPTY:
+                return -1
+            i = (i + 1) & mask
+
+    def get(self, key: int) -> Optional[int]:
+        i = self._slot(key)
+        return None if i < 0 else self._values[i]
+
+    def put(self, key: int, value: int) -> Optional[int]:
+        """Записать значение; вернуть предыдущее (None, если ключ новый)."""
+        if key == _EMPTY:
+            raise ValueError("key 0 is reserved")
+        if (self._count + 1) > self._max_load * (self._mask + 1):
+            self._grow()
+        keys, mask = self._keys, self._mask
+        i = key & mask
+        while True:
+            k = keys[i]
+            if k == key:
+                old = self._values[i]
+                self._values[i] = value & _MASK64
+                return old
+            if k == _EMPTY:
+                keys[i] = key
+                self._values[i] = value & _MASK64
+                self._count += 1
+                return None
+            i = (i + 1) & mask
+
+    def _grow(self) -> None:
+        old_keys, old_values = self._keys, self._values
+        size = 2 * len(old_keys)
+        self._keys = keys = array("Q", bytes(8 * size))
+        self._values = values = array("Q", bytes(8 * size))
+        self._mask = mask = size - 1
+        for k, v in zip(old_keys, old_values):
+            if k != _EMPTY:
+                i = k & mask
+                while keys[i] != _EMPTY:
+                    i = (i + 1) & mask
+                keys[i] = k
+                values[i] = v
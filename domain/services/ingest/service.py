@@ -0,0 +1,249 @@
+# ФАЙЛ: domain/services/ingest/service.py
+"""
+Потоковый приём объявлений (ListingCreated.v1) → PropertyInput → оценка.
+
+Объявления дедуплицируются по участку (HashIndex из dedup.py): ключ —
+property_id + нормализованный адрес, чтобы разные участки по одному адресу
+(дуплексы, strata) не схлопывались. Тот же участок с тем же отпечатком
+(площадь/фронтаж/цена) — дубль, с другим — изменённое объявление
+(переоценка). Новые/изменённые копятся в микро-батч (не больше batch_size,
+не дольше max_wait_s) и уходят одним вызовом evaluate_many (ARV — одним
+батчем модели), результаты — в sink. Память ограничена: буфер — один батч,
+индекс — 16 байт на слот.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import orjson
+from pydantic import ValidationError
+
+from domain.models.evaluate import (
+    Assumptions,
+    EvaluateRequest,
+    EvaluationResponse,
+    MarketBenchmarks,
+    PropertyInput,
+)
+from domain.models.events import ListingCreated
+from domain.services.evaluation.service import evaluate_many
+from domain.services.ingest.dedup import HashIndex, hash64, normalize_address
+
+log = logging.getLogger(__name__)
+
+RawEvent = Union[ListingCreated, Dict[str, Any], bytes, str]
+# suburb_code → бенчмарки рынка (None — рынок неизвестен, объявление пропускаем)
+MarketProvider = Callable[[Optional[str]], Optional[MarketBenchmarks]]
+
+
+@dataclass(frozen=True)
+class NormalizedListing:
+    listing_id: str
+    property_id: str
+    key: int          # hash64(нормализованный адрес | property_id)
+    fingerprint: int  # hash64(площадь|фронтаж|цена)
+    prop: PropertyInput
+    occurred_at: datetime
+
+
+ResultSink = Callable[[List[Tuple[NormalizedListing, EvaluationResponse]]], None]
+BatchEvaluator = Callable[[Sequence[EvaluateRequest]], List[EvaluationResponse]]
+
+
+def _parse_ts(value: str) -> datetime:
+    ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def normalize_listing(event: RawEvent) -> NormalizedListing:
+    """Сырое событие → NormalizedListing. Ошибки: ValueError / pydantic.ValidationError."""
+    if isinstance(event, (bytes, str)):
+        event = orjson.loads(event)
+    if not isinstance(event, ListingCreated):
+        event = ListingCreated.model_validate(event)
+    p = event.payload
+    prop = PropertyInput(
+        address=p.address,
+        suburb=p.suburb_code,
+        land_area_sqm=p.land_area_sqm,
+        frontage_m=p.frontage_m,
+        purchase_price=p.asking_price,
+    )
+    fp = f"{prop.land_area_sqm:.2f}|{prop.frontage_m or 0:.2f}|{prop.purchase_price:.0f}"
+    key = normalize_address(p.address, p.suburb_code)
+    if p.property_id.strip():
+        key = f"{key}|{p.property_id.strip()}"
+    return NormalizedListing(
+        listing_id=p.listing_id,
+        property_id=p.property_id,
+        key=hash64(key),
+        fingerprint=hash64(fp),
+        prop=prop,
+        occurred_at=_parse_ts(event.occurred_at),
+    )
+
+
+@dataclass
+class IngestStats:
+    received: int = 0
+    invalid: int = 0
+    duplicates: int = 0
+    new: int = 0
+    changed: int = 0
+    no_market: int = 0
+    evaluated: int = 0
+    eval_errors: int = 0
+    batches: int = 0
+    last_lag_s: float = 0.0   # occurred_at → конец оценки, последний батч
+    max_lag_s: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def snapshot(self, *, pending: int = 0) -> Dict[str, float]:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "received": self.received,
+            "invalid": self.invalid,
+            "duplicates": self.duplicates,
+            "new": self.new,
+            "changed": self.changed,
+            "no_market": self.no_market,
+            "evaluated": self.evaluated,
+            "eval_errors": self.eval_errors,
+            "batches": self.batches,
+            "pending": pending,
+            "last_lag_s": round(self.last_lag_s, 3),
+            "max_lag_s": round(self.max_lag_s, 3),
+            "elapsed_s": round(elapsed, 3),
+            "ingest_per_s": round(self.received / elapsed, 1),
+            "evaluated_per_s": round(self.evaluated / elapsed, 1),
+        }
+
+
+class ListingIngester:
+    """
+    submit() — по одному событию; None — «тик простоя» (источник пуст),
+    чтобы недобранный батч не ждал дольше max_wait_s. run() — весь источник.
+    """
+
+    def __init__(
+        self,
+        market_for: MarketProvider,
+        sink: ResultSink,
+        *,
+        assumptions: Optional[Assumptions] = None,
+        batch_size: int = 256,
+        max_wait_s: float = 0.5,
+        index_capacity: int = 1 << 16,
+        evaluate_many_fn: BatchEvaluator = evaluate_many,
+    ) -> None:
+        self._market_for = market_for
+        self._sink = sink
+        self._asm = assumptions or Assumptions()
+        self.batch_size = batch_size
+        self.max_wait_s = max_wait_s
+        self._evaluate_many = evaluate_many_fn
+        self.index = HashIndex(index_capacity)
+        self.stats = IngestStats()
+        self._pending: List[Tuple[NormalizedListing, EvaluateRequest]] = []
+        # key → fingerprint ещё не оценённых: дубли внутри батча до записи в индекс
+        self._pending_fp: Dict[int, int] = {}
+        self._pending_since = 0.0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def submit(self, event: Optional[RawEvent]) -> None:
+        if event is not None:
+            self._accept(event)
+        if self._pending and (
+            len(self._pending) >= self.batch_size
+            or time.monotonic() - self._pending_since >= self.max_wait_s
+        ):
+            self.flush()
+
+    def run(self, source: Iterable[Optional[RawEvent]]) -> IngestStats:
+        for event in source:
+            self.submit(event)
+        self.flush()
+        return self.stats
+
+    def flush(self) -> int:
+        """
+        Оценить накопленный батч и отдать результаты в sink. В индекс дублей
+        попадают только оценённые и принятые sink объявления: после ошибки
+        оценки (или исключения из sink) повторная доставка оценивается заново.
+        """
+        batch, self._pending = self._pending, []
+        self._pending_fp = {}
+        if not batch:
+            return 0
+        results = [
+            (listing, res)
+            for (listing, _), res in zip(batch, self._evaluate_batch(batch))
+            if res is not None
+        ]
+        self.stats.evaluated += len(results)
+        self.stats.batches += 1
+
+        now = datetime.now(timezone.utc)
+        lag = max((now - listing.occurred_at).total_seconds() for listing, _ in batch)
+        self.stats.last_lag_s = lag
+        self.stats.max_lag_s = max(self.stats.max_lag_s, lag)
+        if results:
+            self._sink(results)
+        for listing, _ in results:
+            self.index.put(listing.key, listing.fingerprint)
+        return len(results)
+
+    def _evaluate_batch(
+        self, batch: List[Tuple[NormalizedListing, EvaluateRequest]]
+    ) -> List[Optional[EvaluationResponse]]:
+        """Весь батч одним evaluate_many; при сбое — по одному, чтобы найти плохое объявление."""
+        if len(batch) > 1:
+            try:
+                return list(self._evaluate_many([req for _, req in batch]))
+            except Exception:
+                log.warning("batch of %d failed, evaluating one by one", len(batch))
+        out: List[Optional[EvaluationResponse]] = []
+        for listing, req in batch:
+            try:
+                out.append(self._evaluate_many([req])[0])
+            except Exception:  # одно плохое объявление не должно останавливать поток
+                self.stats.eval_errors += 1
+                log.exception("listing %s: evaluation failed", listing.listing_id)
+                out.append(None)
+        return out
+
+    def _accept(self, event: RawEvent) -> None:
+        self.stats.received += 1
+        try:
+            listing = normalize_listing(event)
+        except (ValueError, ValidationError):
+            self.stats.invalid += 1
+            return
+
+        previous = self._pending_fp.get(listing.key)
+        if previous is None:
+            previous = self.index.get(listing.key)
+        if previous == listing.fingerprint:
+            self.stats.duplicates += 1
+            return
+        market = self._market_for(listing.prop.suburb)
+        if market is None:
+            self.stats.no_market += 1
+            return
+        self._pending_fp[listing.key] = listing.fingerprint
+        if previous is None:
+            self.stats.new += 1
+        else:
+            self.stats.changed += 1
+
+        req = EvaluateRequest(prop=listing.prop, asm=self._asm, market=market, verbosity="none")
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending.append((listing, req))
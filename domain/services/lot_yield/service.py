@@ -4,7 +4,8 @@ from __future__ import annotations
 from math import floor
 from typing import Dict, List, Optional, Tuple
 
-from domain.models.evaluate import PropertyInput, ScenarioSettings
+from domain.models.evaluate import PropertyInput, ScenarioSettings, Verbosity
+from domain.services.notes.service import Note
 
 
 def _min_frontage_required(
@@ -33,16 +34,19 @@ def estimate_lot_yield(
     prop: PropertyInput,
     scen: Optional[ScenarioSettings],
     r_code_info: Optional[Dict[str, Dict[str, float]]] = None,
-) -> Tuple[int, List[str]]:
+    verbosity: Verbosity = "full",
+) -> Tuple[int, List[Note]]:
     """
     Оценивает потенциальное количество лотов.
     :param prop: входные характеристики участка
     :param scen: настройки сценария (если None — используем дефолты из модели)
     :param r_code_info: справочник по R-кодам, формат:
                         { "R20": {"min_lot_sqm": 350, "min_frontage_m": 10}, ... }
+    :param verbosity: "none" — заметки не собираются
     :return: (lot_yield_estimate, notes)
     """
-    notes: List[str] = []
+    notes: List[Note] = []
+    with_notes = verbosity != "none"
     s = scen or ScenarioSettings()
 
     # Подтянем R-ограничения для данного prop.r_code (если оно задано и известно)
@@ -53,17 +57,16 @@ def estimate_lot_yield(
     # 1) Проверка фронтажа
     min_front_required = _min_frontage_required(s, r_info)
     if prop.frontage_m is not None and prop.frontage_m < min_front_required:
-        notes.append(
-            f"Frontage {prop.frontage_m:.2f}m < required {min_front_required:.2f}m."
-        )
+        if with_notes:
+            notes.append(
+                Note("FRONTAGE_TOO_SMALL", {"frontage": prop.frontage_m, "required": min_front_required})
+            )
         return 0, notes  # фронтаж не позволяет делить по правилу
 
     # 2) Эффективный минимум площади лота
     min_lot = _effective_min_lot_size_sqm(s, r_info)
-    if min_lot != s.target_lot_size_sqm:
-        notes.append(
-            f"Target lot size raised to {min_lot} sqm due to R-code minimum."
-        )
+    if min_lot != s.target_lot_size_sqm and with_notes:
+        notes.append(Note("LOT_SIZE_RCODE_MIN", {"size": min_lot}))
 
     # 3) Базовая оценка по площади
     if prop.land_area_sqm <= 0:
@@ -71,13 +74,14 @@ def estimate_lot_yield(
 
     lots_by_area = floor(prop.land_area_sqm / float(min_lot))
     if lots_by_area < 1:
-        notes.append("Insufficient land area for even a single compliant lot.")
+        if with_notes:
+            notes.append(Note("INSUFFICIENT_AREA"))
         return 0, notes
 
     # 4) Простейшие поправки (без угловых/формы/съёмов сервитутов и т.п.)
     # На MVP ничего не режем дополнительно; всё остальное — в advice/notes.
-    if prop.land_area_sqm % min_lot != 0:
+    if with_notes and prop.land_area_sqm % min_lot != 0:
         leftover = prop.land_area_sqm - lots_by_area * min_lot
-        notes.append(f"Leftover area ~{leftover:.0f} sqm (non-divisible residue).")
+        notes.append(Note("LEFTOVER_AREA", {"leftover": leftover}))
 
     return int(lots_by_area), notes
\ No newline at end of file
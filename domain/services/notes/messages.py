@@ -0,0 +1,57 @@
+# ФАЙЛ: domain/services/notes/messages.py
+# Каталог сообщений: code → шаблон str.format по локалям.
+# Параметры заметок подставляются только при рендере (см. service.render_note).
+from __future__ import annotations
+
+from typing import Dict
+
+DEFAULT_LOCALE = "en"
+
+MESSAGES: Dict[str, Dict[str, str]] = {
+    "en": {
+        # enrich
+        "TARGET_LOT_RAISED": "Target lot size raised from {old} to {new} due to R-code minimum.",
+        "MIN_FRONTAGE_FROM_RCODE": "Min frontage requirement set to {value}m from R-code.",
+        # lot_yield
+        "FRONTAGE_TOO_SMALL": "Frontage {frontage:.2f}m < required {required:.2f}m.",
+        "LOT_SIZE_RCODE_MIN": "Target lot size raised to {size} sqm due to R-code minimum.",
+        "INSUFFICIENT_AREA": "Insufficient land area for even a single compliant lot.",
+        "LEFTOVER_AREA": "Leftover area ~{leftover:.0f} sqm (non-divisible residue).",
+        # scenarios
+        "COSTS": "{prefix}Costs: {costs}",
+        "RETAIN_NO_DEMO": "B: retain house; DEMO excluded.",
+        "INCLUDES_BUILD": "C: includes BUILD cost.",
+        # advice
+        "NO_YIELD": "No compliant lots are possible with the current parameters "
+                    "(check frontage and R-code).",
+        "MISSING_FRONTAGE": "Frontage not provided; the estimate is indicative, "
+                            "frontage checks were skipped.",
+        "ARV_ESTIMATED": "House ARV not provided; estimated at {value:,.0f} "
+                         "(±{pct:.0f}%, {confidence} confidence) from {n} new-build sales "
+                         "in {suburb}. Scenario C uses this estimate.",
+        "ARV_ESTIMATED_NO_SUBURB": "House ARV not provided; estimated at {value:,.0f} "
+                                   "(±{pct:.0f}%, {confidence} confidence) without suburb "
+                                   "comparables. Scenario C uses this estimate.",
+    },
+    "ru": {
+        "TARGET_LOT_RAISED": "Целевой размер лота поднят с {old} до {new} по минимуму R-кода.",
+        "MIN_FRONTAGE_FROM_RCODE": "Требование к фронтажу установлено {value} м по R-коду.",
+        "FRONTAGE_TOO_SMALL": "Фронтаж {frontage:.2f} м < требуемого {required:.2f} м.",
+        "LOT_SIZE_RCODE_MIN": "Целевой размер лота поднят до {size} м² по минимуму R-кода.",
+        "INSUFFICIENT_AREA": "Площади недостаточно даже для одного соответствующего лота.",
+        "LEFTOVER_AREA": "Остаток площади ~{leftover:.0f} м² (неделимый).",
+        "COSTS": "{prefix}Затраты: {costs}",
+        "RETAIN_NO_DEMO": "B: дом сохраняется; DEMO исключён.",
+        "INCLUDES_BUILD": "C: включая стоимость строительства (BUILD).",
+        "NO_YIELD": "Невозможно получить соответствующие лоты при текущих параметрах "
+                    "(проверьте фронтаж и R-код).",
+        "MISSING_FRONTAGE": "Не указан фронтаж; расчёт носит ориентировочный характер "
+                            "без фронтажных проверок.",
+        "ARV_ESTIMATED": "ARV дома не указан; оценка {value:,.0f} (±{pct:.0f}%, "
+                         "уверенность: {confidence}) по {n} продажам новостроек в {suburb}. "
+                         "Сценарий C использует эту оценку.",
+        "ARV_ESTIMATED_NO_SUBURB": "ARV дома не указан; оценка {value:,.0f} (±{pct:.0f}%, "
+                                   "уверенность: {confidence}) без компов по пригороду. "
+                                   "Сценарий C использует эту оценку.",
+    },
+}
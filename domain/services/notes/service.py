@@ -0,0 +1,44 @@
+# ФАЙЛ: domain/services/notes/service.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List
+
+from domain.services.notes.messages import DEFAULT_LOCALE, MESSAGES
+
+
+@dataclass(frozen=True)
+class Note:
+    """
+    Структурированная заметка: код из каталога сообщений + параметры.
+    Сервисы создают Note без форматирования; текст — только в render_note.
+    """
+    code: str
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+def _costs_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    parts = [f"{k}={v:,.0f}" for k, v in params["items"].items()]
+    parts.append(f"DUTY={params['duty']:,.0f}")
+    label = params.get("label")
+    return {"prefix": f"{label}: " if label else "", "costs": ", ".join(parts)}
+
+
+# Коды, которым нужна подготовка параметров перед шаблоном
+_PREPARE: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "COSTS": _costs_params,
+}
+
+
+def render_note(note: Note, locale: str = DEFAULT_LOCALE) -> str:
+    catalog = MESSAGES.get(locale) or MESSAGES[DEFAULT_LOCALE]
+    template = catalog.get(note.code) or MESSAGES[DEFAULT_LOCALE].get(note.code)
+    if template is None:
+        return note.code
+    prepare = _PREPARE.get(note.code)
+    params = prepare(note.params) if prepare else note.params
+    return template.format(**params)
+
+
+def render_notes(notes: Iterable[Note], locale: str = DEFAULT_LOCALE) -> List[str]:
+    return [render_note(n, locale) for n in notes]
@@ -0,0 +1,161 @@
+# ФАЙЛ: domain/services/profiles/service.py
+"""
+Серверные профили допущений (Assumptions) и рынка (MarketBenchmarks).
+
+Профили читаются из data/catalogs/profiles.yaml один раз на процесс и
+валидируются при загрузке; запрос ссылается на профиль по id или id@version,
+а в asm_overrides/market_overrides валидируются только переданные поля.
+Ключи кэшей берут ссылку id@version вместо хэша всего объекта.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Generic, List, Literal, Mapping, Optional, TypeVar
+
+import yaml
+from pydantic import BaseModel, ValidationError
+
+from domain.models.evaluate import Assumptions, MarketBenchmarks
+from domain.services.catalogs.service import catalogs_dir
+
+PROFILES_FILE = "profiles.yaml"
+
+ProfileKind = Literal["asm", "market"]
+M = TypeVar("M", bound=BaseModel)
+
+# раздел yaml и модель по виду профиля
+_KINDS: Dict[str, tuple] = {
+    "asm": ("assumptions", Assumptions),
+    "market": ("market", MarketBenchmarks),
+}
+
+
+@dataclass(frozen=True)
+class Profile(Generic[M]):
+    id: str
+    version: int
+    values: M  # провалидированная модель; не мутировать — копируется в apply_overrides
+    description: str = ""
+
+    @property
+    def ref(self) -> str:
+        return f"{self.id}@{self.version}"
+
+
+def apply_overrides(model: M, overrides: Mapping[str, Any]) -> M:
+    """Копия model с переопределёнными полями; валидируются только они."""
+    if not overrides:
+        return model
+    out = model.model_copy()
+    validator = type(model).__pydantic_validator__
+    for name, value in overrides.items():
+        validator.validate_assignment(out, name, value)
+    return out
+
+
+class ProfileRegistry:
+    def __init__(self, profiles: Dict[str, Dict[str, List[Profile]]]) -> None:
+        # kind → id → версии по возрастанию
+        self._profiles = profiles
+
+    def list(self, kind: ProfileKind) -> List[Profile]:
+        return [p for versions in self._profiles.get(kind, {}).values() for p in versions]
+
+    def resolve(self, kind: ProfileKind, ref: str) -> Profile:
+        """'id' → последняя версия, 'id@N' → ровно версия N."""
+        pid, _, ver = ref.partition("@")
+        versions = self._profiles.get(kind, {}).get(pid)
+        if not versions:
+            raise ValueError(f"Unknown {kind} profile: {pid!r}")
+        if not ver:
+            return versions[-1]
+        for p in versions:
+            if str(p.version) == ver:
+                return p
+        known = ", ".join(p.ref for p in versions)
+        raise ValueError(f"Unknown {kind} profile version: {ref!r} (known: {known})")
+
+
+def _read_yaml(path: Path) -> Any:
+    with path.open("r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def load_profiles(root: Optional[Path] = None) -> ProfileRegistry:
+    root = root or catalogs_dir()
+    path = root / PROFILES_FILE
+    raw = _read_yaml(path) if path.exists() else {}
+
+    profiles: Dict[str, Dict[str, List[Profile]]] = {}
+    for kind, (section, model) in _KINDS.items():
+        table: Dict[str, List[Profile]] = {}
+        for item in raw.get(section) or []:
+            pid, version = str(item["id"]), int(item["version"])
+            values = _read_yaml(root / item["file"]) if "file" in item else item.get("values", {})
+            try:
+                compiled = model.model_validate(values)
+            except ValidationError as e:
+                raise ValueError(f"{path}: {kind} profile {pid}@{version}: {e}") from e
+            versions = table.setdefault(pid, [])
+            if any(p.version == version for p in versions):
+                raise ValueError(f"{path}: duplicate {kind} profile {pid}@{version}")
+            versions.append(Profile(pid, version, compiled, item.get("description", "")))
+        for versions in table.values():
+            versions.sort(key=lambda p: p.version)
+        profiles[kind] = table
+    return ProfileRegistry(profiles)
+
+
+# ---- кэш на процесс ----
+
+_lock = threading.Lock()
+_registry: Optional[ProfileRegistry] = None
+
+
+def get_profiles() -> ProfileRegistry:
+    global _registry
+    reg = _registry
+    if reg is None:
+        with _lock:
+            if _registry is None:
+                _registry = load_profiles()
+            reg = _registry
+    return reg
+
+
+def reload_profiles() -> ProfileRegistry:
+    global _registry
+    with _lock:
+        _registry = None
+    return get_profiles()
+
+
+def resolve_request_profiles(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Сырое тело EvaluateRequest: asm_profile/market_profile (+ *_overrides) →
+    готовые модели в asm/market (pydantic не валидирует их повторно),
+    ссылка нормализуется до id@version.
+    """
+    out = dict(data)
+    for kind in _KINDS:
+        ref = data.get(f"{kind}_profile")
+        overrides = data.get(f"{kind}_overrides")
+        if ref is None:
+            if overrides:
+                raise ValueError(f"{kind}_overrides requires {kind}_profile")
+            continue
+        if data.get(kind) is not None:
+            raise ValueError(f"Pass either {kind} or {kind}_profile, not both")
+        if not isinstance(ref, str) or not isinstance(overrides or {}, Mapping):
+            raise ValueError(f"{kind}_profile must be a string and {kind}_overrides an object")
+        profile = get_profiles().resolve(kind, ref)  # type: ignore[arg-type]
+        try:
+            out[kind] = apply_overrides(profile.values, overrides or {})
+        except ValidationError as e:
+            err = e.errors()[0]
+            field = ".".join(str(x) for x in err["loc"])
+            raise ValueError(f"{kind}_overrides.{field}: {err['msg']}") from None
+        out[f"{kind}_profile"] = profile.ref
+    return out
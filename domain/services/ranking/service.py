@@ -0,0 +1,293 @@
+# ФАЙЛ: domain/services/ranking/service.py
+"""
+Top-K сделок поверх множества оценок: «топ-200 по марже в этих пригородах
+при lots ≥ 2 и profit ≥ X».
+
+DealStore хранит по строке на (объект, сценарий) в колонках array — без
+объектов Python на строку — и индексы пригород → строки, сценарий → строки.
+Запрос сужает кандидатов по индексам, фильтрует по числовым колонкам и
+держит heap размера K (heapq.nlargest); объекты RankedDeal создаются только
+для K победителей. rank_stream — то же для потока оценок без хранения.
+"""
+from __future__ import annotations
+
+import heapq
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Literal, Optional, Sequence, Set, Tuple
+
+from domain.models.evaluate import EvaluationResponse, ScenarioResult
+
+OrderBy = Literal["margin_on_cost", "profit", "roi_simple"]
+
+# (property_id, suburb, оценка)
+EvaluatedDeal = Tuple[str, Optional[str], EvaluationResponse]
+# (scenario, lots, profit, margin_on_cost, roi_simple)
+DealRow = Tuple[str, int, float, float, float]
+
+
+@dataclass(frozen=True)
+class DealQuery:
+    suburbs: Optional[Sequence[str]] = None     # None — все
+    scenarios: Optional[Sequence[str]] = None   # коды сценариев; None — все
+    min_lots: int = 0
+    min_profit: Optional[float] = None
+    min_margin: Optional[float] = None
+    order_by: OrderBy = "margin_on_cost"
+    limit: int = 200
+    # один (лучший по order_by) сценарий на объект
+    distinct_properties: bool = True
+
+
+@dataclass(frozen=True)
+class RankedDeal:
+    property_id: str
+    suburb: Optional[str]
+    scenario: str
+    lots: int
+    profit: float
+    margin_on_cost: float
+    roi_simple: float
+
+
+def _norm_suburb(suburb: Optional[str]) -> str:
+    return (suburb or "").strip().upper()
+
+
+class DealStore:
+    """
+    Колоночное хранилище оценённых сценариев. add() того же property_id
+    заменяет его прежние строки (старые помечаются мёртвыми).
+    """
+
+    def __init__(self) -> None:
+        self._property: List[str] = []
+        self._suburb = array("I")
+        self._scenario = array("I")
+        self._lots = array("I")
+        self._profit = array("d")
+        self._margin = array("d")
+        self._roi = array("d")
+        self._alive = bytearray()
+        self._live = 0
+
+        self._suburbs: List[str] = []           # id → строка (словарное кодирование)
+        self._suburb_ids: Dict[str, int] = {}
+        self._scenarios: List[str] = []
+        self._scenario_ids: Dict[str, int] = {}
+
+        self._by_suburb: Dict[int, array] = {}
+        self._by_scenario: Dict[int, array] = {}
+        self._rows_of: Dict[str, Tuple[int, int]] = {}  # property_id → [start, end)
+
+    def __len__(self) -> int:
+        return self._live
+
+    @staticmethod
+    def _intern(value: str, names: List[str], ids: Dict[str, int]) -> int:
+        i = ids.get(value)
+        if i is None:
+            i = ids[value] = len(names)
+            names.append(value)
+        return i
+
+    def add(self, property_id: str, suburb: Optional[str], result: EvaluationResponse) -> None:
+        rows = (
+            (s.scenario, s.lots, s.profit, s.margin_on_cost, s.roi_simple)
+            for s in result.scenarios
+        )
+        self.add_rows(property_id, suburb, rows)
+
+    def add_rows(self, property_id: str, suburb: Optional[str], rows: Iterable[DealRow]) -> None:
+        """Строки без EvaluationResponse — для потоков, где есть только цифры."""
+        self.remove(property_id)
+        if len(self._property) - self._live > max(self._live, 4096):
+            self.compact()
+        sub = self._intern(_norm_suburb(suburb), self._suburbs, self._suburb_ids)
+        by_sub = self._by_suburb.setdefault(sub, array("I"))
+        start = len(self._property)
+        for scenario, lots, profit, margin, roi in rows:
+            row = len(self._property)
+            scen = self._intern(scenario, self._scenarios, self._scenario_ids)
+            self._property.append(property_id)
+            self._suburb.append(sub)
+            self._scenario.append(scen)
+            self._lots.append(lots)
+            self._profit.append(profit)
+            self._margin.append(margin)
+            self._roi.append(roi)
+            self._alive.append(1)
+            by_sub.append(row)
+            self._by_scenario.setdefault(scen, array("I")).append(row)
+        self._rows_of[property_id] = (start, len(self._property))
+        self._live += len(self._property) - start
+
+    def extend(self, deals: Iterable[EvaluatedDeal]) -> None:
+        for property_id, suburb, result in deals:
+            self.add(property_id, suburb, result)
+
+    def remove(self, property_id: str) -> bool:
+        rows = self._rows_of.pop(property_id, None)
+        if rows is None:
+            return False
+        for row in range(*rows):
+            self._alive[row] = 0
+        self._live -= rows[1] - rows[0]
+        return True
+
+    def compact(self) -> None:
+        """Пересобрать колонки без мёртвых строк (вызывается из add автоматически)."""
+        old = (self._property, self._suburb, self._scenario, self._lots,
+               self._profit, self._margin, self._roi, self._alive)
+        prop, sub, scen, lots, profit, margin, roi, alive = old
+        self._property, self._alive = [], bytearray()
+        self._suburb, self._scenario, self._lots = array("I"), array("I"), array("I")
+        self._profit, self._margin, self._roi = array("d"), array("d"), array("d")
+        self._by_suburb, self._by_scenario, self._rows_of = {}, {}, {}
+        for row in range(len(prop)):
+            if not alive[row]:
+                continue
+            new = len(self._property)
+            pid = prop[row]
+            start = self._rows_of.get(pid, (new, new))[0]
+            self._rows_of[pid] = (start, new + 1)
+            self._property.append(pid)
+            self._suburb.append(sub[row])
+            self._scenario.append(scen[row])
+            self._lots.append(lots[row])
+            self._profit.append(profit[row])
+            self._margin.append(margin[row])
+            self._roi.append(roi[row])
+            self._alive.append(1)
+            self._by_suburb.setdefault(sub[row], array("I")).append(new)
+            self._by_scenario.setdefault(scen[row], array("I")).append(new)
+
+    # ---- запрос ----
+
+    def _candidates(self, q: DealQuery) -> Iterable[int]:
+        """
+        Строки-кандидаты по индексам (без чтения числовых колонок).
+        Строки одного объекта идут подряд — на этом держится distinct в top().
+        """
+        scen_ids: Optional[Set[int]] = None
+        if q.scenarios is not None:
+            scen_ids = {self._scenario_ids[c] for c in q.scenarios if c in self._scenario_ids}
+            if not scen_ids:
+                return ()
+        if q.suburbs is not None:
+            sub_ids = {self._suburb_ids.get(_norm_suburb(s)) for s in q.suburbs}
+            # после compact() у пригорода без живых строк индекса нет
+            lists = [self._by_suburb.get(i, ()) for i in sorted(sub_ids - {None})]
+            rows: Iterable[int] = (row for rows in lists for row in rows)
+        elif scen_ids is not None and len(scen_ids) == 1:
+            # один сценарий — не больше строки на объект, индекс сценария сразу точный
+            return self._by_scenario.get(next(iter(scen_ids)), ())
+        else:
+            rows = range(len(self._property))
+        if scen_ids is None:
+            return rows
+        scen = self._scenario
+        return (row for row in rows if scen[row] in scen_ids)
+
+    def _matching(self, q: DealQuery) -> Iterator[int]:
+        alive, lots, profit, margin = self._alive, self._lots, self._profit, self._margin
+        min_lots = q.min_lots
+        min_profit = float("-inf") if q.min_profit is None else q.min_profit
+        min_margin = float("-inf") if q.min_margin is None else q.min_margin
+        for row in self._candidates(q):
+            if (
+                alive[row]
+                and lots[row] >= min_lots
+                and profit[row] >= min_profit
+                and margin[row] >= min_margin
+            ):
+                yield row
+
+    def _column(self, order_by: OrderBy) -> array:
+        columns = {"margin_on_cost": self._margin, "profit": self._profit, "roi_simple": self._roi}
+        return columns[order_by]
+
+    def top(self, q: DealQuery) -> List[RankedDeal]:
+        score, profit = self._column(q.order_by), self._profit
+        rows: Iterable[int] = self._matching(q)
+        if q.distinct_properties:
+            rows = self._best_per_property(rows, score)
+        winners = heapq.nlargest(q.limit, rows, key=lambda r: (score[r], profit[r], -r))
+        return [self._materialize(r) for r in winners]
+
+    def _best_per_property(self, rows: Iterable[int], score: array) -> Iterator[int]:
+        """Лучшая строка каждого объекта; строки объекта приходят подряд."""
+        prop, profit = self._property, self._profit
+        best = -1
+        for row in rows:
+            if best >= 0 and prop[row] == prop[best]:
+                if (score[row], profit[row]) > (score[best], profit[best]):
+                    best = row
+                continue
+            if best >= 0:
+                yield best
+            best = row
+        if best >= 0:
+            yield best
+
+    def _materialize(self, row: int) -> RankedDeal:
+        return RankedDeal(
+            property_id=self._property[row],
+            suburb=self._suburbs[self._suburb[row]] or None,
+            scenario=self._scenarios[self._scenario[row]],
+            lots=self._lots[row],
+            profit=self._profit[row],
+            margin_on_cost=self._margin[row],
+            roi_simple=self._roi[row],
+        )
+
+
+def rank_stream(deals: Iterable[EvaluatedDeal], q: DealQuery) -> List[RankedDeal]:
+    """
+    Top-K по потоку оценок без хранилища: фильтр до создания объектов,
+    heap размера limit (при distinct_properties — по лучшему сценарию объекта).
+    """
+    suburbs = None if q.suburbs is None else {_norm_suburb(s) for s in q.suburbs}
+    scenarios = None if q.scenarios is None else set(q.scenarios)
+    min_profit = float("-inf") if q.min_profit is None else q.min_profit
+    min_margin = float("-inf") if q.min_margin is None else q.min_margin
+
+    if q.limit <= 0:
+        return []
+    heap: List[Tuple[Tuple[float, float, int], int, str, Optional[str], ScenarioResult]] = []
+    seq = 0
+    for property_id, suburb, result in deals:
+        if suburbs is not None and _norm_suburb(suburb) not in suburbs:
+            continue
+        picked = []
+        for s in result.scenarios:
+            if (
+                (scenarios is None or s.scenario in scenarios)
+                and s.lots >= q.min_lots
+                and s.profit >= min_profit
+                and s.margin_on_cost >= min_margin
+            ):
+                picked.append(s)
+        if q.distinct_properties and picked:
+            picked = [max(picked, key=lambda s: (getattr(s, q.order_by), s.profit))]
+        for s in picked:
+            seq += 1
+            item = ((getattr(s, q.order_by), s.profit, -seq), seq, property_id, suburb, s)
+            if len(heap) < q.limit:
+                heapq.heappush(heap, item)
+            elif item[0] > heap[0][0]:
+                heapq.heapreplace(heap, item)
+
+    heap.sort(reverse=True)
+    return [
+        RankedDeal(
+            property_id=pid,
+            suburb=_norm_suburb(sub) or None,
+            scenario=s.scenario,
+            lots=s.lots,
+            profit=s.profit,
+            margin_on_cost=s.margin_on_cost,
+            roi_simple=s.roi_simple,
+        )
+        for _, _, pid, sub, s in heap
+    ]
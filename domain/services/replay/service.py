@@ -0,0 +1,322 @@
+# ФАЙЛ: domain/services/replay/service.py
+"""
+Replay корпуса сохранённых входов оценки на старой и новой версии справочников
+(r_codes / cost_catalog / duty brackets) — что изменит правка каталога.
+
+Корпус — NDJSON: строка либо тело EvaluateRequest, либо
+{"property_id": "...", "request": {...}}. Место входа — «файл:строка»
+(физический номер строки с 1, по каждому файлу); оно же property_id по
+умолчанию и префикс ошибок разбора. Каждый вход оценивается дважды
+(use_catalogs(old) / use_catalogs(new)) пакетом evaluate_many с verbosity="none";
+сравниваются прибыль и маржа лучшего сценария, best_scenario_code и
+lot_yield_estimate.
+
+Параллелизм — ProcessPoolExecutor на все ядра: каждый процесс один раз
+загружает обе версии справочников (initializer), задачи — чанки сырых строк
+(парсинг и валидация — в воркере), обратно идут только дельты в array('d')
+и список «флипов». В полёте не больше 2 чанков на воркер — корпус читается
+потоком, память не растёт с его размером (кроме колонок дельт, 16 байт на вход).
+"""
+from __future__ import annotations
+
+import os
+import time
+from array import array
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import orjson
+from pydantic import ValidationError
+
+from domain.models.evaluate import EvaluateRequest, EvaluationResponse
+from domain.services.catalogs.service import CatalogView, load_from_csv, use_catalogs
+from domain.services.evaluation.service import evaluate_many
+
+# |Δprofit| (AUD) / |Δmargin| ниже порога — «не изменилось»
+PROFIT_TOLERANCE = 1.0
+MARGIN_TOLERANCE = 1e-6
+_QUANTILES = (0.01, 0.05, 0.25, 0.50, 0.75, 0.95, 0.99)
+_MAX_ERROR_SAMPLES = 20
+
+# (место во входе: "corpus.ndjson:12" или "12", сырая строка)
+CorpusRecord = Tuple[str, bytes]
+
+
+@dataclass(frozen=True)
+class Flip:
+    """Вход, у которого сменился лучший сценарий или оценка числа лотов."""
+    property_id: str
+    old_best: Optional[str]
+    new_best: Optional[str]
+    old_lots: int
+    new_lots: int
+    old_profit: Optional[float]
+    new_profit: Optional[float]
+
+
+@dataclass
+class ChunkResult:
+    seq: int = 0          # номер чанка во входе — флипы и ошибки отдаются в порядке входа
+    evaluated: int = 0
+    errors: int = 0
+    profit_delta: array = field(default_factory=lambda: array("d"))
+    margin_delta: array = field(default_factory=lambda: array("d"))
+    flips: List[Flip] = field(default_factory=list)
+    error_samples: List[str] = field(default_factory=list)
+
+    def merge(self, other: "ChunkResult") -> None:
+        """Счётчики и дельты; флипы и ошибки упорядочивает replay() по seq."""
+        self.evaluated += other.evaluated
+        self.errors += other.errors
+        self.profit_delta.extend(other.profit_delta)
+        self.margin_delta.extend(other.margin_delta)
+
+
+@dataclass(frozen=True)
+class DeltaStats:
+    """Распределение дельт new − old по входам, у которых есть сценарии."""
+    count: int
+    changed: int       # |Δ| выше порога
+    up: int
+    down: int
+    mean: float
+    min: float
+    max: float
+    quantiles: Dict[str, float]
+
+    @classmethod
+    def of(cls, values: array, tolerance: float) -> "DeltaStats":
+        n = len(values)
+        if n == 0:
+            return cls(0, 0, 0, 0, 0.0, 0.0, 0.0, {})
+        ordered = sorted(values)
+        up = sum(1 for v in ordered if v > tolerance)
+        down = sum(1 for v in ordered if v < -tolerance)
+        return cls(
+            count=n,
+            changed=up + down,
+            up=up,
+            down=down,
+            mean=sum(ordered) / n,
+            min=ordered[0],
+            max=ordered[-1],
+            quantiles={f"p{round(q * 100)}": _quantile(ordered, q) for q in _QUANTILES},
+        )
+
+
+@dataclass
+class ReplayReport:
+    inputs: int
+    evaluated: int
+    errors: int
+    profit: DeltaStats
+    margin: DeltaStats
+    best_flips: int
+    lot_flips: int
+    flips: List[Flip]
+    error_samples: List[str]
+    elapsed_s: float
+    workers: int
+
+    @property
+    def throughput(self) -> float:
+        return self.inputs / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def to_dict(self, *, max_flips: Optional[int] = None) -> Dict[str, Any]:
+        out = asdict(self)
+        out["flips"] = out["flips"][:max_flips] if max_flips is not None else out["flips"]
+        out["throughput_per_s"] = round(self.throughput, 1)
+        return out
+
+
+def _quantile(ordered: Sequence[float], q: float) -> float:
+    """Линейная интерполяция между соседними рангами (как numpy по умолчанию)."""
+    pos = q * (len(ordered) - 1)
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+# ---- один чанк (в воркере или в процессе) ----
+
+def _parse(line: bytes, fallback_id: str) -> Tuple[str, EvaluateRequest]:
+    obj = orjson.loads(line)
+    if isinstance(obj, dict) and "request" in obj:
+        pid = str(obj.get("property_id") or fallback_id)
+        body = obj["request"]
+    else:
+        pid, body = fallback_id, obj
+    if not isinstance(body, dict):
+        raise ValueError("request must be a JSON object")
+    # цифры не зависят от текстов — заметки и советы не рендерим
+    return pid, EvaluateRequest.model_validate({**body, "verbosity": "none"})
+
+
+def _evaluate_with(
+    view: CatalogView, reqs: List[EvaluateRequest]
+) -> List[Optional[EvaluationResponse]]:
+    with use_catalogs(view):
+        try:
+            return list(evaluate_many(reqs))
+        except Exception:
+            # один сбойный вход не должен ронять чанк — досчитываем по одному
+            out: List[Optional[EvaluationResponse]] = []
+            for req in reqs:
+                try:
+                    out.append(evaluate_many([req])[0])
+                except Exception:
+                    out.append(None)
+            return out
+
+
+def _best(res: EvaluationResponse) -> Tuple[Optional[float], Optional[float]]:
+    if not res.scenarios:
+        return None, None
+    return res.scenarios[0].profit, res.scenarios[0].margin_on_cost
+
+
+def number_lines(lines: Iterable[bytes], source: str = "") -> Iterator[CorpusRecord]:
+    """Строки → записи корпуса с физическим номером строки (с 1); пустые пропускаются."""
+    for n, line in enumerate(lines, 1):
+        if line.strip():
+            yield (f"{source}:{n}" if source else str(n)), line
+
+
+def iter_corpus(paths: Iterable[Path]) -> Iterator[CorpusRecord]:
+    """NDJSON-файлы корпуса по порядку; место входа — «имя_файла:строка»."""
+    for path in paths:
+        with path.open("rb") as f:
+            yield from number_lines(f, path.name)
+
+
+def replay_chunk(
+    records: Sequence[CorpusRecord], old: CatalogView, new: CatalogView, *, seq: int = 0
+) -> ChunkResult:
+    """Записи корпуса → дельты и флипы (property_id по умолчанию — место входа)."""
+    out = ChunkResult(seq=seq)
+    ids: List[str] = []
+    reqs: List[EvaluateRequest] = []
+    for loc, line in records:
+        try:
+            pid, req = _parse(line, loc)
+        except (ValueError, ValidationError) as e:
+            out.errors += 1
+            if len(out.error_samples) < _MAX_ERROR_SAMPLES:
+                out.error_samples.append(f"{loc}: {str(e).splitlines()[0]}")
+            continue
+        ids.append(pid)
+        reqs.append(req)
+
+    for pid, a, b in zip(ids, _evaluate_with(old, reqs), _evaluate_with(new, reqs)):
+        if a is None or b is None:
+            out.errors += 1
+            if len(out.error_samples) < _MAX_ERROR_SAMPLES:
+                out.error_samples.append(f"{pid}: evaluation failed")
+            continue
+        out.evaluated += 1
+        old_profit, old_margin = _best(a)
+        new_profit, new_margin = _best(b)
+        if old_profit is not None and new_profit is not None:
+            out.profit_delta.append(new_profit - old_profit)
+            out.margin_delta.append(new_margin - old_margin)
+        if (
+            a.best_scenario_code != b.best_scenario_code
+            or a.lot_yield_estimate != b.lot_yield_estimate
+        ):
+            out.flips.append(Flip(
+                pid, a.best_scenario_code, b.best_scenario_code,
+                a.lot_yield_estimate, b.lot_yield_estimate, old_profit, new_profit,
+            ))
+    return out
+
+
+# ---- пул процессов ----
+
+_worker_catalogs: Optional[Tuple[CatalogView, CatalogView]] = None
+
+
+def _init_worker(old_dir: str, new_dir: str) -> None:
+    global _worker_catalogs
+    _worker_catalogs = (load_from_csv(Path(old_dir)), load_from_csv(Path(new_dir)))
+
+
+def _replay_in_worker(records: List[CorpusRecord], seq: int) -> ChunkResult:
+    assert _worker_catalogs is not None, "worker is not initialized"
+    old, new = _worker_catalogs
+    return replay_chunk(records, old, new, seq=seq)
+
+
+def _chunks(records: Iterable[CorpusRecord], size: int) -> Iterator[List[CorpusRecord]]:
+    chunk: List[CorpusRecord] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def replay(
+    records: Iterable[CorpusRecord],
+    old_dir: Path,
+    new_dir: Path,
+    *,
+    workers: Optional[int] = None,
+    chunk_size: int = 1000,
+) -> ReplayReport:
+    """
+    Прогнать корпус (iter_corpus / number_lines) на двух каталогах справочников
+    (каталоги с CSV, как data/catalogs). workers=None — все ядра; workers=1 —
+    без пула, в процессе. Флипы и ошибки — в порядке входа.
+    """
+    workers = workers or os.cpu_count() or 1
+    total = ChunkResult()
+    parts: List[Tuple[int, List[Flip], List[str]]] = []
+    inputs = 0
+    t0 = time.perf_counter()
+
+    def collect(res: ChunkResult) -> None:
+        total.merge(res)
+        if res.flips or res.error_samples:
+            parts.append((res.seq, res.flips, res.error_samples))
+
+    if workers == 1:
+        old, new = load_from_csv(old_dir), load_from_csv(new_dir)
+        for seq, chunk in enumerate(_chunks(records, chunk_size)):
+            inputs += len(chunk)
+            collect(replay_chunk(chunk, old, new, seq=seq))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(str(old_dir), str(new_dir))
+        ) as pool:
+            pending: Set[Future] = set()
+            for seq, chunk in enumerate(_chunks(records, chunk_size)):
+                inputs += len(chunk)
+                pending.add(pool.submit(_replay_in_worker, chunk, seq))
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        collect(fut.result())
+            for fut in pending:
+                collect(fut.result())
+
+    parts.sort(key=lambda p: p[0])
+    flips = [f for _, chunk_flips, _ in parts for f in chunk_flips]
+    errors = [e for _, _, chunk_errors in parts for e in chunk_errors]
+
+    return ReplayReport(
+        inputs=inputs,
+        evaluated=total.evaluated,
+        errors=total.errors,
+        profit=DeltaStats.of(total.profit_delta, PROFIT_TOLERANCE),
+        margin=DeltaStats.of(total.margin_delta, MARGIN_TOLERANCE),
+        best_flips=sum(1 for f in flips if f.old_best != f.new_best),
+        lot_flips=sum(1 for f in flips if f.old_lots != f.new_lots),
+        flips=flips,
+        error_samples=errors[:_MAX_ERROR_SAMPLES],
+        elapsed_s=time.perf_counter() - t0,
+        workers=workers,
+    )
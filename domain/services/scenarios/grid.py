@@ -0,0 +1,178 @@
+# ФАЙЛ: domain/services/scenarios/grid.py
+from __future__ import annotations
+
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from domain.models.evaluate import GridAxis
+from domain.services.costs.service import compute_project_costs
+from domain.services.finance.duty import calc_wa_stamp_duty
+
+# Порядок осей в упакованном массиве (после [scenario, field])
+GRID_AXES: Tuple[str, ...] = ("land_psqm", "purchase_price", "annual_interest_rate", "subdiv_months")
+GRID_FIELDS: Tuple[str, ...] = ("profit", "margin_on_cost")
+MAX_GRID_CELLS = 250_000
+
+
+@dataclass(frozen=True)
+class ScenarioTerms:
+    """
+    Аффинное разложение сценария по интерактивным параметрам:
+      revenue  = revenue_per_psqm * land_psqm + revenue_fixed
+      costs    = cost_fixed + cost_revenue_share * revenue      (без покупки/duty/холдинга)
+      holding  = price * rate / 12 * (subdiv_months + extra_months)
+    Совпадает с арифметикой build_scenarios в базовой точке.
+    """
+    code: str
+    revenue_per_psqm: float
+    revenue_fixed: float
+    cost_fixed: float
+    cost_revenue_share: float
+    extra_months: int
+
+
+@dataclass
+class ScenarioGrid:
+    lots: int
+    scenarios: List[str]
+    axes: List[Tuple[str, List[float]]]
+    values: array  # float32, shape = [scenario, field, *axes]
+
+    @property
+    def shape(self) -> List[int]:
+        return [len(self.scenarios), len(GRID_FIELDS), *(len(v) for _, v in self.axes)]
+
+    def to_bytes(self) -> bytes:
+        """Little-endian float32, row-major."""
+        if sys.byteorder == "big":
+            swapped = array("f", self.values)
+            swapped.byteswap()
+            return swapped.tobytes()
+        return self.values.tobytes()
+
+
+def _linspace(axis: GridAxis) -> List[float]:
+    if axis.steps < 2 or axis.max == axis.min:
+        return [float(axis.min)] * max(axis.steps, 1)
+    step = (axis.max - axis.min) / (axis.steps - 1)
+    return [float(axis.min + i * step) for i in range(axis.steps)]
+
+
+def default_axes(enriched) -> List[GridAxis]:
+    """Диапазоны по умолчанию вокруг базовых значений запроса."""
+    psqm = float(enriched.market.land_price_per_sqm_small_lot)
+    price = float(enriched.prop.purchase_price)
+    rate = float(enriched.asm.annual_interest_rate)
+    months = int(enriched.asm.subdiv_months)
+    # срок — в целых месяцах: узел на месяц (при months < 3 диапазон короче)
+    m_lo, m_hi = max(0, months - 3), months + 6
+    return [
+        GridAxis(min=psqm * 0.8, max=psqm * 1.2, steps=9),
+        GridAxis(min=price * 0.85, max=price * 1.15, steps=9),
+        GridAxis(min=max(0.0, rate - 0.03), max=min(1.0, rate + 0.03), steps=7),
+        GridAxis(min=m_lo, max=m_hi, steps=min(m_hi - m_lo + 1, 10)),
+    ]
+
+
+def scenario_terms(enriched, lots: int) -> List[ScenarioTerms]:
+    """
+    Разложение сценариев A/B/C (тот же набор, что строит build_scenarios).
+    Проектные затраты аффинны по выручке — снимаем две точки (revenue=0 и 1).
+    """
+    target_lot = (
+        enriched.scen.target_lot_size_sqm if enriched.scen
+        else enriched.market.land_target_lot_size_sqm
+    )
+    terms: List[ScenarioTerms] = []
+
+    # ---- A) subdivide & sell land
+    c0 = compute_project_costs(req=enriched, lots=lots, revenue=0.0)
+    c1 = compute_project_costs(req=enriched, lots=lots, revenue=1.0)
+    share = c1.total_ex_purchase - c0.total_ex_purchase
+    terms.append(ScenarioTerms(
+        code="subdivide_sell_lots",
+        revenue_per_psqm=float(lots * target_lot),
+        revenue_fixed=0.0,
+        cost_fixed=c0.total_ex_purchase,
+        cost_revenue_share=share,
+        extra_months=0,
+    ))
+
+    # ---- B) retain house & subdivide (без DEMO)
+    retain_lots = 1 if lots >= 2 else 0
+    b0 = compute_project_costs(req=enriched, lots=retain_lots, revenue=0.0)
+    terms.append(ScenarioTerms(
+        code="retain_and_subdivide",
+        revenue_per_psqm=float(retain_lots * target_lot),
+        revenue_fixed=0.0,
+        cost_fixed=b0.total_ex_purchase - b0.items.get("DEMO_BASE", 0.0),
+        cost_revenue_share=share,
+        extra_months=0,
+    ))
+
+    # ---- C) demo, rebuild & sell (только при house_arv)
+    arv = getattr(enriched.market, "house_arv", None)
+    if arv is not None and float(arv) > 0 and lots > 0:
+        build_cost = float(enriched.asm.min_build_cost_total or 0.0) * float(lots)
+        terms.append(ScenarioTerms(
+            code="demo_rebuild_and_sell",
+            revenue_per_psqm=0.0,
+            revenue_fixed=float(lots) * float(arv),
+            cost_fixed=c0.total_ex_purchase + build_cost,
+            cost_revenue_share=share,
+            extra_months=int(enriched.asm.build_months),
+        ))
+    return terms
+
+
+def build_scenario_grid(
+    enriched,
+    lots: int,
+    axes: Optional[Sequence[Optional[GridAxis]]] = None,
+) -> ScenarioGrid:
+    """
+    Считает profit и margin_on_cost по сетке (land_psqm × price × rate × months)
+    для всех сценариев. Инварианты по осям (выручка, duty, фикс. затраты)
+    считаются один раз на узел своей оси, внутренний цикл — только холдинг.
+    """
+    defaults = default_axes(enriched)
+    given = list(axes) if axes is not None else [None] * len(GRID_AXES)
+    specs = [g if g is not None else d for g, d in zip(given, defaults)]
+    psqm_vals, price_vals, rate_vals, month_vals = (_linspace(a) for a in specs)
+
+    terms = scenario_terms(enriched, lots)
+    n_inner = len(psqm_vals) * len(price_vals) * len(rate_vals) * len(month_vals)
+    cells = len(terms) * len(GRID_FIELDS) * n_inner
+    if cells > MAX_GRID_CELLS:
+        raise ValueError(f"Grid too large: {cells} cells > {MAX_GRID_CELLS}")
+
+    # duty — кусочно-линейная функция цены, считаем на узлах оси цены
+    duties = [calc_wa_stamp_duty(p) for p in price_vals]
+    out = array("f", bytes(4 * cells))
+    for si, t in enumerate(terms):
+        # rate/12 * months — множитель холдинга (у C дольше на срок стройки)
+        hold_factors = [[r / 12.0 * (m + t.extra_months) for m in month_vals] for r in rate_vals]
+        base_profit = (si * len(GRID_FIELDS) + 0) * n_inner
+        base_margin = (si * len(GRID_FIELDS) + 1) * n_inner
+        pos = 0
+        for psqm in psqm_vals:
+            revenue = t.revenue_per_psqm * psqm + t.revenue_fixed
+            project = t.cost_fixed + t.cost_revenue_share * revenue
+            for price, duty in zip(price_vals, duties):
+                total = price + duty + project
+                for row in hold_factors:
+                    for f in row:
+                        spend = total + price * f
+                        profit = revenue - spend
+                        out[base_profit + pos] = profit
+                        out[base_margin + pos] = profit / (spend or 1.0)
+                        pos += 1
+
+    return ScenarioGrid(
+        lots=lots,
+        scenarios=[t.code for t in terms],
+        axes=list(zip(GRID_AXES, [psqm_vals, price_vals, rate_vals, month_vals])),
+        values=out,
+    )
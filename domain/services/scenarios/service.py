@@ -5,6 +5,7 @@ from typing import Dict, List, Optional, Tuple
 from domain.models.evaluate import ScenarioResult
 from domain.services.costs.service import compute_project_costs
 from domain.services.finance.duty import calc_wa_stamp_duty
+from domain.services.notes.service import Note, render_notes
 
 
 def _target_lot_size(enriched) -> int:
@@ -18,17 +19,29 @@ def _holding_cost(purchase: float, annual_rate: float, months: int) -> float:
     return float(purchase * (annual_rate / 12.0) * months)
 
 
-def _costs_note(items: Dict[str, float], *, duty: float) -> str:
-    parts = [f"{k}={v:,.0f}" for k, v in items.items()]
-    parts.append(f"DUTY={duty:,.0f}")
-    return "Costs: " + ", ".join(parts)
+def _costs_note(items: Dict[str, float], *, duty: float, label: Optional[str] = None) -> Note:
+    return Note("COSTS", {"items": items, "duty": duty, "label": label})
 
 
-def build_scenarios(enriched, ctx, lots: int) -> List[ScenarioResult]:
+def build_scenarios(enriched, ctx, lots: int, *, with_rebuild: bool = True) -> List[ScenarioResult]:
     """
     Возвращает список ScenarioResult по трём шаблонам (см. сводку выше).
+    with_rebuild=False — без сценария C (упрощённый режим под нагрузкой).
+    Заметки рендерятся по enriched.verbosity/locale:
+      full    — общие заметки контекста + теги сценария + разбивка затрат;
+      summary — только теги сценария (общие заметки — в ответе один раз);
+      none    — без заметок.
     """
     scenarios: List[ScenarioResult] = []
+    verbosity = getattr(enriched, "verbosity", "full")
+    locale = getattr(enriched, "locale", "en")
+    shared = render_notes(ctx.notes or [], locale) if verbosity == "full" else []
+
+    def _notes(tags: Tuple[Note, ...], costs: Optional[Note]) -> List[str]:
+        if verbosity == "none":
+            return []
+        own = [*tags, costs] if (verbosity == "full" and costs is not None) else list(tags)
+        return [*shared, *render_notes(own, locale)]
 
     target_lot = _target_lot_size(enriched)
     land_psqm = float(enriched.market.land_price_per_sqm_small_lot)
@@ -51,7 +64,7 @@ def build_scenarios(enriched, ctx, lots: int) -> List[ScenarioResult]:
         profit=profit_a,
         margin_on_cost=profit_a / denom_a,
         roi_simple=profit_a / purchase if purchase > 0 else 0.0,
-        notes=[*_merge_notes(ctx, f"A: {_costs_note(costs_a.items, duty=duty)}")],
+        notes=_notes((), _costs_note(costs_a.items, duty=duty, label="A")),
     )
     scenarios.append(scen_a)
 
@@ -76,13 +89,13 @@ def build_scenarios(enriched, ctx, lots: int) -> List[ScenarioResult]:
         profit=profit_b,
         margin_on_cost=profit_b / denom_b,
         roi_simple=profit_b / purchase if purchase > 0 else 0.0,
-        notes=[*_merge_notes(ctx, "B: retain house; DEMO excluded.", _costs_note(items_b, duty=duty))],
+        notes=_notes((Note("RETAIN_NO_DEMO"),), _costs_note(items_b, duty=duty)),
     )
     scenarios.append(scen_b)
 
     # ---- C) demo, rebuild & sell houses (нужен house_arv)
     arv = getattr(enriched.market, "house_arv", None)
-    if arv is not None and float(arv) > 0 and lots > 0:
+    if with_rebuild and arv is not None and float(arv) > 0 and lots > 0:
         revenue_c = float(lots) * float(arv)
         costs_c = compute_project_costs(req=enriched, lots=lots, revenue=revenue_c)
         items_c = dict(costs_c.items)
@@ -104,7 +117,7 @@ def build_scenarios(enriched, ctx, lots: int) -> List[ScenarioResult]:
             profit=profit_c,
             margin_on_cost=profit_c / denom_c,
             roi_simple=profit_c / purchase if purchase > 0 else 0.0,
-            notes=[*_merge_notes(ctx, "C: includes BUILD cost.", _costs_note(items_c, duty=duty))],
+            notes=_notes((Note("INCLUDES_BUILD"),), _costs_note(items_c, duty=duty)),
         )
         scenarios.append(scen_c)
     else:
@@ -112,11 +125,3 @@ def build_scenarios(enriched, ctx, lots: int) -> List[ScenarioResult]:
         pass
 
     return scenarios
-
-
-def _merge_notes(ctx, *extra: str) -> List[str]:
-    base = list(ctx.notes or [])
-    for n in extra:
-        if n:
-            base.append(n)
-    return base
\ No newline at end of file
@@ -0,0 +1,216 @@
+# ФАЙЛ: domain/services/watchlist/service.py
+"""
+Вотчлист: последняя оценка по каждому объекту + индекс зависимостей
+(пригород / R-код / именованный бенчмарк → объекты).
+
+На событие рынка (CompsUpdated, смена бенчмарка, смена R-кода в каталоге)
+пересчитываются только зависимые объекты (одним вызовом evaluate_many) —
+стоимость пропорциональна изменению, а не размеру вотчлиста. Наружу отдаются только те, у кого
+сменился best_scenario_code или прибыль лучшего сценария.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import (
+    Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple,
+    Union,
+)
+
+from domain.models.evaluate import EvaluateRequest, EvaluationResponse, MarketBenchmarks
+from domain.models.events import CompsUpdated
+from domain.services.evaluation.service import evaluate_many
+
+# ("suburb", "BALGA") / ("r_code", "R30") / ("benchmark", "<имя>")
+DepKey = Tuple[str, str]
+BatchEvaluator = Callable[[Sequence[EvaluateRequest]], List[EvaluationResponse]]
+
+
+def suburb_key(code: str) -> DepKey:
+    return ("suburb", code.strip().upper())
+
+
+def r_code_key(code: str) -> DepKey:
+    return ("r_code", code.strip().upper())
+
+
+def benchmark_key(name: str) -> DepKey:
+    return ("benchmark", name.strip())
+
+
+@dataclass
+class WatchEntry:
+    property_id: str
+    request: EvaluateRequest
+    deps: FrozenSet[DepKey]
+    result: EvaluationResponse
+    suburb: Optional[str] = None
+
+    @property
+    def best_scenario_code(self) -> Optional[str]:
+        return self.result.best_scenario_code
+
+    @property
+    def best_profit(self) -> Optional[float]:
+        return self.result.scenarios[0].profit if self.result.scenarios else None
+
+
+@dataclass(frozen=True)
+class WatchChange:
+    """Изменение, которое стоит показать пользователю."""
+    property_id: str
+    old_best: Optional[str]
+    new_best: Optional[str]
+    old_profit: Optional[float]
+    new_profit: Optional[float]
+
+
+@dataclass
+class WatchStats:
+    evaluated: int = 0   # полных оценок (включая add)
+    skipped: int = 0     # зависимые объекты, у которых бенчмарки не изменились
+    changed: int = 0     # отданных WatchChange
+
+
+class Watchlist:
+    """
+    Не потокобезопасен: события рынка применяются последовательно
+    одним потребителем. Запросы хранятся с verbosity="none" — вотчлисту
+    нужны только цифры, тексты заметок не рендерятся.
+    """
+
+    def __init__(
+        self,
+        evaluate_many_fn: BatchEvaluator = evaluate_many,
+        *,
+        profit_tolerance: float = 1.0,
+    ) -> None:
+        self._evaluate_many = evaluate_many_fn
+        self.profit_tolerance = profit_tolerance
+        self._entries: Dict[str, WatchEntry] = {}
+        self._index: Dict[DepKey, Set[str]] = {}
+        self.stats = WatchStats()
+
+    # ---- состав ----
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, property_id: str) -> Optional[WatchEntry]:
+        return self._entries.get(property_id)
+
+    def deals(self) -> Iterator[Tuple[str, Optional[str], EvaluationResponse]]:
+        """(property_id, suburb, оценка) — вход для ranking.rank_stream / DealStore.extend."""
+        for entry in self._entries.values():
+            yield entry.property_id, entry.suburb, entry.result
+
+    def dependents(self, key: DepKey) -> FrozenSet[str]:
+        return frozenset(self._index.get(key, ()))
+
+    def add(
+        self,
+        property_id: str,
+        req: EvaluateRequest,
+        *,
+        suburb: Optional[str] = None,
+        benchmarks: Iterable[str] = (),
+    ) -> WatchEntry:
+        """
+        Добавляет (или заменяет) объект и сразу оценивает его.
+        suburb — код пригорода для CompsUpdated (по умолчанию prop.suburb);
+        benchmarks — имена бенчмарков, от которых зависят рыночные допущения.
+        """
+        self.remove(property_id)
+        req = req.model_copy(update={"verbosity": "none"})
+        deps: Set[DepKey] = {benchmark_key(b) for b in benchmarks}
+        suburb = suburb or req.prop.suburb
+        if suburb:
+            deps.add(suburb_key(suburb))
+        if req.prop.r_code:
+            deps.add(r_code_key(req.prop.r_code))
+
+        (result,) = self._run([req])
+        entry = WatchEntry(property_id, req, frozenset(deps), result, suburb)
+        self._entries[property_id] = entry
+        for key in entry.deps:
+            self._index.setdefault(key, set()).add(property_id)
+        return entry
+
+    def remove(self, property_id: str) -> bool:
+        entry = self._entries.pop(property_id, None)
+        if entry is None:
+            return False
+        for key in entry.deps:
+            ids = self._index.get(key)
+            if ids is not None:
+                ids.discard(property_id)
+                if not ids:
+                    del self._index[key]
+        return True
+
+    # ---- события ----
+
+    def apply_comps_updated(self, event: Union[CompsUpdated, Dict[str, Any]]) -> List[WatchChange]:
+        """CompsUpdated.v1: новые медианы пригорода → market зависимых объектов."""
+        if not isinstance(event, CompsUpdated):
+            event = CompsUpdated.model_validate(event)
+        p = event.payload
+        updates: Dict[str, Any] = {"land_price_per_sqm_small_lot": p.land_smalllot_psqm_median}
+        if p.house_arv_median is not None:
+            updates["house_arv"] = p.house_arv_median
+        return self.apply_benchmarks(suburb_key(p.suburb_code), **updates)
+
+    def apply_benchmarks(self, key: DepKey, **market_updates: Any) -> List[WatchChange]:
+        """Обновить поля MarketBenchmarks у объектов, зависящих от key, и пересчитать их."""
+        todo: List[Tuple[WatchEntry, EvaluateRequest]] = []
+        for pid in sorted(self._index.get(key, ())):
+            entry = self._entries[pid]
+            market = entry.request.market
+            merged = {**market.model_dump(), **market_updates}
+            if merged == market.model_dump():
+                self.stats.skipped += 1
+                continue
+            # рынок больше не совпадает с профилем — ссылку снимаем, иначе
+            # запрос (и его ключ кэша) описывал бы не те бенчмарки
+            todo.append((entry, entry.request.model_copy(update={
+                "market": MarketBenchmarks.model_validate(merged),
+                "market_profile": None,
+                "market_overrides": None,
+            })))
+        return self._reevaluate(todo)
+
+    def invalidate(self, key: DepKey) -> List[WatchChange]:
+        """
+        Пересчитать зависимые объекты с теми же входами — например, после
+        смены порогов R-кода в каталоге (r_code_key(...)).
+        """
+        entries = [self._entries[pid] for pid in sorted(self._index.get(key, ()))]
+        return self._reevaluate([(entry, entry.request) for entry in entries])
+
+    # ---- внутреннее ----
+
+    def _run(self, reqs: Sequence[EvaluateRequest]) -> List[EvaluationResponse]:
+        if not reqs:
+            return []
+        self.stats.evaluated += len(reqs)
+        return self._evaluate_many(reqs)
+
+    def _reevaluate(self, todo: List[Tuple[WatchEntry, EvaluateRequest]]) -> List[WatchChange]:
+        """Пересчитать объекты одним батчем; вернуть заметные изменения."""
+        results = self._run([req for _, req in todo])
+        changes: List[WatchChange] = []
+        for (entry, req), result in zip(todo, results):
+            old_best, old_profit = entry.best_scenario_code, entry.best_profit
+            entry.request, entry.result = req, result
+            new_best, new_profit = entry.best_scenario_code, entry.best_profit
+            if old_best == new_best and not self._profit_moved(old_profit, new_profit):
+                continue
+            self.stats.changed += 1
+            changes.append(
+                WatchChange(entry.property_id, old_best, new_best, old_profit, new_profit)
+            )
+        return changes
+
+    def _profit_moved(self, old: Optional[float], new: Optional[float]) -> bool:
+        if old is None or new is None:
+            return old is not new
+        return abs(new - old) > self.profit_tolerance
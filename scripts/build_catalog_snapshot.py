@@ -0,0 +1,32 @@
+"""
+Компилирует справочники data/catalogs в новую версию бинарного снапшота.
+
+    python -m scripts.build_catalog_snapshot [--root data/catalogs] [--out-dir DIR]
+
+Пишет <out-dir>/catalogs-vNNNNNN.bin и атомарно переключает <out-dir>/CURRENT.
+Воркеры (uvicorn --workers N) mmap-ят текущую версию read-only и подхватывают
+новую в течение $SUBDIV_CATALOG_SNAPSHOT_CHECK_S секунд.
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from domain.services.catalogs.snapshot import MappedCatalogs, build_snapshot
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--root", type=Path, default=None, help="каталог с CSV (по умолчанию data/catalogs)")
+    ap.add_argument(
+        "--out-dir", type=Path, default=None,
+        help="каталог снапшотов (по умолчанию data/catalogs/snapshots)",
+    )
+    args = ap.parse_args()
+    path = build_snapshot(args.root, args.out_dir)
+    snap = MappedCatalogs(path)
+    print(f"Snapshot {snap.version}: {path} ({path.stat().st_size} bytes, sha256 {snap.digest[:12]})")
+
+
+if __name__ == "__main__":
+    main()
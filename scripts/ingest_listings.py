@@ -0,0 +1,91 @@
+"""
+Приём ленты объявлений ListingCreated (NDJSON) с дедупликацией и автооценкой.
+
+    python -m scripts.ingest_listings feed1.ndjson [feed2.ndjson ...] \
+        --market markets.json --out results.ndjson [--follow]
+
+markets.json: {"BALGA": {"land_price_per_sqm_small_lot": 1750, ...}, "*": {...}} —
+бенчмарки по suburb_code ("*" — по умолчанию). Без --market используется
+--psqm для всех пригородов. Счётчики (лаг, throughput, дубли) — в stderr
+каждые --report-every секунд и итогом в stdout (JSON).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from adapters.external.listing_feeds import iter_ndjson
+from domain.models.evaluate import EvaluationResponse, MarketBenchmarks
+from domain.services.ingest.service import ListingIngester, NormalizedListing
+
+
+def _market_provider(path: Optional[Path], psqm: float):
+    table: Dict[str, MarketBenchmarks] = {}
+    if path is not None:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        table = {k.upper(): MarketBenchmarks.model_validate(v) for k, v in raw.items()}
+    default = table.get("*") or MarketBenchmarks(land_price_per_sqm_small_lot=psqm)
+
+    def market_for(suburb: Optional[str]) -> Optional[MarketBenchmarks]:
+        return table.get((suburb or "").upper(), default)
+
+    return market_for
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("feeds", nargs="+", type=Path, help="NDJSON-файлы ListingCreated.v1")
+    ap.add_argument("--market", type=Path, default=None, help="бенчмарки по suburb_code (JSON)")
+    ap.add_argument("--psqm", type=float, default=1600.0, help="цена м² малого лота по умолчанию")
+    ap.add_argument("--out", type=Path, default=None, help="NDJSON с результатами оценки")
+    ap.add_argument("--batch-size", type=int, default=256)
+    ap.add_argument("--max-wait", type=float, default=0.5, help="макс. ожидание батча, с")
+    ap.add_argument("--follow", action="store_true", help="дочитывать последний файл (tail -f)")
+    ap.add_argument("--report-every", type=float, default=5.0)
+    args = ap.parse_args()
+
+    out = open(args.out, "ab") if args.out else None
+
+    def sink(results: List[Tuple[NormalizedListing, EvaluationResponse]]) -> None:
+        if out is None:
+            return
+        for listing, res in results:
+            row = {
+                "listing_id": listing.listing_id,
+                "property_id": listing.property_id,
+                "best_scenario_code": res.best_scenario_code,
+                "profit": res.scenarios[0].profit if res.scenarios else None,
+                "lot_yield_estimate": res.lot_yield_estimate,
+            }
+            out.write(json.dumps(row).encode("utf-8") + b"\n")
+        out.flush()
+
+    ingester = ListingIngester(
+        _market_provider(args.market, args.psqm),
+        sink,
+        batch_size=args.batch_size,
+        max_wait_s=args.max_wait,
+    )
+    next_report = time.monotonic() + args.report_every
+    try:
+        for event in iter_ndjson(args.feeds, follow=args.follow):
+            ingester.submit(event)
+            if time.monotonic() >= next_report:
+                snap = ingester.stats.snapshot(pending=ingester.pending)
+                print(json.dumps(snap), file=sys.stderr)
+                next_report = time.monotonic() + args.report_every
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ingester.flush()
+        if out is not None:
+            out.close()
+    print(json.dumps(ingester.stats.snapshot(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
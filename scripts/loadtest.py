@@ -0,0 +1,395 @@
+"""
+HTTP-нагрузка на apps.api.main:app: кривая насыщения по воркерам и конкурентности.
+
+    python -m scripts.loadtest --workers 1,2,4 --concurrency 1,2,4,8,16,32,64 --duration 10
+
+Для каждого числа воркеров поднимает uvicorn локально, прогоняет микс запросов
+из data/samples/*.json (с вариациями) на растущей конкурентности и печатает
+throughput, p50/p95/p99 и долю ошибок по уровням + «колено» кривой.
+Клиент — asyncio с keep-alive соединениями (без сторонних зависимостей),
+чтобы генератор не был узким местом раньше сервера.
+
+Сервер наследует env, поэтому упрощённый режим под нагрузкой проверяется так:
+    SUBDIV_DEGRADE_INFLIGHT=8 python -m scripts.loadtest --concurrency 4,16,64
+ответы с X-Degraded: 1 считаются в status_counts["degraded"].
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLES = ROOT / "data" / "samples"
+
+
+# ---- микс запросов ----
+
+@dataclass(frozen=True)
+class RequestSpec:
+    path: str
+    body: bytes
+    accept: str = "application/json"
+
+
+def build_payload_mix(
+    samples_dir: Path = SAMPLES,
+    *,
+    variants_per_sample: int = 20,
+    seed: int = 7,
+    grid_share: float = 0.05,
+    columnar_share: float = 0.05,
+) -> List[RequestSpec]:
+    """
+    Реалистичный микс: образцы как есть + вариации площади/цены/фронтажа/R-кода,
+    разные уровни verbosity, немного what-if сеток и колоночных ответов.
+    """
+    rng = random.Random(seed)
+    bases = [json.loads(p.read_text(encoding="utf-8")) for p in sorted(samples_dir.glob("*.json"))]
+    if not bases:
+        raise SystemExit(f"No samples in {samples_dir}")
+
+    specs: List[RequestSpec] = []
+    for base in bases:
+        specs.append(RequestSpec("/evaluate", json.dumps(base).encode()))
+        for _ in range(variants_per_sample):
+            p = json.loads(json.dumps(base))
+            prop = p["prop"]
+            prop["land_area_sqm"] = round(prop["land_area_sqm"] * rng.uniform(0.6, 1.6))
+            prop["purchase_price"] = round(prop["purchase_price"] * rng.uniform(0.8, 1.25), -3)
+            if prop.get("frontage_m") is not None:
+                prop["frontage_m"] = round(prop["frontage_m"] * rng.uniform(0.7, 1.5), 1)
+            prop["r_code"] = rng.choice(["R20", "R25", "R30", prop.get("r_code")])
+            p["market"]["land_price_per_sqm_small_lot"] = round(
+                p["market"]["land_price_per_sqm_small_lot"] * rng.uniform(0.85, 1.15)
+            )
+            p["verbosity"] = rng.choice(["full", "full", "summary", "none"])
+
+            roll = rng.random()
+            if roll < grid_share:
+                specs.append(RequestSpec("/evaluate/grid", json.dumps({"base": p}).encode()))
+            elif roll < grid_share + columnar_share:
+                specs.append(
+                    RequestSpec("/evaluate", json.dumps(p).encode(), "application/x-msgpack")
+                )
+            else:
+                specs.append(RequestSpec("/evaluate", json.dumps(p).encode()))
+    rng.shuffle(specs)
+    return specs
+
+
+# ---- статистика ----
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Перцентиль с линейной интерполяцией; sorted_values — по возрастанию."""
+    if not sorted_values:
+        return float("nan")
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    pos = (len(sorted_values) - 1) * q
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+@dataclass
+class LevelResult:
+    workers: int
+    concurrency: int
+    requests: int
+    errors: int
+    duration_s: float
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    error_rate: float
+    status_counts: Dict[str, int] = field(default_factory=dict)
+
+
+def summarize(
+    workers: int, concurrency: int, latencies_s: List[float], errors: int,
+    duration_s: float, status_counts: Dict[str, int],
+) -> LevelResult:
+    lat = sorted(latencies_s)
+    total = len(lat) + errors
+    return LevelResult(
+        workers=workers,
+        concurrency=concurrency,
+        requests=total,
+        errors=errors,
+        duration_s=duration_s,
+        rps=len(lat) / duration_s if duration_s > 0 else 0.0,
+        p50_ms=percentile(lat, 0.50) * 1000,
+        p95_ms=percentile(lat, 0.95) * 1000,
+        p99_ms=percentile(lat, 0.99) * 1000,
+        error_rate=errors / total if total else 0.0,
+        status_counts=status_counts,
+    )
+
+
+def find_knee(levels: Sequence[LevelResult], min_gain: float = 0.10) -> Optional[LevelResult]:
+    """
+    «Колено» — последний уровень конкурентности, после которого рост
+    throughput меньше min_gain (доля) или доля ошибок растёт больше чем на
+    1 п.п. Задержка не учитывается — её рост виден по p95/p99 в отчёте.
+    Если насыщения не видно — последний уровень.
+    """
+    if not levels:
+        return None
+    for prev, cur in zip(levels, levels[1:]):
+        gain = (cur.rps - prev.rps) / prev.rps if prev.rps else 0.0
+        if gain < min_gain or cur.error_rate > prev.error_rate + 0.01:
+            return prev
+    return levels[-1]
+
+
+# ---- HTTP-клиент ----
+
+async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, bool]:
+    """(статус, упрощённый ли ответ — заголовок X-Degraded сервиса)."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            k, v = line.split(":", 1)
+            headers[k.strip().lower()] = v.strip()
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).strip(), 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    return status, headers.get("x-degraded") == "1"
+
+
+def _encode(spec: RequestSpec, host: str) -> bytes:
+    return (
+        f"POST {spec.path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Accept: {spec.accept}\r\nContent-Length: {len(spec.body)}\r\n\r\n"
+    ).encode("latin-1") + spec.body
+
+
+async def _user(
+    host: str, port: int, requests: List[bytes], start_idx: int, deadline: float,
+    latencies: List[float], status_counts: Dict[str, int], errors: List[int], timeout_s: float,
+) -> None:
+    reader = writer = None
+    i = start_idx
+    while time.perf_counter() < deadline:
+        if writer is None:
+            try:
+                reader, writer = await asyncio.open_connection(host, port)
+            except OSError:
+                errors[0] += 1
+                status_counts["connect_error"] = status_counts.get("connect_error", 0) + 1
+                await asyncio.sleep(0.05)
+                continue
+        raw = requests[i % len(requests)]
+        i += 1
+        t0 = time.perf_counter()
+        try:
+            writer.write(raw)
+            status, degraded = await asyncio.wait_for(_read_response(reader), timeout_s)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError):
+            errors[0] += 1
+            status_counts["io_error"] = status_counts.get("io_error", 0) + 1
+            writer.close()
+            reader = writer = None
+            continue
+        dt = time.perf_counter() - t0
+        key = str(status)
+        status_counts[key] = status_counts.get(key, 0) + 1
+        if 200 <= status < 300:
+            latencies.append(dt)
+            if degraded:
+                status_counts["degraded"] = status_counts.get("degraded", 0) + 1
+        else:
+            errors[0] += 1
+    if writer is not None:
+        writer.close()
+
+
+async def run_level(
+    host: str, port: int, specs: List[RequestSpec], *, workers: int, concurrency: int,
+    duration_s: float, warmup_s: float, timeout_s: float,
+) -> LevelResult:
+    requests = [_encode(s, host) for s in specs]
+    if warmup_s > 0:
+        deadline = time.perf_counter() + warmup_s
+        await asyncio.gather(*(
+            _user(host, port, requests, u * 7, deadline, [], {}, [0], timeout_s)
+            for u in range(concurrency)
+        ))
+    latencies: List[float] = []
+    status_counts: Dict[str, int] = {}
+    errors = [0]
+    t0 = time.perf_counter()
+    await asyncio.gather(*(
+        _user(
+            host, port, requests, u * 7, t0 + duration_s,
+            latencies, status_counts, errors, timeout_s,
+        )
+        for u in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - t0
+    return summarize(workers, concurrency, latencies, errors[0], elapsed, status_counts)
+
+
+# ---- сервер ----
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(host: str, port: int, timeout_s: float = 30.0) -> None:
+    deadline = time.time() + timeout_s
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1.0) as s:
+                probe = f"GET /health HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n"
+                s.sendall(probe.encode())
+                if s.recv(16).startswith(b"HTTP/1.1 200"):
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server on {host}:{port} did not become ready")
+
+
+def start_server(app: str, host: str, port: int, workers: int) -> subprocess.Popen:
+    cmd = [
+        sys.executable, "-m", "uvicorn", app,
+        "--host", host, "--port", str(port), "--workers", str(workers),
+        "--log-level", "warning", "--no-access-log",
+    ]
+    env = dict(os.environ)
+    env.setdefault("PYTHONPATH", str(ROOT))
+    # stderr — во временный файл, не в PIPE: приложение логирует каждый /evaluate,
+    # и непрочитанный пайп заполнился бы и остановил сервер посреди прогона
+    log = tempfile.TemporaryFile()
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=log)
+    try:
+        _wait_ready(host, port)
+    except RuntimeError:
+        proc.kill()
+        log.seek(0)
+        err = log.read().decode(errors="replace")[-4000:]
+        raise RuntimeError(f"uvicorn failed to start:\n{err}")
+    return proc
+
+
+def stop_server(proc: subprocess.Popen) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+# ---- отчёт ----
+
+def format_report(levels: Sequence[LevelResult], knees: Dict[int, Optional[LevelResult]]) -> str:
+    lines = [
+        f"{'workers':>7} {'conc':>5} {'req':>8} {'rps':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'err %':>6}  curve",
+    ]
+    max_rps = max((lv.rps for lv in levels), default=0.0) or 1.0
+    for lv in levels:
+        bar = "#" * int(round(30 * lv.rps / max_rps))
+        knee = knees.get(lv.workers)
+        mark = "  <- knee" if knee is not None and knee.concurrency == lv.concurrency else ""
+        lines.append(
+            f"{lv.workers:>7} {lv.concurrency:>5} {lv.requests:>8} {lv.rps:>9.1f} "
+            f"{lv.p50_ms:>8.1f} {lv.p95_ms:>8.1f} {lv.p99_ms:>8.1f} "
+            f"{lv.error_rate * 100:>6.2f}  {bar}{mark}"
+        )
+    return "\n".join(lines)
+
+
+def _ints(s: str) -> List[int]:
+    return [int(x) for x in s.split(",") if x.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--app", default="apps.api.main:app")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--workers", default="1,2,4", help="список чисел воркеров uvicorn")
+    ap.add_argument("--concurrency", default="1,2,4,8,16,32,64", help="уровни конкурентности")
+    ap.add_argument("--duration", type=float, default=10.0, help="секунд на уровень")
+    ap.add_argument("--warmup", type=float, default=2.0, help="прогрев на уровень, сек")
+    ap.add_argument("--timeout", type=float, default=10.0, help="таймаут запроса, сек")
+    ap.add_argument("--knee-gain", type=float, default=0.10, help="мин. прирост rps до насыщения")
+    ap.add_argument("--samples", type=Path, default=SAMPLES)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument(
+        "--url", default=None, help="бить в уже запущенный сервер host:port (без запуска)"
+    )
+    ap.add_argument("--json", type=Path, default=None, help="сохранить результаты в JSON")
+    args = ap.parse_args(argv)
+
+    specs = build_payload_mix(args.samples, seed=args.seed)
+    levels: List[LevelResult] = []
+    knees: Dict[int, Optional[LevelResult]] = {}
+
+    targets: List[Tuple[int, Optional[str]]]
+    if args.url:
+        targets = [(0, args.url)]
+    else:
+        targets = [(w, None) for w in _ints(args.workers)]
+
+    for workers, url in targets:
+        proc = None
+        if url:
+            host, port_s = url.rsplit(":", 1)
+            port = int(port_s)
+        else:
+            host, port = args.host, _free_port()
+            proc = start_server(args.app, host, port, workers)
+        try:
+            per_workers: List[LevelResult] = []
+            for conc in _ints(args.concurrency):
+                res = asyncio.run(run_level(
+                    host, port, specs, workers=workers, concurrency=conc,
+                    duration_s=args.duration, warmup_s=args.warmup, timeout_s=args.timeout,
+                ))
+                per_workers.append(res)
+                print(
+                    f"workers={workers} conc={conc}: {res.rps:.1f} rps, p99 {res.p99_ms:.1f} ms, "
+                    f"errors {res.error_rate * 100:.2f}%",
+                    file=sys.stderr,
+                )
+            levels.extend(per_workers)
+            knees[workers] = find_knee(per_workers, args.knee_gain)
+        finally:
+            if proc is not None:
+                stop_server(proc)
+
+    print(format_report(levels, knees))
+    if args.json:
+        args.json.write_text(json.dumps({
+            "levels": [asdict(lv) for lv in levels],
+            "knees": {str(w): (asdict(k) if k else None) for w, k in knees.items()},
+        }, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
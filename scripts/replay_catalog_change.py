@@ -0,0 +1,86 @@
+"""
+Replay сохранённых входов оценки на старой и новой версии справочников.
+
+    python -m scripts.replay_catalog_change corpus.ndjson [more.ndjson ...] \
+        --old git:HEAD [--new data/catalogs] [--workers N] [--flips-out flips.ndjson]
+
+--old/--new — каталог с r_codes_wa.csv / cost_catalog_wa.csv /
+wa_stamp_duty_brackets.csv либо git:<rev> (те же файлы data/catalogs из ревизии,
+например git:HEAD — до незакоммиченной правки). Итог — JSON в stdout:
+распределение Δprofit/Δmargin лучшего сценария и входы, у которых сменился
+best_scenario_code или lot_yield_estimate (все — в --flips-out); входы
+обозначены «файл:строка».
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from domain.services.catalogs.service import SOURCE_FILES, catalogs_dir
+from domain.services.replay.service import iter_corpus, replay
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _materialize(spec: str, tmp: Path) -> Path:
+    """'git:<rev>' → временный каталог с CSV из ревизии; иначе — путь как есть."""
+    if not spec.startswith("git:"):
+        path = Path(spec)
+        if not path.is_dir():
+            raise SystemExit(f"Not a catalogs directory: {path}")
+        return path
+    rev = spec[len("git:"):]
+    # путь в репозитории фиксированный: $SUBDIV_CATALOGS_DIR может указывать вне его
+    rel = Path("data") / "catalogs"
+    dest = tmp / rev.replace("/", "_")
+    dest.mkdir(parents=True, exist_ok=True)
+    for name in SOURCE_FILES:
+        res = subprocess.run(
+            ["git", "-C", str(ROOT), "show", f"{rev}:{(rel / name).as_posix()}"],
+            capture_output=True,
+        )
+        if res.returncode != 0:
+            raise SystemExit(f"git show {rev}:{rel / name} failed: {res.stderr.decode().strip()}")
+        (dest / name).write_bytes(res.stdout)
+    return dest
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("corpus", nargs="+", type=Path, help="NDJSON входов EvaluateRequest")
+    ap.add_argument("--old", required=True, help="каталог справочников или git:<rev>")
+    ap.add_argument("--new", default=None, help="то же; по умолчанию текущий data/catalogs")
+    ap.add_argument("--workers", type=int, default=None, help="процессов (по умолчанию все ядра)")
+    ap.add_argument("--chunk-size", type=int, default=1000)
+    ap.add_argument("--flips-out", type=Path, default=None, help="NDJSON со всеми флипами")
+    ap.add_argument("--show-flips", type=int, default=20, help="сколько флипов вывести в отчёт")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="catalogs-replay-") as tmp:
+        old = _materialize(args.old, Path(tmp))
+        new = _materialize(args.new, Path(tmp)) if args.new else catalogs_dir()
+        report = replay(
+            iter_corpus(args.corpus), old, new,
+            workers=args.workers, chunk_size=args.chunk_size,
+        )
+
+    if args.flips_out is not None:
+        with args.flips_out.open("w", encoding="utf-8") as f:
+            for row in report.to_dict()["flips"]:
+                f.write(json.dumps(row) + "\n")
+    print(json.dumps(report.to_dict(max_flips=args.show_flips), indent=2))
+    print(
+        f"{report.inputs} inputs in {report.elapsed_s:.1f}s "
+        f"({report.throughput:,.0f}/s, {report.workers} workers): "
+        f"{report.profit.changed} profit changes, {report.best_flips} best-scenario flips, "
+        f"{report.lot_flips} lot-yield flips, {report.errors} errors",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Обучает модель ARV нового дома по продажам-компам и пишет артефакт коэффициентов.
+
+    python -m scripts.train_arv_model [--comps data/comps/newbuild_sales_wa_sample.csv]
+                                      [--out data/models/arv_v1.json] [--ridge 2.0]
+
+Сервис подхватывает артефакт при старте процесса ($SUBDIV_ARV_MODEL — другой путь).
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from domain.services.arv.service import ArvModel
+from domain.services.arv.training import fit_arv, load_comps, write_artifact
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument(
+        "--comps", type=Path, default=ROOT / "data" / "comps" / "newbuild_sales_wa_sample.csv"
+    )
+    ap.add_argument("--out", type=Path, default=ROOT / "data" / "models" / "arv_v1.json")
+    ap.add_argument("--ridge", type=float, default=2.0, help="штраф на эффекты пригородов")
+    args = ap.parse_args()
+
+    sales = load_comps(args.comps)
+    artifact = fit_arv(sales, ridge=args.ridge, source=args.comps.name)
+    write_artifact(artifact, args.out)
+
+    model = ArvModel(artifact)
+    print(f"{artifact['version']}: {len(sales)} sales, {len(artifact['suburbs'])} suburbs, "
+          f"residual std {artifact['residual_std']:.3f} (log) → {args.out}")
+    for sub, info in sorted(artifact["suburbs"].items()):
+        (est,) = model.predict_batch([sub], [200.0])
+        print(f"  {sub:<12} n={info['n']:>3}  ARV@200sqm {est.value:>11,.0f}  "
+              f"±{est.spread_pct:.0f}%  {est.confidence}")
+
+
+if __name__ == "__main__":
+    main()
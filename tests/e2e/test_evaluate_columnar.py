@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from apps.api.main import app
+from apps.api.columnar import MEDIA_TYPE, decode_evaluations, negotiate
+
+pytest.importorskip("msgpack")
+
+client = TestClient(app)
+
+SAMPLES = Path(__file__).resolve().parents[2] / "data" / "samples"
+
+
+def _payloads():
+    items = [json.loads(p.read_text(encoding="utf-8")) for p in sorted(SAMPLES.glob("*.json"))]
+    # + кейс без делимости (frontage < R20) и без фронтажа — пустые/разные списки advice
+    items.append({
+        "prop": {"land_area_sqm": 760, "purchase_price": 600000, "frontage_m": 8.0, "r_code": "R20"},
+        "asm": {},
+        "market": {"land_price_per_sqm_small_lot": 1500},
+    })
+    items.append({
+        "prop": {"land_area_sqm": 500, "purchase_price": 550000},
+        "asm": {},
+        "market": {"land_price_per_sqm_small_lot": 1500},
+    })
+    return items
+
+
+def test_negotiate():
+    assert negotiate(None) == "application/json"
+    assert negotiate("application/json") == "application/json"
+    assert negotiate("application/x-msgpack") == MEDIA_TYPE
+    assert negotiate("application/json;q=0.5, application/x-msgpack") == MEDIA_TYPE
+    assert negotiate("application/x-msgpack;q=0.2, */*") == "application/json"
+
+
+def test_evaluate_columnar_roundtrip_matches_json():
+    payload = _payloads()[0]
+    as_json = client.post("/evaluate", json=payload)
+    as_cols = client.post("/evaluate", json=payload, headers={"Accept": MEDIA_TYPE})
+    assert as_cols.status_code == 200
+    assert as_cols.headers["content-type"].startswith(MEDIA_TYPE)
+    assert decode_evaluations(as_cols.content) == [as_json.json()]
+
+
+def test_batch_columnar_roundtrip_matches_json():
+    body = {"items": _payloads()}
+    as_json = client.post("/evaluate/batch", json=body)
+    as_cols = client.post("/evaluate/batch", json=body, headers={"Accept": MEDIA_TYPE})
+    assert as_json.status_code == 200 and as_cols.status_code == 200
+
+    rows = as_json.json()["results"]
+    assert len(rows) == len(body["items"])
+    assert decode_evaluations(as_cols.content) == rows
@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+import apps.api.routes.evaluate as evaluate_route
+from apps.api.columnar import MEDIA_TYPE, decode_evaluations
+from apps.api.main import app
+from apps.api.overload import DegradeSettings, monitor
+
+client = TestClient(app)
+
+PAYLOAD = {
+    "prop": {"land_area_sqm": 760, "purchase_price": 680000, "frontage_m": 12.5, "r_code": "R20"},
+    "asm": {},
+    "market": {"land_price_per_sqm_small_lot": 1600},
+    "verbosity": "full",
+}
+
+
+@pytest.fixture
+def load_settings():
+    saved = monitor.settings
+    yield monitor.configure
+    monitor.configure(saved)
+
+
+def test_forced_degraded_skips_optional_work(load_settings):
+    full = client.post("/evaluate", json=PAYLOAD)
+    load_settings(DegradeSettings(mode="force"))
+    r = client.post("/evaluate", json=PAYLOAD)
+    assert r.status_code == 200
+    assert r.headers["x-degraded"] == "1"
+
+    data = r.json()
+    assert data["degraded"] is True and full.json()["degraded"] is False
+    assert data["sensitivity"] is None
+    assert data["notes"] == []
+    assert "demo_rebuild_and_sell" not in data["scenario_order"]
+    assert all(s["notes"] == [] for s in data["scenarios"])
+    assert all(a["message"] is None for a in data["advice"])
+    # цифры A/B — те же, что в полном ответе
+    by_code = {s["scenario"]: s["profit"] for s in full.json()["scenarios"]}
+    assert all(by_code[s["scenario"]] == s["profit"] for s in data["scenarios"])
+
+
+def test_queue_depth_threshold_degrades_batch(load_settings):
+    # порог 0 запросов в обработке: любой запрос — уже «очередь»
+    load_settings(DegradeSettings(max_inflight=0, max_latency_ms=10_000))
+    body = {"items": [PAYLOAD, {**PAYLOAD, "locale": "ru"}]}
+    r = client.post("/evaluate/batch", json=body, headers={"Accept": MEDIA_TYPE})
+    assert r.status_code == 200
+    rows = decode_evaluations(r.content)
+    assert [row["degraded"] for row in rows] == [True, True]
+
+    health = client.get("/health").json()["load"]
+    assert health["degraded"] is True
+    assert health["degraded_admitted"] == 1
+
+
+def test_off_mode_never_degrades(load_settings):
+    load_settings(DegradeSettings(mode="off", max_inflight=0))
+    r = client.post("/evaluate", json=PAYLOAD)
+    assert r.json()["degraded"] is False
+    assert "x-degraded" not in r.headers
+
+
+def test_degraded_cache_is_keyed_on_catalog_version(load_settings, monkeypatch):
+    load_settings(DegradeSettings(mode="force"))
+    body = {**PAYLOAD, "prop": {**PAYLOAD["prop"], "purchase_price": 655_000}}
+    calls = []
+    real = evaluate_route.evaluate
+
+    def counting(req, **kw):
+        calls.append(1)
+        return real(req, **kw)
+
+    monkeypatch.setattr(evaluate_route, "evaluate", counting)
+    client.post("/evaluate", json=body)
+    client.post("/evaluate", json=body)
+    assert len(calls) == 1
+    # новый снапшот справочников — закэшированный ответ больше не подходит
+    monkeypatch.setattr(evaluate_route, "get_catalogs", lambda: SimpleNamespace(version="v-next"))
+    client.post("/evaluate", json=body)
+    assert len(calls) == 2
@@ -22,8 +22,8 @@ def test_evaluate_happy_path():
     assert data["lot_yield_estimate"] == 2
     assert abs(data["price_per_sqm"] - (680000/760)) < 1e-6
 
-    scen = data["scenarios"][0]
-    assert scen["scenario"] == "subdivide_sell_lots"
+    # без house_arv сценарий C считается по оценке ARV — A ищем по коду
+    scen = next(s for s in data["scenarios"] if s["scenario"] == "subdivide_sell_lots")
     assert scen["lots"] == 2
     assert scen["revenue"] == 1120000
     # total_cost включает purchase + проектные (без holding)
@@ -0,0 +1,60 @@
+import base64
+from array import array
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from apps.api.main import app
+import apps.api.routes.whatif as whatif_route
+
+client = TestClient(app)
+
+BASE = {
+    "prop": {"address": "X", "land_area_sqm": 760, "purchase_price": 680000, "frontage_m": 12.5, "r_code": "R20"},
+    "asm": {},
+    "market": {"land_price_per_sqm_small_lot": 1600},
+}
+
+
+def test_grid_payload_shape_and_cache():
+    payload = {"base": BASE, "annual_interest_rate": {"min": 0.05, "max": 0.09, "steps": 5}}
+    r = client.post("/evaluate/grid", json=payload)
+    assert r.status_code == 200
+    data = r.json()
+
+    assert data["lots"] == 2
+    # house_arv не передан — C по оценке модели ARV, как в /evaluate
+    assert data["scenarios"] == [
+        "subdivide_sell_lots", "retain_and_subdivide", "demo_rebuild_and_sell",
+    ]
+    assert [a["name"] for a in data["axes"]] == [
+        "land_psqm", "purchase_price", "annual_interest_rate", "subdiv_months",
+    ]
+    assert data["axes"][2]["values"] == [0.05, 0.06, 0.07, 0.08, 0.09]
+
+    values = array("f")
+    values.frombytes(base64.b64decode(data["data"]))
+    n = 1
+    for d in data["shape"]:
+        n *= d
+    assert len(values) == n
+
+    # повторный запрос — тот же digest (ключ кэша)
+    r2 = client.post("/evaluate/grid", json=payload)
+    assert r2.json()["digest"] == data["digest"]
+
+
+def test_grid_cache_key_follows_catalog_version(monkeypatch):
+    payload = {"base": BASE, "subdiv_months": {"min": 3, "max": 9, "steps": 3}}
+    before = client.post("/evaluate/grid", json=payload).json()["digest"]
+
+    # новый снапшот справочников — другая версия
+    monkeypatch.setattr(whatif_route, "get_catalogs", lambda: SimpleNamespace(version="v-next"))
+    after = client.post("/evaluate/grid", json=payload).json()["digest"]
+    assert after != before
+
+
+def test_grid_too_large_rejected():
+    big = {"min": 1, "max": 2, "steps": 33}
+    payload = {"base": BASE, "land_psqm": big, "purchase_price": big, "annual_interest_rate": big, "subdiv_months": big}
+    r = client.post("/evaluate/grid", json=payload)
+    assert r.status_code == 422
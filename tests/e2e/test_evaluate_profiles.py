@@ -0,0 +1,33 @@
+from fastapi.testclient import TestClient
+
+from apps.api.main import app
+
+client = TestClient(app)
+
+PROP = {"land_area_sqm": 728, "frontage_m": 18.0, "r_code": "R30", "purchase_price": 640_000}
+
+
+def test_profile_reference_matches_inline_body():
+    inline = client.post("/evaluate", json={
+        "prop": PROP,
+        "asm": {"annual_interest_rate": 0.065},
+        "market": {"land_price_per_sqm_small_lot": 1750, "house_arv": 920_000},
+    })
+    by_ref = client.post("/evaluate", json={
+        "prop": PROP,
+        "asm_profile": "default",
+        "asm_overrides": {"annual_interest_rate": 0.065},
+        "market_profile": "balga@1",
+    })
+    assert inline.status_code == by_ref.status_code == 200
+    assert inline.json() == by_ref.json()
+
+
+def test_profiles_listing_and_unknown_profile():
+    data = client.get("/profiles").json()
+    assert {"default@1", "conservative@1"} <= {p["ref"] for p in data["asm"]}
+    assert "balga@1" in {p["ref"] for p in data["market"]}
+
+    body = {"prop": PROP, "asm_profile": "nope", "market_profile": "balga"}
+    r = client.post("/evaluate", json=body)
+    assert r.status_code == 422
@@ -0,0 +1,36 @@
+import os
+import random
+import time
+
+from domain.services.ranking.service import DealQuery, DealStore
+
+# ~1 млн строк (объект × сценарий); бюджет с запасом под CI, переопределяется через env
+ROWS = int(os.getenv("RANKING_ROWS", "1000000"))
+TOP_K_BUDGET_S = float(os.getenv("RANKING_TOP_K_BUDGET_S", "1.5"))
+
+SUBURBS = [f"S{i:03d}" for i in range(200)]
+CODES = ["subdivide_sell_lots", "retain_and_subdivide", "build_and_sell"]
+
+
+def test_top_k_over_million_rows_within_budget():
+    rnd = random.Random(1)
+    store = DealStore()
+    for i in range(ROWS // len(CODES)):
+        rows = [
+            (code, rnd.randint(0, 4), rnd.uniform(-1e5, 4e5),
+             rnd.uniform(-0.2, 0.6), rnd.uniform(-0.2, 0.6))
+            for code in CODES
+        ]
+        store.add_rows(f"p{i}", rnd.choice(SUBURBS), rows)
+
+    queries = [
+        DealQuery(suburbs=SUBURBS[:20], min_lots=2, min_profit=50_000, limit=200),
+        DealQuery(min_lots=2, min_profit=50_000, limit=200),
+    ]
+    for q in queries:
+        t0 = time.perf_counter()
+        top = store.top(q)
+        elapsed = time.perf_counter() - t0
+        assert len(top) == 200
+        assert all(d.lots >= 2 and d.profit >= 50_000 for d in top)
+        assert elapsed < TOP_K_BUDGET_S, f"top-K took {elapsed:.3f}s > {TOP_K_BUDGET_S}s"
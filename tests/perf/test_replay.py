@@ -0,0 +1,40 @@
+import os
+import random
+import time
+
+import orjson
+
+from domain.services.catalogs.service import catalogs_dir, load_from_csv
+from domain.services.replay.service import number_lines, replay_chunk
+
+# пропускная способность одного ядра: 1 млн входов за минуты = N ядер × этот темп;
+# бюджет с запасом под CI, переопределяется через env
+INPUTS = int(os.getenv("REPLAY_INPUTS", "5000"))
+MIN_PER_CORE_RPS = float(os.getenv("REPLAY_MIN_PER_CORE_RPS", "1000"))
+
+
+def test_replay_throughput_per_core():
+    rnd = random.Random(7)
+    lines = [
+        orjson.dumps({
+            "property_id": f"p{i}",
+            "request": {
+                "prop": {
+                    "land_area_sqm": rnd.randint(450, 1200),
+                    "purchase_price": rnd.randint(450_000, 900_000),
+                    "r_code": rnd.choice(["R20", "R25", "R30"]),
+                    "suburb": rnd.choice(["BALGA", "THORNLIE", "MORLEY", None]),
+                },
+                "asm": {},
+                "market": {"land_price_per_sqm_small_lot": rnd.randint(1200, 2000)},
+            },
+        })
+        for i in range(INPUTS)
+    ]
+    cats = load_from_csv(catalogs_dir())
+
+    t0 = time.perf_counter()
+    res = replay_chunk(list(number_lines(lines)), cats, cats)
+    rate = INPUTS / (time.perf_counter() - t0)
+    assert res.evaluated == INPUTS and res.errors == 0
+    assert rate >= MIN_PER_CORE_RPS, f"replay {rate:.0f} inputs/s < {MIN_PER_CORE_RPS}"
@@ -0,0 +1,48 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Бюджеты с запасом под CI; переопределяются через env
+IMPORT_BUDGET_S = float(os.getenv("STARTUP_IMPORT_BUDGET_S", "3.0"))
+FIRST_REQUEST_BUDGET_S = float(os.getenv("STARTUP_FIRST_REQUEST_BUDGET_S", "1.0"))
+
+# Опциональные подсистемы не должны грузиться при импорте приложения
+LAZY_MODULES = ["msgpack", "domain.services.scenarios.grid", "domain.services.profiles.service"]
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+from apps.api.main import app
+t_import = time.perf_counter() - t0
+loaded = [m for m in %r if m in sys.modules]
+
+from fastapi.testclient import TestClient
+client = TestClient(app)
+payload = json.loads(%r)
+t1 = time.perf_counter()
+r = client.post("/evaluate", json=payload)
+t_first = time.perf_counter() - t1
+print(json.dumps({"import_s": t_import, "first_request_s": t_first, "status": r.status_code, "loaded": loaded}))
+"""
+
+
+def test_cold_start_within_budget():
+    payload = (ROOT / "data" / "samples" / "thornlie_case01.json").read_text(encoding="utf-8")
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE % (LAZY_MODULES, payload)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr
+    res = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    assert res["status"] == 200
+    assert res["loaded"] == [], f"eagerly imported: {res['loaded']}"
+    assert res["import_s"] < IMPORT_BUDGET_S, res
+    assert res["first_request_s"] < FIRST_REQUEST_BUDGET_S, res
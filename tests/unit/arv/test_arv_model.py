@@ -0,0 +1,65 @@
+from pathlib import Path
+
+from domain.models.evaluate import Assumptions, EvaluateRequest, MarketBenchmarks, PropertyInput
+from domain.services.arv.service import ArvModel, get_arv_model
+from domain.services.arv.training import fit_arv, load_comps
+from domain.services.evaluation.service import evaluate, evaluate_many
+
+ROOT = Path(__file__).resolve().parents[3]
+COMPS = ROOT / "data" / "comps" / "newbuild_sales_wa_sample.csv"
+
+
+def _req(suburb, house_arv=None, land_area_sqm=728) -> EvaluateRequest:
+    return EvaluateRequest(
+        prop=PropertyInput(
+            suburb=suburb, land_area_sqm=land_area_sqm, frontage_m=18, r_code="R30",
+            purchase_price=640_000,
+        ),
+        asm=Assumptions(),
+        market=MarketBenchmarks(land_price_per_sqm_small_lot=1750, house_arv=house_arv),
+    )
+
+
+def test_fit_recovers_elasticities_and_batch_matches_single():
+    artifact = fit_arv(load_comps(COMPS))
+    assert 0.15 < artifact["coef"]["log_lot"] < 0.30
+    assert 0.45 < artifact["coef"]["log_build"] < 0.65
+    assert artifact["residual_std"] < 0.08
+
+    model = ArvModel(artifact)
+    subs = ["MORLEY", "GOSNELLS", "kelmscott", None]
+    batch = model.predict_batch(subs, [200.0] * 4)
+    assert batch == [model.predict_batch([s], [200.0])[0] for s in subs]
+    morley, gosnells, kelmscott, unknown = batch
+    assert morley.value > gosnells.value
+    assert morley.low < morley.value < morley.high
+    assert morley.confidence == "high" and kelmscott.confidence == "low"
+    assert unknown.suburb is None and unknown.spread_pct > morley.spread_pct
+
+
+def test_shipped_artifact_fills_missing_arv_for_scenario_c():
+    assert get_arv_model() is not None
+
+    res = evaluate(_req("Balga"))
+    assert "demo_rebuild_and_sell" in res.scenario_order
+    (adv,) = [a for a in res.advice if a.code.startswith("ARV_")]
+    assert adv.code == "ARV_ESTIMATED" and adv.severity == "low"
+    assert "BALGA" in adv.message
+
+    given = evaluate(_req("Balga", house_arv=900_000))
+    assert not [a for a in given.advice if a.code.startswith("ARV_")]
+
+    batch = evaluate_many([_req("Balga"), _req("Nowhere"), _req("Balga", 900_000)])
+    assert batch[0] == res and batch[2] == given
+    assert [a.code for a in batch[1].advice] == ["ARV_ESTIMATED_NO_SUBURB"]
+
+
+def test_arv_advice_only_when_scenario_c_uses_the_estimate():
+    # участок меньше минимального лота — сценарий C не строится
+    no_yield = evaluate(_req("Balga", land_area_sqm=150))
+    assert no_yield.lot_yield_estimate == 0
+    assert "demo_rebuild_and_sell" not in no_yield.scenario_order
+    assert not [a for a in no_yield.advice if a.code.startswith("ARV_")]
+
+    degraded = evaluate(_req("Balga"), degraded=True)
+    assert not [a for a in degraded.advice if a.code.startswith("ARV_")]
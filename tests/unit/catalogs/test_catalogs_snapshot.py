@@ -0,0 +1,97 @@
+import shutil
+from pathlib import Path
+
+from domain.services.catalogs.service import get_catalogs, load_from_csv, reload_catalogs
+from domain.services.catalogs.snapshot import (
+    POINTER_FILE,
+    MappedCatalogs,
+    SnapshotWatcher,
+    build_snapshot,
+)
+from domain.services.finance.duty import calc_wa_stamp_duty
+
+FIXTURES = Path(__file__).resolve().parents[2] / "fixtures" / "catalogs"
+
+
+def _catalog_dir(tmp_path: Path) -> Path:
+    root = tmp_path / "catalogs"
+    root.mkdir()
+    for p in FIXTURES.glob("*.csv"):
+        shutil.copy(p, root / p.name)
+    (root / "wa_stamp_duty_brackets.csv").write_text(
+        "lower_bound,rate,fixed\n0,0.0,0\n100000,0.02,0\n500000,0.05,8000\n", encoding="utf-8"
+    )
+    return root
+
+
+def _append_row(path: Path, row: str) -> None:
+    path.write_text(path.read_text(encoding="utf-8") + row + "\n", encoding="utf-8")
+
+
+def test_snapshot_reads_same_as_csv(tmp_path):
+    root = _catalog_dir(tmp_path)
+    from_csv = load_from_csv(root)
+    snap = MappedCatalogs(build_snapshot(root, tmp_path / "snap"))
+
+    assert snap.version == "v1"
+    for code in from_csv.r_codes:
+        assert snap.r_code(code) == from_csv.r_code(code)
+    for code in from_csv.costs:
+        assert snap.cost_item(code) == from_csv.cost_item(code)
+    assert snap.r_code("R99") is None and snap.cost_item("NOPE") is None
+    assert list(snap.duty_brackets) == from_csv.duty_brackets
+    duty = calc_wa_stamp_duty(600_000, from_csv.duty_brackets)
+    assert calc_wa_stamp_duty(600_000, snap.duty_brackets) == duty
+    assert snap.to_catalogs().r_codes == from_csv.r_codes
+
+
+def test_watcher_switches_to_new_version(tmp_path):
+    root = _catalog_dir(tmp_path)
+    out = tmp_path / "snap"
+    watcher = SnapshotWatcher(out, check_interval_s=0.0)
+    assert watcher.current() is None  # снапшотов ещё нет → CSV
+
+    build_snapshot(root, out)
+    assert watcher.current().version == "v1"
+
+    csv_path = root / "r_codes_wa.csv"
+    _append_row(csv_path, "R40,*,220,250,7,Base R40,2025-01-01,")
+    build_snapshot(root, out)
+    cur = watcher.current()
+    assert cur.version == "v2"
+    assert cur.r_code("R40")["min_lot_sqm"] == 220
+    assert (out / POINTER_FILE).read_text() == "catalogs-v000002.bin"
+
+
+def test_stale_snapshot_ignored(tmp_path, monkeypatch):
+    root = _catalog_dir(tmp_path)
+    out = tmp_path / "snap"
+    build_snapshot(root, out)
+    watcher = SnapshotWatcher(out, check_interval_s=0.0, sources=root)
+    assert watcher.current().version == "v1"
+
+    # CSV поправили, снапшот не пересобрали → читаем CSV
+    csv_path = root / "r_codes_wa.csv"
+    _append_row(csv_path, "R40,*,220,250,7,Base R40,2025-01-01,")
+    assert watcher.current() is None
+    assert watcher.stale_sources is not None
+
+    monkeypatch.setenv("SUBDIV_CATALOGS_DIR", str(root))
+    monkeypatch.setenv("SUBDIV_CATALOG_SNAPSHOT_DIR", str(out))
+    monkeypatch.setenv("SUBDIV_CATALOG_SNAPSHOT_CHECK_S", "0")
+    try:
+        cats = reload_catalogs()
+        assert cats.version.startswith("csv-") and cats.r_code("R40")["min_lot_sqm"] == 220
+        # следующая правка, пока снапшот устаревший, тоже видна — под новой версией
+        _append_row(csv_path, "R60,*,180,200,6,R60,2025-01-01,")
+        assert get_catalogs().r_code("R60")["min_lot_sqm"] == 180
+        assert get_catalogs().version not in ("csv", "v1", cats.version)
+
+        # пересобрали — снова снапшот, уже с правкой
+        build_snapshot(root, out)
+        assert watcher.current().version == "v2"
+        cats = get_catalogs()
+        assert cats.version == "v2" and cats.r_code("R40")["min_lot_sqm"] == 220
+    finally:
+        monkeypatch.undo()
+        reload_catalogs()
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+import apps.api.routes.evaluate as evaluate_route
+from apps.api.cache import SingleFlight
+from apps.api.main import app
+
+
+def _gated(gate: asyncio.Event, calls: list, result=None, exc=None):
+    async def fn():
+        calls.append(1)
+        await gate.wait()
+        if exc is not None:
+            raise exc
+        return result
+    return fn
+
+
+def test_identical_concurrent_calls_share_one_execution():
+    async def run():
+        sf = SingleFlight()
+        gate, calls = asyncio.Event(), []
+        fn = _gated(gate, calls, result={"v": 1})
+        tasks = [asyncio.create_task(sf.do("k", fn)) for _ in range(5)]
+        other = asyncio.create_task(sf.do("other", _gated(gate, calls, result="x")))
+        await asyncio.sleep(0)
+        assert len(sf) == 2
+        gate.set()
+        results = await asyncio.gather(*tasks)
+        assert await other == "x"
+        assert all(r is results[0] for r in results)
+        return sf, calls
+
+    sf, calls = asyncio.run(run())
+    assert len(calls) == 2
+    assert sf.stats() == {"in_flight": 0, "executions": 2, "coalesced": 4, "failures": 0}
+
+
+def test_error_reaches_all_waiters_and_is_not_cached():
+    async def run():
+        sf = SingleFlight()
+        gate, calls = asyncio.Event(), []
+        fn = _gated(gate, calls, exc=RuntimeError("boom"))
+        tasks = [asyncio.create_task(sf.do("k", fn)) for _ in range(3)]
+        await asyncio.sleep(0)
+        gate.set()
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(isinstance(o, RuntimeError) for o in outcomes)
+        # ключ снят — следующий вызов считает заново
+        assert await sf.do("k", _gated(gate, calls, result=7)) == 7
+        return sf, calls
+
+    sf, calls = asyncio.run(run())
+    assert len(calls) == 2
+    assert sf.failures == 1 and sf.coalesced == 2
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    async def run():
+        sf = SingleFlight()
+        gate, calls = asyncio.Event(), []
+        fn = _gated(gate, calls, result="ok")
+        leader = asyncio.create_task(sf.do("k", fn))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(sf.do("k", fn))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        gate.set()
+        assert await follower == "ok"
+        assert len(sf) == 0
+        return calls
+
+    assert len(asyncio.run(run())) == 1
+
+
+def test_evaluate_route_coalesces_identical_requests(monkeypatch):
+    release = threading.Event()
+    calls = []
+    real = evaluate_route.evaluate
+
+    def slow_evaluate(req, **kw):
+        calls.append(req.prop.purchase_price)
+        release.wait(5)
+        return real(req, **kw)
+
+    monkeypatch.setattr(evaluate_route, "evaluate", slow_evaluate)
+    body = {
+        "prop": {"land_area_sqm": 760, "purchase_price": 680000, "r_code": "R20"},
+        "asm": {},
+        "market": {"land_price_per_sqm_small_lot": 1600},
+    }
+    other = {**body, "prop": {**body["prop"], "purchase_price": 650000}}
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            before = evaluate_route.inflight.stats()
+            tasks = [
+                asyncio.create_task(client.post("/evaluate", json=b))
+                for b in (body, body, other, body)
+            ]
+            for _ in range(500):
+                waiting = evaluate_route.inflight.coalesced - before["coalesced"]
+                if len(calls) == 2 and waiting == 2:
+                    break
+                await asyncio.sleep(0.01)
+            release.set()
+            responses = await asyncio.gather(*tasks)
+            return before, evaluate_route.inflight.stats(), responses
+
+    before, after, responses = asyncio.run(run())
+    assert [r.status_code for r in responses] == [200] * 4
+    assert responses[0].json() == responses[1].json() == responses[3].json()
+    assert sorted(calls) == [650000, 680000]
+    assert after["executions"] - before["executions"] == 2
+    assert after["coalesced"] - before["coalesced"] == 2
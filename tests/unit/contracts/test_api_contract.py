@@ -0,0 +1,32 @@
+from pathlib import Path
+
+import pytest
+import yaml
+from pydantic import BaseModel
+
+import domain.models.evaluate as models
+
+ROOT = Path(__file__).resolve().parents[3]
+CONTRACT = ROOT / "contracts" / "api" / "evaluate.v1.yaml"
+
+
+def _schemas():
+    spec = yaml.safe_load(CONTRACT.read_text(encoding="utf-8"))
+    return spec["components"]["schemas"]
+
+
+def test_app_openapi_copy_matches_contract():
+    # источник правды — contracts/api; apps/api/openapi — точная копия
+    for name in ("evaluate.v1.yaml", "health.v1.yaml"):
+        copy = ROOT / "apps" / "api" / "openapi" / name
+        assert copy.read_bytes() == (ROOT / "contracts" / "api" / name).read_bytes(), name
+
+
+@pytest.mark.parametrize("name", [
+    name for name, schema in _schemas().items()
+    if "properties" in schema and isinstance(getattr(models, name, None), type)
+    and issubclass(getattr(models, name), BaseModel)
+])
+def test_contract_schema_fields_match_model(name):
+    schema = _schemas()[name]
+    assert set(schema["properties"]) == set(getattr(models, name).model_fields)
@@ -13,4 +13,9 @@ def test_calc_duty_with_custom_brackets():
     assert abs(calc_wa_stamp_duty(250,  br) - (30 + (250-200)*0.30)) < 1e-6   # 45
     assert abs(calc_wa_stamp_duty(200,  br) - 30.0) < 1e-6
     assert abs(calc_wa_stamp_duty(0,    br) - 0.0) < 1e-6
-    assert abs(calc_wa_stamp_duty(-10,  br) - 0.0) < 1e-6
\ No newline at end of file
+    assert abs(calc_wa_stamp_duty(-10,  br) - 0.0) < 1e-6
+
+def test_calc_duty_accepts_generator_brackets():
+    br = [(0.0, 0.10, 0.0), (100.0, 0.20, 10.0)]
+    assert abs(calc_wa_stamp_duty(150, (b for b in br)) - 20.0) < 1e-6
+    assert calc_wa_stamp_duty(150, iter(())) == 0.0
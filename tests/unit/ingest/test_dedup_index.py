@@ -0,0 +1,26 @@
+from domain.services.ingest.dedup import HashIndex, hash64, normalize_address
+
+
+def test_normalize_address_variants_share_key():
+    a = normalize_address("45 Example Road, Balga WA 6061")
+    b = normalize_address("45 example rd", "BALGA")
+    c = normalize_address("45  Example Rd.,  Balga", "balga")
+    assert a == b == c == "45 example rd balga"
+    assert hash64(a) == hash64(b)
+    assert normalize_address("46 Example Rd", "Balga") != a
+
+
+def test_hash_index_put_get_and_grow():
+    idx = HashIndex(capacity=8)
+    keys = [hash64(f"addr {i}") for i in range(5000)]
+    for i, k in enumerate(keys):
+        assert idx.put(k, i) is None
+    assert len(idx) == 5000
+    assert idx.capacity >= 5000 / 0.7
+    assert all(idx.get(k) == i for i, k in enumerate(keys))
+    assert idx.put(keys[10], 99) == 10
+    assert idx.get(keys[10]) == 99
+    assert len(idx) == 5000
+    assert hash64("missing") not in idx
+    # 16 байт на слот, без объектов на ключ
+    assert idx.nbytes == 16 * idx.capacity
@@ -0,0 +1,151 @@
+import json
+
+import pytest
+
+from adapters.external.listing_feeds import LocalQueueFeed, iter_ndjson
+from domain.models.evaluate import MarketBenchmarks
+from domain.services.evaluation.service import evaluate_many
+from domain.services.ingest.service import ListingIngester
+
+MARKET = MarketBenchmarks(land_price_per_sqm_small_lot=1600)
+
+
+def _event(
+    n: int, address: str, price: float = 600_000, suburb: str = "BALGA", property_id: str = ""
+) -> dict:
+    return {
+        "event_id": f"e{n}",
+        "event_type": "ListingCreated",
+        "version": 1,
+        "occurred_at": "2025-01-01T00:00:00Z",
+        "payload": {
+            "listing_id": f"l{n}", "property_id": property_id or f"p{n}", "address": address,
+            "suburb_code": suburb, "land_area_sqm": 728, "frontage_m": 18.0,
+            "asking_price": price, "source": "test",
+        },
+    }
+
+
+def _ingester(batch_size: int = 3):
+    batches = []
+    ing = ListingIngester(
+        lambda suburb: MARKET if suburb == "BALGA" else None,
+        batches.append,
+        batch_size=batch_size,
+        max_wait_s=60,
+    )
+    return ing, batches
+
+
+def test_dedup_relist_and_micro_batches():
+    ing, batches = _ingester()
+    events = [
+        _event(1, "1 Alpha Street"),
+        _event(2, "1 alpha st, Balga WA", property_id="p1"),  # дубль под другим listing_id
+        _event(3, "2 Beta Road"),
+        _event(4, "2 Beta Rd", price=550_000, property_id="p3"),  # переоценка: новая цена
+        _event(5, "3 Gamma Way", suburb="NOWHERE"),  # нет бенчмарков
+        {"event_type": "ListingCreated"},           # невалидное
+        _event(6, "4 Delta Pl"),
+    ]
+    stats = ing.run(events)
+    assert [len(b) for b in batches] == [3, 1]
+    assert [listing.listing_id for b in batches for listing, _ in b] == ["l1", "l3", "l4", "l6"]
+    assert (stats.received, stats.new, stats.changed, stats.duplicates) == (7, 3, 1, 1)
+    assert (stats.no_market, stats.invalid, stats.evaluated, stats.batches) == (1, 1, 4, 2)
+    assert stats.max_lag_s > 0
+    snap = stats.snapshot()
+    assert snap["evaluated_per_s"] > 0 and snap["pending"] == 0
+
+
+def test_sources_feed_ingester(tmp_path):
+    feed = tmp_path / "feed.ndjson"
+    lines = [json.dumps(_event(i, f"{i} Alpha St")) for i in range(5)]
+    feed.write_text("\n".join(lines[:4]) + "\n\nnot json\n" + lines[4], encoding="utf-8")
+    ing, batches = _ingester(batch_size=10)
+    stats = ing.run(iter_ndjson([feed]))
+    assert (stats.received, stats.invalid, stats.evaluated) == (6, 1, 5)
+
+    q = LocalQueueFeed(idle_s=0.01)
+    for i in range(3):
+        q.put(_event(i, f"{i} Alpha St"))
+    q.close()
+    ing2, _ = _ingester(batch_size=10)
+    assert ing2.run(q).new == 3
+
+
+def test_failed_evaluation_is_retried_on_redelivery():
+    results = []
+    calls = []
+
+    def flaky(reqs):
+        calls.append(len(reqs))
+        if len(calls) == 1:
+            raise RuntimeError("transient")
+        return evaluate_many(reqs)
+
+    ing = ListingIngester(
+        lambda suburb: MARKET, results.append, batch_size=1, evaluate_many_fn=flaky
+    )
+    ing.submit(_event(1, "1 Alpha Street"))
+    assert (ing.stats.eval_errors, ing.stats.evaluated, len(ing.index)) == (1, 0, 0)
+
+    # повторная доставка того же объявления — не дубль, оценивается
+    ing.submit(_event(1, "1 Alpha Street"))
+    assert (ing.stats.duplicates, ing.stats.evaluated, len(results)) == (0, 1, 1)
+    ing.submit(_event(1, "1 Alpha Street"))
+    assert ing.stats.duplicates == 1 and len(calls) == 2
+
+
+def test_sink_failure_keeps_listing_out_of_index():
+    def broken_sink(batch):
+        raise OSError("disk full")
+
+    ing = ListingIngester(lambda suburb: MARKET, broken_sink, batch_size=1)
+    with pytest.raises(OSError):
+        ing.submit(_event(1, "1 Alpha Street"))
+    assert len(ing.index) == 0
+
+
+def test_micro_batch_is_one_evaluate_many_call_and_bad_listing_is_isolated():
+    calls = []
+
+    def batched(reqs):
+        calls.append(len(reqs))
+        if any(r.prop.purchase_price == 666_000 for r in reqs):
+            raise RuntimeError("bad listing")
+        return evaluate_many(reqs)
+
+    batches = []
+    ing = ListingIngester(
+        lambda suburb: MARKET, batches.append, batch_size=4, evaluate_many_fn=batched
+    )
+    ing.run([_event(i, f"{i} Alpha St") for i in range(4)])
+    assert calls == [4]
+
+    calls.clear()
+    ing.run([_event(i, f"{i} Beta St", price=666_000 if i == 1 else 600_000) for i in range(4)])
+    # сбой батча → по одному: плохое объявление — ошибка, остальные оценены
+    assert calls == [4, 1, 1, 1, 1]
+    assert [listing.listing_id for listing, _ in batches[-1]] == ["l0", "l2", "l3"]
+    assert (ing.stats.eval_errors, ing.stats.evaluated) == (1, 7)
+
+
+def test_distinct_parcels_at_one_address_are_not_duplicates():
+    ing, batches = _ingester(batch_size=10)
+    stats = ing.run([
+        _event(1, "7 Alpha St", property_id="parcel-A"),
+        _event(2, "7 Alpha Street", property_id="parcel-B"),
+        _event(3, "7 alpha st", property_id="parcel-A"),
+    ])
+    assert (stats.new, stats.duplicates) == (2, 1)
+    assert [listing.property_id for listing, _ in batches[0]] == ["parcel-A", "parcel-B"]
+
+
+def test_events_with_fields_beyond_the_contract_are_accepted():
+    event = _event(1, "1 Alpha Street")
+    event["trace_id"] = "abc"
+    event["payload"]["bedrooms"] = 4
+    ing, _ = _ingester(batch_size=1)
+    ing.submit(event)
+    assert (ing.stats.invalid, ing.stats.evaluated) == (0, 1)
@@ -0,0 +1,47 @@
+import json
+
+from domain.models.evaluate import EvaluateRequest, WhatIfGridRequest
+from scripts.loadtest import LevelResult, build_payload_mix, find_knee, percentile, summarize
+
+
+def _level(conc: int, rps: float, err: float = 0.0) -> LevelResult:
+    return LevelResult(
+        workers=1, concurrency=conc, requests=100, errors=0, duration_s=1.0,
+        rps=rps, p50_ms=1, p95_ms=2, p99_ms=3, error_rate=err,
+    )
+
+
+def test_percentile_interpolates():
+    vals = [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert percentile(vals, 0.0) == 1.0
+    assert percentile(vals, 0.5) == 3.0
+    assert percentile(vals, 0.99) == 4.96
+    assert percentile([7.0], 0.99) == 7.0
+
+
+def test_summarize_counts_errors():
+    res = summarize(2, 8, [0.001] * 90, 10, 2.0, {"200": 90, "500": 10})
+    assert res.requests == 100
+    assert res.rps == 45.0
+    assert res.error_rate == 0.1
+    assert abs(res.p99_ms - 1.0) < 1e-9
+
+
+def test_find_knee_at_saturation():
+    levels = [_level(1, 100), _level(2, 190), _level(4, 350), _level(8, 360), _level(16, 340)]
+    assert find_knee(levels).concurrency == 4
+    # ошибки растут раньше, чем падает throughput
+    levels = [_level(1, 100), _level(2, 190, 0.0), _level(4, 350, 0.05)]
+    assert find_knee(levels).concurrency == 2
+    assert find_knee([_level(1, 100), _level(2, 200)]).concurrency == 2
+
+
+def test_payload_mix_is_valid():
+    specs = build_payload_mix(variants_per_sample=30, seed=1)
+    assert {s.path for s in specs} == {"/evaluate", "/evaluate/grid"}
+    for s in specs:
+        body = json.loads(s.body)
+        if s.path == "/evaluate/grid":
+            WhatIfGridRequest.model_validate(body)
+        else:
+            EvaluateRequest.model_validate(body)
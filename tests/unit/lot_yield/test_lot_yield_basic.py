@@ -1,6 +1,7 @@
 from domain.models.evaluate import EvaluateRequest, PropertyInput, Assumptions, MarketBenchmarks, ScenarioSettings
 from domain.services.enrich.service import enrich_request
 from domain.services.lot_yield.service import estimate_lot_yield
+from domain.services.notes.service import render_notes
 
 def test_lot_yield_r20_ok():
     req = EvaluateRequest(
@@ -21,8 +22,8 @@ def test_lot_yield_r20_ok():
     lots, notes = estimate_lot_yield(enriched.prop, enriched.scen, rmap)
 
     assert lots == 2
-    assert any("raised from 200 to 350" in n for n in ctx.notes)  # подняли целевой размер лота до min по R20
-    assert any("Leftover area ~60 sqm" in n for n in notes)
+    assert any("raised from 200 to 350" in n for n in render_notes(ctx.notes))  # подняли целевой размер лота до min по R20
+    assert any("Leftover area ~60 sqm" in n for n in render_notes(notes))
 
 def test_lot_yield_insufficient_frontage():
     req = EvaluateRequest(
@@ -43,4 +44,4 @@ def test_lot_yield_insufficient_frontage():
     lots, notes = estimate_lot_yield(enriched.prop, enriched.scen, rmap)
 
     assert lots == 0
-    assert any("Frontage" in n and "< required" in n for n in notes)
\ No newline at end of file
+    assert any("Frontage" in n and "< required" in n for n in render_notes(notes))
\ No newline at end of file
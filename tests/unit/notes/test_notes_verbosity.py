@@ -0,0 +1,47 @@
+from domain.models.evaluate import EvaluateRequest, PropertyInput, Assumptions, MarketBenchmarks
+from domain.services.enrich.service import enrich_request
+from domain.services.lot_yield.service import estimate_lot_yield
+from domain.services.notes.service import Note, render_note
+from domain.services.scenarios.service import build_scenarios
+
+
+def _run(verbosity: str, locale: str = "en"):
+    req = EvaluateRequest(
+        prop=PropertyInput(address="X", land_area_sqm=760, frontage_m=12.5, r_code="R20", purchase_price=680_000),
+        asm=Assumptions(),
+        market=MarketBenchmarks(land_price_per_sqm_small_lot=1600, house_arv=900_000),
+        verbosity=verbosity,
+        locale=locale,
+    )
+    enriched, ctx = enrich_request(req)
+    lots, ly_notes = estimate_lot_yield(
+        enriched.prop, enriched.scen, {enriched.prop.r_code: ctx.r_code_info}, verbosity=enriched.verbosity
+    )
+    ctx.notes = [*ctx.notes, *ly_notes]
+    return ctx, {s.scenario: s for s in build_scenarios(enriched, ctx, lots)}
+
+
+def test_render_costs_note_formats_only_on_render():
+    note = Note("COSTS", {"items": {"DEMO_BASE": 35_000.0}, "duty": 1234.4, "label": "A"})
+    assert render_note(note) == "A: Costs: DEMO_BASE=35,000, DUTY=1,234"
+    assert render_note(note, "ru").startswith("A: Затраты: ")
+    assert render_note(Note("UNKNOWN_CODE")) == "UNKNOWN_CODE"
+
+
+def test_verbosity_full_keeps_shared_and_costs_notes():
+    ctx, scen = _run("full")
+    assert [n.code for n in ctx.notes] == ["TARGET_LOT_RAISED", "LEFTOVER_AREA"]
+    notes_b = scen["retain_and_subdivide"].notes
+    assert notes_b[0].startswith("Target lot size raised from 200 to 350")
+    assert "B: retain house; DEMO excluded." in notes_b
+    assert notes_b[-1].startswith("Costs: DEMO_BASE=0")
+
+
+def test_verbosity_summary_and_none():
+    _, scen = _run("summary", "ru")
+    assert scen["subdivide_sell_lots"].notes == []
+    assert scen["retain_and_subdivide"].notes == ["B: дом сохраняется; DEMO исключён."]
+
+    ctx, scen = _run("none")
+    assert ctx.notes == []
+    assert all(s.notes == [] for s in scen.values())
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from apps.api.overload import DegradeSettings, LoadMonitor, LoadShedMiddleware
+
+
+def _monitor(**kw) -> LoadMonitor:
+    return LoadMonitor(DegradeSettings(**kw), alpha=1.0)  # alpha=1: EWMA = последний замер
+
+
+def test_queue_depth_triggers_and_recovers_with_hysteresis():
+    m = _monitor(max_inflight=4, max_latency_ms=1000, recover_ratio=0.5)
+    decisions = [m.admit() for _ in range(6)]
+    assert decisions == [False] * 4 + [True, True]
+
+    # очередь 6 → 3: ниже порога, но выше порога выхода (2) — режим держится
+    for _ in range(3):
+        m.release(0.001)
+    assert m.admit() is True
+    # очередь 4 → 1: вышли
+    for _ in range(3):
+        m.release(0.001)
+    assert m.admit() is False
+    assert m.transitions == 2
+    assert m.degraded_admitted == 3
+
+
+def test_latency_ewma_triggers():
+    m = _monitor(max_inflight=100, max_latency_ms=50, recover_ratio=0.5)
+    m.admit()
+    m.release(0.200)
+    assert m.admit() is True
+    m.release(0.040)   # < порога, но > 25 мс — ещё деградируем
+    assert m.admit() is True
+    m.release(0.010)
+    assert m.admit() is False
+    assert m.snapshot()["latency_ewma_ms"] == 10.0
+
+
+def test_modes_off_and_force():
+    off = _monitor(mode="off", max_inflight=0)
+    assert [off.admit() for _ in range(3)] == [False] * 3
+    force = _monitor(mode="force")
+    assert force.admit() is True
+    assert force.snapshot()["degraded"] is True
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.setenv("SUBDIV_DEGRADE_MODE", "Force")
+    monkeypatch.setenv("SUBDIV_DEGRADE_INFLIGHT", "8")
+    monkeypatch.setenv("SUBDIV_DEGRADE_LATENCY_MS", "120.5")
+    s = DegradeSettings.from_env()
+    assert (s.mode, s.max_inflight, s.max_latency_ms, s.recover_ratio) == ("force", 8, 120.5, 0.5)
+
+    monkeypatch.setenv("SUBDIV_DEGRADE_MODE", "sometimes")
+    with pytest.raises(ValueError):
+        DegradeSettings.from_env()
+
+
+def test_middleware_marks_state_and_header_under_concurrent_load():
+    m = _monitor(max_inflight=2, max_latency_ms=1000)
+    release = asyncio.Event()
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(scope["state"]["degraded"])
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    mw = LoadShedMiddleware(app, load_monitor=m)
+
+    async def one():
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        await mw({"type": "http", "path": "/evaluate"}, None, send)
+        return dict(sent[0]["headers"]).get(b"x-degraded")
+
+    async def run():
+        tasks = [asyncio.create_task(one()) for _ in range(4)]
+        while len(seen) < 4:
+            await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    headers = asyncio.run(run())
+    assert seen == [False, False, True, True]
+    assert headers == [None, None, b"1", b"1"]
+    assert m.inflight == 0
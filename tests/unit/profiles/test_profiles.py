@@ -0,0 +1,68 @@
+import pytest
+from pydantic import ValidationError
+
+from apps.api.cache import request_digest
+from domain.models.evaluate import Assumptions, EvaluateRequest
+from domain.services.profiles.service import apply_overrides, load_profiles
+
+PROP = {"land_area_sqm": 728, "purchase_price": 640_000}
+
+
+def test_default_profile_comes_from_finance_defaults():
+    reg = load_profiles()
+    default = reg.resolve("asm", "default")
+    assert default.ref == "default@1"
+    assert default.values.annual_interest_rate == 0.07
+    assert reg.resolve("market", "balga@1").values.land_price_per_sqm_small_lot == 1750
+
+
+def test_overrides_validate_only_given_fields_and_keep_profile_intact():
+    base = Assumptions()
+    out = apply_overrides(base, {"annual_interest_rate": "0.065"})
+    assert out.annual_interest_rate == 0.065 and base.annual_interest_rate == 0.07
+    assert apply_overrides(base, {}) is base
+    with pytest.raises(ValidationError):
+        apply_overrides(base, {"subdiv_months": -1})
+
+
+def test_request_resolves_profile_and_digest_keys_on_ref():
+    inline = EvaluateRequest.model_validate({
+        "prop": PROP, "asm": {"annual_interest_rate": 0.065},
+        "market": {"land_price_per_sqm_small_lot": 1750, "house_arv": 920_000},
+    })
+    ref = EvaluateRequest.model_validate({
+        "prop": PROP, "asm_profile": "default", "asm_overrides": {"annual_interest_rate": 0.065},
+        "market_profile": "balga",
+    })
+    assert ref.asm_profile == "default@1" and ref.market_profile == "balga@1"
+    assert ref.asm.model_dump() == inline.asm.model_dump()
+    assert ref.market == inline.market
+    pinned = EvaluateRequest.model_validate({
+        "prop": PROP, "asm_profile": "default@1", "asm_overrides": {"annual_interest_rate": 0.065},
+        "market_profile": "balga@1",
+    })
+    assert request_digest(ref) == request_digest(pinned) != request_digest(inline)
+
+
+@pytest.mark.parametrize("extra", [
+    {"asm_profile": "missing"},
+    {"asm_profile": "default@9"},
+    {"asm_profile": "default", "asm": {}},
+    {"asm_overrides": {"annual_interest_rate": 0.05}, "asm": {}},
+    {"asm_profile": "default", "asm_overrides": {"no_such_field": 1}},
+])
+def test_bad_profile_references_are_validation_errors(extra):
+    with pytest.raises(ValidationError):
+        EvaluateRequest.model_validate({"prop": PROP, "market_profile": "balga", **extra})
+
+
+def test_request_from_profile_round_trips_through_its_dump():
+    req = EvaluateRequest.model_validate({
+        "prop": PROP, "asm_profile": "default", "asm_overrides": {"subdiv_months": 9},
+        "market_profile": "balga",
+    })
+    dump = req.model_dump()
+    assert "asm" not in dump and "market" not in dump
+    assert EvaluateRequest.model_validate(dump) == req
+    assert EvaluateRequest.model_validate_json(req.model_dump_json()) == req
+    assert request_digest(EvaluateRequest.model_validate(dump)) == request_digest(req)
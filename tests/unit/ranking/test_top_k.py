@@ -0,0 +1,85 @@
+import random
+
+from domain.models.evaluate import EvaluationResponse, ScenarioResult
+from domain.services.ranking.service import DealQuery, DealStore, rank_stream
+
+SUBURBS = ["BALGA", "THORNLIE", "GOSNELLS", "MIRRABOOKA"]
+CODES = ["subdivide_sell_lots", "retain_and_subdivide", "build_and_sell"]
+
+
+def _deals(n: int, seed: int = 7):
+    rnd = random.Random(seed)
+    out = []
+    for i in range(n):
+        scenarios = []
+        for code in CODES:
+            profit = rnd.uniform(-100_000, 400_000)
+            cost = rnd.uniform(500_000, 1_500_000)
+            scenarios.append(ScenarioResult(
+                scenario=code, lots=rnd.randint(0, 4), revenue=cost + max(profit, 0),
+                total_cost=cost, holding_cost=0, profit=profit,
+                margin_on_cost=profit / cost, roi_simple=profit / cost,
+            ))
+        resp = EvaluationResponse(price_per_sqm=1, lot_yield_estimate=2, scenarios=scenarios)
+        out.append((f"p{i}", rnd.choice(SUBURBS).lower(), resp))
+    return out
+
+
+def _brute(deals, q: DealQuery):
+    best = {}
+    for pid, sub, resp in deals:
+        if q.suburbs is not None and sub.upper() not in {s.upper() for s in q.suburbs}:
+            continue
+        for s in resp.scenarios:
+            if q.scenarios is not None and s.scenario not in q.scenarios:
+                continue
+            if s.lots < q.min_lots or s.profit < (q.min_profit or -1e18):
+                continue
+            key = (getattr(s, q.order_by), s.profit)
+            if pid not in best or key > best[pid][0]:
+                best[pid] = (key, s.scenario)
+    ranked = sorted(best.items(), key=lambda kv: kv[1][0], reverse=True)[: q.limit]
+    return [(pid, scen) for pid, (_, scen) in ranked]
+
+
+def test_store_and_stream_match_bruteforce():
+    deals = _deals(600)
+    store = DealStore()
+    store.extend(deals)
+    queries = [
+        DealQuery(suburbs=["BALGA", "Thornlie"], min_lots=2, min_profit=50_000, limit=25),
+        DealQuery(scenarios=["build_and_sell"], order_by="profit", limit=10),
+        DealQuery(limit=40, order_by="roi_simple"),
+    ]
+    for q in queries:
+        expected = _brute(deals, q)
+        assert [(d.property_id, d.scenario) for d in store.top(q)] == expected
+        assert [(d.property_id, d.scenario) for d in rank_stream(deals, q)] == expected
+
+
+def test_readd_replaces_rows_and_compacts():
+    deals = _deals(50)
+    store = DealStore()
+    store.extend(deals)
+    assert len(store) == 150
+    store.remove("p0")
+    pid, sub, resp = deals[1]
+    store.add(pid, "GOSNELLS", resp)
+    assert len(store) == 147
+    top = store.top(DealQuery(limit=1000))
+    assert "p0" not in {d.property_id for d in top}
+    assert [d.suburb for d in top if d.property_id == "p1"] == ["GOSNELLS"]
+    store.compact()
+    assert store.top(DealQuery(limit=1000)) == top
+    assert store.top(DealQuery(scenarios=["unknown"])) == []
+
+
+def test_query_after_compaction_drops_emptied_suburb_and_scenario():
+    store = DealStore()
+    store.add_rows("p1", "Balga", [("retain_and_subdivide", 2, 100_000, 0.2, 0.2)])
+    store.add_rows("p1", "Thornlie", [("subdivide_sell_lots", 2, 90_000, 0.1, 0.1)])
+    store.compact()
+    assert store.top(DealQuery(suburbs=["balga"])) == []
+    assert store.top(DealQuery(scenarios=["retain_and_subdivide"])) == []
+    [deal] = store.top(DealQuery(suburbs=["THORNLIE", "BALGA"]))
+    assert (deal.property_id, deal.scenario) == ("p1", "subdivide_sell_lots")
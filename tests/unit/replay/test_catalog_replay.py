@@ -0,0 +1,96 @@
+import json
+import shutil
+from pathlib import Path
+
+from domain.services.catalogs.service import (
+    SOURCE_FILES,
+    catalogs_dir,
+    get_catalogs,
+    load_from_csv,
+    use_catalogs,
+)
+from domain.services.replay.service import iter_corpus, number_lines, replay, replay_chunk
+
+
+def _copy_catalogs(dest: Path) -> Path:
+    dest.mkdir()
+    for name in SOURCE_FILES:
+        shutil.copy(catalogs_dir() / name, dest / name)
+    return dest
+
+
+def _corpus():
+    lines = []
+    for i, (area, r_code) in enumerate([(760, "R20"), (720, "R20"), (900, "R20"), (600, "R30")]):
+        body = {
+            "prop": {"land_area_sqm": area, "purchase_price": 650_000, "r_code": r_code},
+            "asm": {},
+            "market": {"land_price_per_sqm_small_lot": 1600, "house_arv": 900_000},
+        }
+        if i % 2:
+            lines.append(json.dumps({"property_id": f"p{i}", "request": body}).encode() + b"\n")
+        else:
+            lines.append(json.dumps(body).encode() + b"\n")
+    lines.append(b"\n")
+    lines.append(b'{"prop": {"land_area_sqm": -1}}\n')
+    return lines
+
+
+def _edit(path: Path, old: str, new: str) -> None:
+    path.write_text(path.read_text(encoding="utf-8").replace(old, new), encoding="utf-8")
+
+
+def test_use_catalogs_overrides_in_context_only(tmp_path):
+    root = _copy_catalogs(tmp_path / "cats")
+    _edit(root / "r_codes_wa.csv", "R20,*,350", "R20,*,400")
+    pinned = load_from_csv(root)
+    with use_catalogs(pinned):
+        assert get_catalogs().r_code("R20")["min_lot_sqm"] == 400
+    assert get_catalogs().r_code("R20")["min_lot_sqm"] == 350
+
+
+def test_same_catalogs_change_nothing(tmp_path):
+    cats = load_from_csv(catalogs_dir())
+    res = replay_chunk(list(number_lines(_corpus())), cats, cats)
+    assert (res.evaluated, res.errors) == (4, 1)
+    assert res.flips == []
+    assert set(res.profit_delta) == {0.0}
+
+
+def test_replay_reports_deltas_and_flips(tmp_path):
+    old = _copy_catalogs(tmp_path / "old")
+    new = _copy_catalogs(tmp_path / "new")
+    # R20: мин. лот 350 → 400 (760 и 720 м² теряют второй лот), субдив дороже
+    _edit(new / "r_codes_wa.csv", "R20,*,350", "R20,*,400")
+    _edit(new / "cost_catalog_wa.csv", "AUD,40000", "AUD,45000")
+
+    report = replay(number_lines(_corpus()), old, new, workers=1, chunk_size=2)
+    assert (report.inputs, report.evaluated, report.errors) == (5, 4, 1)
+    # физический номер строки с 1 (пустая строка 5 тоже считается)
+    assert report.error_samples[0].startswith("6:")
+    assert [f.property_id for f in report.flips] == ["1", "p1"]
+    assert all((f.old_lots, f.new_lots) == (2, 1) for f in report.flips)
+    assert report.lot_flips == 2
+    # 900 м² сохраняет 2 лота, но лоты крупнее (мин. R20) — выручка растёт
+    assert (report.profit.count, report.profit.up, report.profit.down) == (4, 1, 3)
+    assert report.profit.min < report.profit.quantiles["p50"] < 0 < report.profit.max
+
+    pooled = replay(number_lines(_corpus()), old, new, workers=2, chunk_size=2)
+    assert pooled.to_dict()["flips"] == report.to_dict()["flips"]
+    assert pooled.profit == report.profit and pooled.margin == report.margin
+
+
+def test_corpus_locations_are_per_file_and_flips_keep_input_order(tmp_path):
+    old = _copy_catalogs(tmp_path / "old")
+    new = _copy_catalogs(tmp_path / "new")
+    _edit(new / "r_codes_wa.csv", "R20,*,350", "R20,*,400")
+    raw = [line for line in _corpus() if b"request" not in line and b"R20" in line][:1]
+    a, b = tmp_path / "a.ndjson", tmp_path / "b.ndjson"
+    a.write_bytes(b"\n" + raw[0] * 10)
+    b.write_bytes(raw[0] + b"not json\n")
+
+    report = replay(iter_corpus([a, b]), old, new, workers=1, chunk_size=3)
+    expected = [f"a.ndjson:{n}" for n in range(2, 12)] + ["b.ndjson:1"]
+    assert [f.property_id for f in report.flips] == expected
+    assert len(report.error_samples) == 1
+    assert report.error_samples[0].startswith("b.ndjson:2: ")
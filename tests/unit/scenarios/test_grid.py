@@ -0,0 +1,68 @@
+from array import array
+
+from domain.models.evaluate import (
+    EvaluateRequest, PropertyInput, Assumptions, MarketBenchmarks, ScenarioSettings, GridAxis,
+)
+from domain.services.enrich.service import enrich_request
+from domain.services.lot_yield.service import estimate_lot_yield
+from domain.services.scenarios.service import build_scenarios
+from domain.services.scenarios.grid import build_scenario_grid, GRID_FIELDS
+
+
+def _enriched():
+    req = EvaluateRequest(
+        prop=PropertyInput(address="X", land_area_sqm=760, frontage_m=12.5, r_code="R20", purchase_price=680_000),
+        asm=Assumptions(),
+        market=MarketBenchmarks(land_price_per_sqm_small_lot=1600, house_arv=900_000),
+        scen=ScenarioSettings(),
+    )
+    enriched, ctx = enrich_request(req)
+    rmap = {enriched.prop.r_code: ctx.r_code_info}
+    lots, _ = estimate_lot_yield(enriched.prop, enriched.scen, rmap)
+    return enriched, ctx, lots
+
+
+def test_grid_matches_build_scenarios_at_base_point():
+    enriched, ctx, lots = _enriched()
+    # оси из одной точки — базовые значения запроса
+    axes = [
+        GridAxis(min=1600, max=1600, steps=2),
+        GridAxis(min=680_000, max=680_000, steps=2),
+        GridAxis(min=0.07, max=0.07, steps=2),
+        GridAxis(min=6, max=6, steps=2),
+    ]
+    grid = build_scenario_grid(enriched, lots, axes)
+    scenarios = {s.scenario: s for s in build_scenarios(enriched, ctx, lots)}
+
+    assert grid.scenarios == ["subdivide_sell_lots", "retain_and_subdivide", "demo_rebuild_and_sell"]
+    assert grid.shape == [3, len(GRID_FIELDS), 2, 2, 2, 2]
+
+    values = array("f")
+    values.frombytes(grid.to_bytes())
+    n_inner = 16
+    for si, code in enumerate(grid.scenarios):
+        profit = values[(si * 2 + 0) * n_inner]
+        margin = values[(si * 2 + 1) * n_inner]
+        assert abs(profit - scenarios[code].profit) < 1.0          # float32
+        assert abs(margin - scenarios[code].margin_on_cost) < 1e-5
+
+
+def test_grid_profit_linear_in_land_price():
+    enriched, _, lots = _enriched()
+    grid = build_scenario_grid(enriched, lots, [GridAxis(min=1000, max=2000, steps=3), None, None, None])
+    _, _, n_psqm, n_price, n_rate, n_months = grid.shape
+    stride = n_price * n_rate * n_months
+    a0, a1, a2 = (grid.values[i * stride] for i in range(3))
+    # узел посередине = среднее краёв: интерполяция по цене земли точная
+    assert abs(a1 - (a0 + a2) / 2) < 1.0
+
+
+def test_default_months_axis_stays_on_whole_months():
+    enriched, _, lots = _enriched()
+    for months in (0, 1, 2, 6):
+        short = enriched.model_copy(
+            update={"asm": enriched.asm.model_copy(update={"subdiv_months": months})}
+        )
+        grid = build_scenario_grid(short, lots, [None] * 4)
+        values = dict(grid.axes)["subdiv_months"]
+        assert values == [float(m) for m in range(max(0, months - 3), months + 7)]
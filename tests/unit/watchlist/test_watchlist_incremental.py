@@ -0,0 +1,110 @@
+from apps.api.cache import request_digest
+from domain.models.evaluate import Assumptions, EvaluateRequest, MarketBenchmarks, PropertyInput
+from domain.services.evaluation.service import evaluate_many
+from domain.services.watchlist.service import Watchlist, r_code_key, suburb_key
+
+
+def _req(suburb: str, area: float, r_code: str = "R30") -> EvaluateRequest:
+    return EvaluateRequest(
+        prop=PropertyInput(
+            suburb=suburb, land_area_sqm=area, frontage_m=20, r_code=r_code, purchase_price=600_000
+        ),
+        asm=Assumptions(),
+        market=MarketBenchmarks(land_price_per_sqm_small_lot=1500, house_arv=850_000),
+    )
+
+
+def _event(suburb: str, psqm: float, arv=None) -> dict:
+    return {
+        "event_id": "00000000-0000-0000-0000-000000000001",
+        "event_type": "CompsUpdated",
+        "version": 1,
+        "occurred_at": "2025-01-01T00:00:00Z",
+        "payload": {
+            "suburb_code": suburb, "land_smalllot_psqm_median": psqm, "house_arv_median": arv,
+        },
+    }
+
+
+def _watchlist():
+    calls = []
+
+    def counting(reqs):
+        calls.extend(r.prop.suburb for r in reqs)
+        return evaluate_many(reqs)
+
+    wl = Watchlist(counting)
+    for i in range(20):
+        wl.add(f"b{i}", _req("Balga", 700 + i * 10))
+    for i in range(5):
+        wl.add(f"t{i}", _req("Thornlie", 800 + i * 10, r_code="R20"))
+    calls.clear()
+    return wl, calls
+
+
+def test_comps_update_reevaluates_only_dependents():
+    wl, calls = _watchlist()
+    changes = wl.apply_comps_updated(_event("THORNLIE", 1900))
+    assert calls == ["Thornlie"] * 5
+    assert {c.property_id for c in changes} == {f"t{i}" for i in range(5)}
+    assert all(c.new_profit > c.old_profit for c in changes)
+    assert wl.get("t0").request.market.land_price_per_sqm_small_lot == 1900
+    assert wl.get("b0").request.market.land_price_per_sqm_small_lot == 1500
+
+
+def test_noop_update_and_unknown_suburb_cost_nothing():
+    wl, calls = _watchlist()
+    assert wl.apply_comps_updated(_event("BALGA", 1500)) == []
+    assert wl.apply_comps_updated(_event("NOWHERE", 2000)) == []
+    assert calls == []
+    assert wl.stats.skipped == 20
+
+
+def test_unchanged_results_are_not_surfaced():
+    wl, calls = _watchlist()
+    assert wl.invalidate(r_code_key("R20")) == []
+    assert len(calls) == 5
+
+
+def test_remove_drops_index_entries():
+    wl, _ = _watchlist()
+    for i in range(5):
+        assert wl.remove(f"t{i}")
+    assert wl.dependents(suburb_key("thornlie")) == frozenset()
+    assert wl.dependents(r_code_key("R20")) == frozenset()
+    assert len(wl) == 20
+
+
+def test_benchmark_update_drops_market_profile_reference():
+    wl = Watchlist()
+    req = EvaluateRequest.model_validate({
+        "prop": {"suburb": "Balga", "land_area_sqm": 760, "purchase_price": 600_000},
+        "asm": {},
+        "market_profile": "balga",
+        "market_overrides": {"house_arv": 900_000},
+    })
+    before = request_digest(wl.add("b0", req).request)
+    wl.apply_comps_updated(_event("BALGA", 1900))
+    updated = wl.get("b0").request
+    assert (updated.market_profile, updated.market_overrides) == (None, None)
+    assert updated.market.land_price_per_sqm_small_lot == 1900
+    assert updated.market.house_arv == 900_000
+    assert request_digest(updated) != before
+    assert EvaluateRequest.model_validate(updated.model_dump()) == updated
+
+
+def test_dependents_are_reevaluated_in_one_batch():
+    batches = []
+
+    def batched(reqs):
+        batches.append(len(reqs))
+        return evaluate_many(reqs)
+
+    wl = Watchlist(batched)
+    for i in range(6):
+        wl.add(f"t{i}", _req("Thornlie", 800 + i * 10, r_code="R20"))
+    batches.clear()
+    wl.apply_comps_updated(_event("THORNLIE", 1900))
+    wl.invalidate(r_code_key("R20"))
+    assert batches == [6, 6]
+    assert wl.stats.evaluated == 18